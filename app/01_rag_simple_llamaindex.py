@@ -1,56 +1,83 @@
 import os
-import pandas as pd
+import argparse
 from dotenv import load_dotenv
-from llama_index.core import VectorStoreIndex, Document, Settings
-from llama_index.llms.gemini import Gemini
-from llama_index.embeddings.huggingface import HuggingFaceEmbeddings
+from app.csv_index import refresh_index
+from app.sales_query_router import SalesQueryRouter, load_sales_frame
+from app.streaming import print_stream
 
 
-load_dotenv('C:/Agentic/codellm/.env')
-GOOGLE_API_KEY = os.getenv("GOOGLEAI_API_KEY")
+def setup_settings():
+    from llama_index.core import Settings
+    from llama_index.llms.gemini import Gemini
+    from app.embedding_pipeline import CachedHuggingFaceEmbedding
 
+    load_dotenv('C:/Agentic/codellm/.env')
+    GOOGLE_API_KEY = os.getenv("GOOGLEAI_API_KEY")
 
-Settings.llm = Gemini(model_name="models/gemini-2.5-flash", api_key=GOOGLE_API_KEY)
-Settings.embed_model = HuggingFaceEmbeddings(model_name="BAAI/bge-small-en-v1.5")
+    Settings.llm = Gemini(model_name="models/gemini-2.5-flash", api_key=GOOGLE_API_KEY)
+    # Batched, optionally multi-process bge-small with an on-disk vector cache
+    Settings.embed_model = CachedHuggingFaceEmbedding(model_name="BAAI/bge-small-en-v1.5")
 
 
-csv_path = 'sample_data.csv'
-if not os.path.exists(csv_path):
-    raise FileNotFoundError(f"The file {csv_path} does not exist.")
+def build_router(csv_path, persist_dir, streaming=True):
+    # Each row becomes a readable text block for the LLM ("OrderID: ORD0001, Date: 2023-09-05, ...").
+    # The index is persisted keyed by a hash of that text, so a restart only embeds new or
+    # changed rows and drops rows that are no longer in the CSV.
+    index, report = refresh_index(csv_path, persist_dir=persist_dir)
+    # Streaming engines hand back tokens as the LLM produces them
+    query_engine = index.as_query_engine(similarity_top_k=5, streaming=streaming)
+    # Totals, counts and filters are computed over every row of the DataFrame;
+    # only free-text questions go through top-k retrieval.
+    return SalesQueryRouter(load_sales_frame(csv_path), query_engine), report
 
 
-print("Loading documents...")
+def main():
+    parser = argparse.ArgumentParser(description='Sales Data RAG')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Sync the persisted index with the CSV, report what changed and exit')
+    parser.add_argument('--persist-dir', type=str, default='./storage/sales',
+                        help='Where the row index is persisted')
+    parser.add_argument('--no-stream', action='store_true',
+                        help='Print each answer only once it is complete')
+    args = parser.parse_args()
 
-df = pd.read_csv(csv_path)
-documents = []
+    setup_settings()
 
-for _, row in df.iterrows():
-    # Convert each row into a readable text block for the LLM
-    # This dynamic method works for ANY csv columns
-    text_content = ", ".join([f"{col}: {val}" for col, val in row.items()])  #[orderid:3245, date:2023-01-01,...]
-    documents.append(Document(text=text_content))
+    csv_path = 'sample_data.csv'
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"The file {csv_path} does not exist.")
 
-index = VectorStoreIndex.from_documents(documents)
-query_engine = index.as_query_engine(similarity_top_k=5)
+    print("Loading documents...")
+    router, report = build_router(csv_path, args.persist_dir, streaming=not args.no_stream)
+    print(f"Index refreshed: {report}")
+    if args.refresh:
+        return
 
+    # --- 5. Simple Query Loop ---
+    print("\n--- Sales Data RAG Ready ---")
+    print("Ask questions like 'What was the total sales for Laptops?' or 'exit' to quit.\n")
 
-# --- 5. Simple Query Loop ---
-print("\n--- Sales Data RAG Ready ---")
-print("Ask questions like 'What was the total sales for Laptops?' or 'exit' to quit.\n")
+    while True:
+        user_input = input("Query: ").strip()
 
-while True:
-    user_input = input("Query: ").strip()
-    
-    if user_input.lower() == 'exit':
-        print("Goodbye!")
-        break
-    
-    if not user_input:
-        continue
+        if user_input.lower() == 'exit':
+            print("Goodbye!")
+            break
 
-    try:
-        # The query engine retrieves context and generates an answer
-        response = query_engine.query(user_input)
-        print(f"\nAnswer: {response}\n")
-    except Exception as e:
-        print(f"Error: {e}")
\ No newline at end of file
+        if not user_input:
+            continue
+
+        try:
+            # Structured questions are answered from the DataFrame, the rest by the query engine
+            route, response = router.route(user_input)
+            if route == "retrieval" and hasattr(response, "response_gen"):
+                print_stream(response.response_gen, prefix="\nAnswer: ")
+                print()
+            else:
+                print(f"\nAnswer: {response}\n")
+        except Exception as e:
+            print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
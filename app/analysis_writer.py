@@ -0,0 +1,229 @@
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from app.chunking import default_chunker, id_filter, id_key, stable_id
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_id(candidate, job_id, text):
+    # Same candidate, job and chunk text -> same id, so re-runs overwrite
+    # instead of appending a duplicate; matches Chunker ids for that metadata
+    return stable_id((candidate, job_id), text)
+
+
+@dataclass
+class WriterStats:
+    analyses: int = 0
+    chunks_written: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    persists: int = 0
+    flush_seconds: float = 0.0
+
+
+class AnalysisWriter:
+    """Buffered, idempotent writer of resume analyses into a Chroma store.
+
+    ``write`` only splits and queues the analysis; ``write_many`` splits a
+    whole batch with ``Chunker.split_many`` (a process pool for large ones).
+    Queued chunks are embedded and inserted in one batch when ``max_batch``
+    chunks are waiting or the oldest has waited ``max_delay`` seconds. Chunk
+    ids come from the chunker (resume, job_id, chunk hash; see
+    ``chunking.ID_FIELDS``): unchanged chunks are skipped, and chunks left
+    over from an earlier analysis of the same resume/job are deleted. ``persist()`` runs on a background thread after each flush.
+    ``on_upsert(ids, documents)`` / ``on_delete(ids)`` are called after each
+    flush so side indexes (e.g. the BM25 index) can follow the store.
+    A batch whose write fails goes back in the buffer and is retried with the
+    next flush; ``flush`` re-raises the error, timed flushes log it.
+    """
+
+    def __init__(self, get_vector_store, chunker=None, max_batch=512, max_delay=2.0, insert_batch_size=256,
+                 on_upsert=None, on_delete=None, split_workers=None):
+        self.get_vector_store = get_vector_store
+        self.chunker = chunker or default_chunker()
+        self.split_workers = split_workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.insert_batch_size = insert_batch_size
+        self.on_upsert = on_upsert
+        self.on_delete = on_delete
+        self.stats = WriterStats()
+
+        # id_key -> (ids, documents, where); a newer analysis replaces a queued one
+        self._pending = {}
+        self._pending_chunks = 0
+        self._oldest = None
+        self._lock = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._persist_pool = ThreadPoolExecutor(max_workers=1)
+        self._persist_future = None
+        self._persist_running = False
+        self._persist_dirty = False
+        self._closed = False
+        self._timer = threading.Thread(target=self._flush_on_timer, daemon=True)
+        self._timer.start()
+        atexit.register(self.close)
+
+    def write(self, analysis, doc_metadata):
+        self._queue(doc_metadata, self.chunker.split(analysis, doc_metadata))
+
+    def write_many(self, analyses):
+        analyses = list(analyses)
+        split = self.chunker.split_many(analyses, workers=self.split_workers)
+        for (_, doc_metadata), chunks in zip(analyses, split):
+            self._queue(doc_metadata, chunks)
+
+    def _queue(self, doc_metadata, chunks):
+        id_fields = self.chunker.config.id_fields
+        key = id_key(doc_metadata, id_fields)
+        where = {"$and": [{name: value} for name, value in id_filter(doc_metadata, id_fields).items()]}
+        ids, documents = [], []
+        for chunk in chunks:
+            if chunk.id in ids:
+                continue
+            ids.append(chunk.id)
+            documents.append(chunk.to_document())
+
+        with self._lock:
+            previous = self._pending.pop(key, None)
+            if previous:
+                self._pending_chunks -= len(previous[0])
+            self._pending[key] = (ids, documents, where)
+            self._pending_chunks += len(ids)
+            self.stats.analyses += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = self._pending_chunks >= self.max_batch
+            self._lock.notify()
+        if full:
+            self.flush()
+
+    def _take_pending(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._pending_chunks = 0
+            self._oldest = None
+            return pending
+
+    def _requeue(self, pending):
+        # Analyses queued for the same resume while the batch was out are newer and win
+        with self._lock:
+            for key, entry in pending.items():
+                if key not in self._pending:
+                    self._pending[key] = entry
+                    self._pending_chunks += len(entry[0])
+            if self._pending and self._oldest is None:
+                self._oldest = time.monotonic()
+            self._lock.notify()
+
+    def flush(self, wait_persist=False):
+        with self._flush_lock:
+            pending = self._take_pending()
+            if pending:
+                start = time.perf_counter()
+                try:
+                    self._write_batch(pending)
+                except BaseException:
+                    # Chunk ids are deterministic, so retrying a partly written batch is safe
+                    self.stats.failed_flushes += 1
+                    self._requeue(pending)
+                    raise
+                self.stats.flushes += 1
+                self.stats.flush_seconds += time.perf_counter() - start
+                self._schedule_persist()
+        if wait_persist and self._persist_future is not None:
+            self._persist_future.result()
+
+    def _write_batch(self, pending):
+        vectorstore = self.get_vector_store()
+        new_ids, new_documents = [], []
+        for ids, documents, where in pending.values():
+            existing = set(vectorstore.get(where=where, include=[])["ids"])
+            stale = existing.difference(ids)
+            if stale:
+                vectorstore.delete(ids=list(stale))
+                self.stats.chunks_deleted += len(stale)
+                if self.on_delete:
+                    self.on_delete(list(stale))
+            for doc_id, doc in zip(ids, documents):
+                if doc_id in existing:
+                    self.stats.chunks_unchanged += 1
+                else:
+                    new_ids.append(doc_id)
+                    new_documents.append(doc)
+
+        # One embedding call per insert batch instead of one per analysis
+        for i in range(0, len(new_documents), self.insert_batch_size):
+            vectorstore.add_documents(new_documents[i:i + self.insert_batch_size],
+                                      ids=new_ids[i:i + self.insert_batch_size])
+        self.stats.chunks_written += len(new_documents)
+        if self.on_upsert and new_documents:
+            self.on_upsert(new_ids, new_documents)
+
+    def _persist(self):
+        try:
+            vectorstore = self.get_vector_store()
+            while True:
+                with self._lock:
+                    if not self._persist_dirty:
+                        return
+                    self._persist_dirty = False
+                # Newer Chroma versions persist automatically and drop persist()
+                if hasattr(vectorstore, "persist"):
+                    vectorstore.persist()
+                self.stats.persists += 1
+        finally:
+            # Also on failure, so the next flush schedules a new persist
+            with self._lock:
+                self._persist_running = False
+
+    def _schedule_persist(self):
+        # A single background persister; flushes that land while it is busy
+        # just mark the store dirty and are picked up by its next pass
+        with self._lock:
+            self._persist_dirty = True
+            if not self._persist_running:
+                self._persist_running = True
+                self._persist_future = self._persist_pool.submit(self._persist)
+
+    def _flush_on_timer(self):
+        while True:
+            with self._lock:
+                while not self._closed and self._oldest is None:
+                    self._lock.wait()
+                if self._closed:
+                    return
+                remaining = self._oldest + self.max_delay - time.monotonic()
+                if remaining > 0:
+                    self._lock.wait(remaining)
+                    continue
+            try:
+                self.flush()
+            except Exception:
+                # The batch is back in the buffer and retried after max_delay; keep the timer alive
+                logger.exception("Timed flush of %s failed; will retry", type(self).__name__)
+
+    def close(self):
+        if self._closed:
+            return
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        try:
+            self.flush(wait_persist=True)
+        finally:
+            self._persist_pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
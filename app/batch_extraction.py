@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# Bulk structured extraction over an iterable or a JSONL/text file.
+#
+#   python -m app.batch_extraction emails.jsonl --schema contact --output contacts.jsonl --concurrency 32
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pydantic import ValidationError
+
+
+def _schemas():
+    # Imported lazily so `--help` doesn't pull in LangChain
+    from app import error_handling, structured_output
+    return {
+        "contact": (structured_output.ContactInfo, structured_output.get_agent, "Extract contact info from: {text}"),
+        "extraction": (error_handling.ExtractionResult, error_handling.get_agent, "Extract info: {text}"),
+    }
+
+
+def iter_texts(source):
+    """Yield ``(item_id, text)`` pairs.
+
+    ``source`` is either an iterable of strings or a path. ``.jsonl`` lines
+    may be ``{"id": ..., "text": ...}`` objects or bare JSON strings; any
+    other file is read as one text per line.
+    """
+    if not isinstance(source, str):
+        yield from enumerate(source)
+        return
+
+    with open(source, encoding="utf-8") as f:
+        for line_number, line in enumerate(f):
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+            if source.endswith(".jsonl"):
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    yield record.get("id", line_number), record["text"]
+                    continue
+                line = record
+            yield line_number, line
+
+
+@dataclass
+class BatchReport:
+    items: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retried: int = 0
+    validation_failures: int = 0
+    seconds: float = 0.0
+
+    @property
+    def items_per_sec(self):
+        return self.items / self.seconds if self.seconds else 0.0
+
+    @property
+    def retry_rate(self):
+        return self.retried / self.items if self.items else 0.0
+
+    @property
+    def validation_failure_rate(self):
+        return self.validation_failures / self.items if self.items else 0.0
+
+    def __str__(self):
+        return (f"{self.items} items in {self.seconds:.1f}s ({self.items_per_sec:.1f} items/sec), "
+                f"{self.succeeded} ok, {self.failed} failed, "
+                f"retry rate {self.retry_rate:.1%}, validation failure rate {self.validation_failure_rate:.1%}")
+
+
+class BatchExtractor:
+    """Run ``agent.ainvoke`` over many texts with bounded concurrency.
+
+    Results are validated against ``schema`` and appended to the output
+    JSONL as they complete. Items that raise or fail validation are collected
+    and retried in a later round, so successful items are never re-sent.
+    """
+
+    def __init__(self, agent, schema, prompt="{text}", concurrency=16, max_retries=2, extract=None):
+        self.agent = agent
+        self.schema = schema
+        self.prompt = prompt
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        # Optional override, e.g. the rule-based fast path; must return a schema instance
+        self.extract = extract or self._extract_with_agent
+
+    async def _extract_with_agent(self, text):
+        result = await self.agent.ainvoke({
+            "messages": [{"role": "user", "content": self.prompt.format(text=text)}]
+        })
+        return result["structured_response"]
+
+    async def _process(self, item_id, text, report):
+        try:
+            value = await self.extract(text)
+            model = self.schema.model_validate(value if isinstance(value, dict) else value.model_dump())
+            return {"id": item_id, "result": model.model_dump()}, None
+        except ValidationError as e:
+            report.validation_failures += 1
+            return None, f"validation: {e.errors()[:3]}"
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    async def _round(self, items, out, report, final):
+        # A bounded queue keeps memory flat however many items the source yields
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        failures = []
+
+        async def worker():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    queue.task_done()
+                    return
+                item_id, text, attempt = entry
+                record, error = await self._process(item_id, text, report)
+                if record is not None:
+                    record["attempts"] = attempt + 1
+                    out.write(json.dumps(record) + "\n")
+                    report.succeeded += 1
+                elif final:
+                    out.write(json.dumps({"id": item_id, "error": error, "attempts": attempt + 1}) + "\n")
+                    report.failed += 1
+                else:
+                    failures.append((item_id, text, attempt + 1))
+                queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        for entry in items:
+            await queue.put(entry)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        out.flush()
+        return failures
+
+    async def arun(self, source, output_path):
+        report = BatchReport()
+        start = time.perf_counter()
+
+        def first_round():
+            for item_id, text in iter_texts(source):
+                report.items += 1
+                yield item_id, text, 0
+
+        with open(output_path, "w", encoding="utf-8") as out:
+            pending = await self._round(first_round(), out, report, final=self.max_retries == 0)
+            for attempt in range(1, self.max_retries + 1):
+                if not pending:
+                    break
+                report.retried += len(pending)
+                # Simple backoff before re-sending only the failed items
+                await asyncio.sleep(min(2 ** attempt, 10))
+                pending = await self._round(pending, out, report, final=attempt == self.max_retries)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def run(self, source, output_path):
+        return asyncio.run(self.arun(source, output_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch structured extraction")
+    parser.add_argument("input", help="JSONL file ({'id', 'text'} objects or strings) or a text file, one item per line")
+    parser.add_argument("--schema", choices=["contact", "extraction"], default="contact")
+    parser.add_argument("--output", default="extractions.jsonl")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--fast-path", action="store_true",
+                        help="Fill fields with regex rules first and only call the LLM when they fall short")
+    args = parser.parse_args()
+
+    schema, get_agent, prompt = _schemas()[args.schema]
+    agent = get_agent()
+    fast_path = None
+    if args.fast_path:
+        from app.rule_extraction import contact_fast_path, extraction_fast_path
+        make = contact_fast_path if args.schema == "contact" else extraction_fast_path
+        fast_path = make(agent, prompt)
+
+    extractor = BatchExtractor(agent, schema, prompt, concurrency=args.concurrency, max_retries=args.retries,
+                               extract=fast_path.aextract if fast_path else None)
+    report = extractor.run(args.input, args.output)
+    print(report)
+    if fast_path:
+        print(f"fast path: {fast_path.fast_hits} rule hits, {fast_path.llm_calls} LLM calls "
+              f"({fast_path.hit_rate:.1%} hit rate)")
+
+
+if __name__ == "__main__":
+    main()
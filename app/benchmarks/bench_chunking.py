@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# Chunking throughput (serial vs process pool) and retrieval recall for
+# several chunk-size settings.
+#
+#   python -m app.benchmarks.bench_chunking --docs 2000 --workers 4
+#
+# Each synthetic analysis has one planted fact; a query about that fact counts
+# as recalled when a chunk whose offsets cover the fact is in the top k.
+# Retrieval uses the local BM25 index and the feature-hashing embeddings from
+# bench_hybrid_search, so the run is offline.
+
+import argparse
+import random
+import time
+import numpy as np
+
+from app.benchmarks.bench_hybrid_search import SKILLS, HashingEmbeddings
+from app.chunking import ChunkConfig, Chunker
+from app.hybrid_search import BM25Index
+
+CONFIGS = [
+    ChunkConfig(chunk_size=200, chunk_overlap=20, unit="chars"),
+    ChunkConfig(chunk_size=500, chunk_overlap=50, unit="chars"),
+    ChunkConfig(chunk_size=1000, chunk_overlap=100, unit="chars"),
+    ChunkConfig(chunk_size=128, chunk_overlap=16, unit="approx"),
+    ChunkConfig(chunk_size=256, chunk_overlap=32, unit="approx"),
+]
+FILLER = [
+    "The candidate lists {a} and {b} among core skills, with {n} years of overall experience.",
+    "Their most recent role involved {a} work alongside a platform team using {b}.",
+    "Evidence of {a} is moderate; {b} appears only in a side project.",
+    "Communication and stakeholder management are described in general terms.",
+    "Education includes a degree in computer science and a {a} certification.",
+]
+CODENAMES = ["Zephyr", "Orion", "Falcon", "Nimbus", "Atlas", "Quasar", "Helix", "Vertex", "Aurora", "Cobalt"]
+
+
+def make_corpus(count, paragraphs, seed=0):
+    rng = random.Random(seed)
+    docs, facts = [], []
+    for i in range(count):
+        parts = []
+        for _ in range(paragraphs):
+            sentences = [rng.choice(FILLER).format(a=rng.choice(SKILLS), b=rng.choice(SKILLS), n=rng.randint(2, 15))
+                         for _ in range(4)]
+            parts.append(" ".join(sentences))
+        project = f"{rng.choice(CODENAMES)}-{i}"
+        skill = rng.choice(SKILLS)
+        fact = f"They led the {project} migration to {skill}, cutting deployment time by {rng.randint(20, 80)}%."
+        position = rng.randrange(len(parts) + 1)
+        parts.insert(position, fact)
+        text = "\n\n".join(parts)
+        docs.append((text, {"candidate": f"candidate_{i:05d}", "job_id": "job_001"}))
+        facts.append((text.index(fact), f"who led the {project} migration to {skill}"))
+    return docs, facts
+
+
+def recall(chunks_per_doc, facts, k, sample, seed=1):
+    flat = [(doc, chunk) for doc, chunks in enumerate(chunks_per_doc) for chunk in chunks]
+    index = BM25Index()
+    index.add([chunk.id for _, chunk in flat], [chunk.text for _, chunk in flat], [chunk.metadata for _, chunk in flat])
+    by_id = {chunk.id: (doc, chunk) for doc, chunk in flat}
+
+    embeddings = HashingEmbeddings()
+    matrix = np.array(embeddings.embed_documents([chunk.text for _, chunk in flat]), dtype=np.float32)
+
+    def relevant(doc, chunk, doc_index, fact_start):
+        return doc == doc_index and chunk.start <= fact_start < chunk.end
+
+    rng = random.Random(seed)
+    queries = rng.sample(range(len(facts)), min(sample, len(facts)))
+    keyword_hits = vector_hits = 0
+    for doc_index in queries:
+        fact_start, query = facts[doc_index]
+        keyword = [by_id[doc_id] for doc_id, _ in index.search(query, k)]
+        keyword_hits += any(relevant(doc, chunk, doc_index, fact_start) for doc, chunk in keyword)
+        scores = matrix @ np.array(embeddings.embed_query(query), dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        vector_hits += any(relevant(*flat[i], doc_index, fact_start) for i in top)
+    return keyword_hits / len(queries), vector_hits / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunking throughput and recall benchmark")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--paragraphs", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    docs, facts = make_corpus(args.docs, args.paragraphs)
+    print(f"{args.docs} documents, {sum(len(text) for text, _ in docs) / len(docs):.0f} chars each")
+    print(f"{'config':<18} {'chunks':>8} {'serial/s':>10} {'pool/s':>10} "
+          f"{'BM25 R@' + str(args.k):>10} {'vector R@' + str(args.k):>11}")
+    for config in CONFIGS:
+        chunker = Chunker(config)
+        start = time.perf_counter()
+        serial = chunker.split_many(docs, workers=1)
+        serial_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        pooled = chunker.split_many(docs, workers=args.workers)
+        pool_seconds = time.perf_counter() - start
+        assert [[c.id for c in chunks] for chunks in serial] == [[c.id for c in chunks] for chunks in pooled]
+
+        count = sum(len(chunks) for chunks in serial)
+        keyword_recall, vector_recall = recall(serial, facts, args.k, args.queries)
+        label = f"{config.chunk_size}/{config.chunk_overlap} {config.unit}"
+        print(f"{label:<18} {count:>8} {count / serial_seconds:>10.0f} {count / pool_seconds:>10.0f} "
+              f"{keyword_recall:>10.1%} {vector_recall:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
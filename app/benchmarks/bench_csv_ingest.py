@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# Compare the original iterrows loader against app.csv_ingest.
+#
+#   python -m app.benchmarks.bench_csv_ingest --rows 1000000
+#
+# Each loader runs in its own process so peak RSS is measured in isolation.
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+
+def make_sales_csv(path, rows, seed=0):
+    # Synthetic rows shaped like app/sales_data.csv
+    rng = random.Random(seed)
+    regions = ["North", "South", "East", "West"]
+    products = ["Laptop", "Mouse", "Webcam", "Headphones", "Monitor", "Keyboard"]
+    with open(path, "w") as f:
+        f.write("OrderID,Date,Region,Product,Category,Quantity,UnitPrice,TotalSale\n")
+        for i in range(rows):
+            qty = rng.randint(1, 5)
+            price = round(rng.uniform(10, 500), 2)
+            f.write(
+                f"ORD{i:07d},2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d},"
+                f"{rng.choice(regions)},{rng.choice(products)},Electronics,"
+                f"{qty},{price},{round(qty * price, 2)}\n"
+            )
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_iterrows(csv_path, documents):
+    # The loader as it was written in 01_rag_simple_llamaindex.py
+    import pandas as pd
+    from llama_index.core import Document
+
+    df = pd.read_csv(csv_path)
+    count = 0
+    for _, row in df.iterrows():
+        text_content = ", ".join([f"{col}: {val}" for col, val in row.items()])
+        if documents:
+            Document(text=text_content)
+        count += 1
+    return count
+
+
+def run_streaming(csv_path, documents, chunksize):
+    from app.csv_ingest import iter_documents, iter_row_texts
+
+    count = 0
+    if documents:
+        for _ in iter_documents(csv_path, chunksize=chunksize):
+            count += 1
+    else:
+        for _ in iter_row_texts(csv_path, chunksize=chunksize):
+            count += 1
+    return count
+
+
+def _child(name, csv_path, documents, chunksize, queue):
+    start = time.perf_counter()
+    if name == "iterrows":
+        count = run_iterrows(csv_path, documents)
+    else:
+        count = run_streaming(csv_path, documents, chunksize)
+    elapsed = time.perf_counter() - start
+    queue.put((count, elapsed, peak_rss_mb()))
+
+
+def measure(name, csv_path, documents, chunksize):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(name, csv_path, documents, chunksize, queue))
+    proc.start()
+    count, elapsed, rss = queue.get()
+    proc.join()
+    return count, elapsed, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV-to-Document ingestion benchmark")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--csv", type=str, default=None, help="Use an existing CSV instead of a synthetic one")
+    parser.add_argument("--texts-only", action="store_true", help="Skip Document construction")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    csv_path = args.csv
+    if csv_path is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        csv_path = os.path.join(tmp_dir.name, "sales.csv")
+        print(f"Generating {args.rows:,} synthetic rows...")
+        make_sales_csv(csv_path, args.rows)
+
+    documents = not args.texts_only
+    print(f"{'loader':<12}{'rows':>12}{'seconds':>10}{'rows/sec':>14}{'peak RSS MB':>14}")
+    for name in ("iterrows", "streaming"):
+        count, elapsed, rss = measure(name, csv_path, documents, args.chunksize)
+        print(f"{name:<12}{count:>12,}{elapsed:>10.2f}{count / elapsed:>14,.0f}{rss:>14.1f}")
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
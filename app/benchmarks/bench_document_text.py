@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# In-memory PDF extraction vs the old temp-file round trip, on generated
+# multi-page PDFs.
+#
+#   python -m app.benchmarks.bench_document_text --pages 5 40 200 --repeat 3
+#
+# "temp file" writes the upload to the CWD and parses it from disk, as the old
+# Utils.extract_text_from_resume did; "in-memory" parses the buffer serially,
+# "parallel" splits pages across processes and "cached" is a re-upload.
+
+import argparse
+import os
+import statistics
+import time
+from app import document_text
+
+LOREM = ("Senior software engineer with experience in Python, distributed systems, "
+         "data pipelines and cloud infrastructure. Led a team of five engineers.")
+
+
+def make_pdf(pages, lines_per_page=45):
+    # Minimal hand-written PDF with one Helvetica text stream per page
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = [f"({page + 1}.{i} {LOREM}) Tj T*" for i in range(lines_per_page)]
+        stream = ("BT /F1 9 Tf 11 TL 36 800 Td " + " ".join(lines) + " ET").encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def temp_file_extract(name, data):
+    from pypdf import PdfReader
+    temp_file_path = f"temp_{name}"
+    with open(temp_file_path, "wb") as f:
+        f.write(data)
+    try:
+        reader = PdfReader(temp_file_path)
+        return " ".join(page.extract_text() for page in reader.pages)
+    finally:
+        os.remove(temp_file_path)
+
+
+def timed(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume text extraction benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 40, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, parallel threshold {document_text.PARALLEL_PAGE_THRESHOLD} pages")
+    print(f"{'pages':>6} {'KB':>7} {'temp file':>11} {'in-memory':>11} {'parallel':>11} {'cached':>9}")
+    for pages in args.pages:
+        data = make_pdf(pages)
+        name = f"resume_{pages}.pdf"
+        temp_ms, expected = timed(lambda: temp_file_extract(name, data), args.repeat)
+
+        def uncached(parallel):
+            document_text.clear_cache()
+            return document_text.extract_text(name, data, parallel=parallel)
+
+        serial_ms, serial_text = timed(lambda: uncached(False), args.repeat)
+        # Warm the worker pool so process start-up is not billed to the first file
+        uncached(True)
+        parallel_ms, parallel_text = timed(lambda: uncached(True), args.repeat)
+        cached_ms, _ = timed(lambda: document_text.extract_text(name, data), args.repeat)
+        assert serial_text == parallel_text == expected
+        print(f"{pages:>6} {len(data) / 1024:>7.0f} {temp_ms:>9.1f}ms {serial_ms:>9.1f}ms "
+              f"{parallel_ms:>9.1f}ms {cached_ms:>7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
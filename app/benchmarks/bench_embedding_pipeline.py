@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# Local embedding throughput (texts/sec) for 1, 2, 4 and 8 workers, plus the
+# throughput of a fully warm disk cache.
+#
+#   python -m app.benchmarks.bench_embedding_pipeline --texts 20000
+
+import argparse
+import tempfile
+import time
+from app.benchmarks.bench_csv_ingest import make_sales_csv
+from app.csv_ingest import iter_row_texts
+from app.embedding_pipeline import DEFAULT_MODEL_NAME, LocalEmbeddingPipeline
+
+
+def synthetic_texts(count):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = f"{tmp_dir}/sales.csv"
+        make_sales_csv(csv_path, count)
+        return [text for _, text in iter_row_texts(csv_path)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding pipeline throughput benchmark")
+    parser.add_argument("--texts", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--model", type=str, default=DEFAULT_MODEL_NAME)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts)
+    print(f"{'workers':<10}{'seconds':>10}{'texts/sec':>12}")
+    for workers in args.workers:
+        pipeline = LocalEmbeddingPipeline(args.model, args.batch_size, workers, cache_dir=None)
+        # Warm up so model load and pool start-up are not counted
+        pipeline.embed(texts[:args.batch_size * workers])
+        if workers > 1:
+            pipeline._compute(texts[:args.batch_size * workers * 4])
+        start = time.perf_counter()
+        pipeline.embed(texts)
+        elapsed = time.perf_counter() - start
+        pipeline.close()
+        print(f"{workers:<10}{elapsed:>10.2f}{len(texts) / elapsed:>12,.0f}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pipeline = LocalEmbeddingPipeline(args.model, args.batch_size, max(args.workers), cache_dir=cache_dir)
+        pipeline.embed(texts)
+        start = time.perf_counter()
+        pipeline.embed(texts)
+        elapsed = time.perf_counter() - start
+        pipeline.close()
+        print(f"{'cached':<10}{elapsed:>10.2f}{len(texts) / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
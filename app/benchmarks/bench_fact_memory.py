@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# Fact recall and prompt size over long synthetic conversations: full
+# history vs rolling summary vs rolling summary + fact memory.
+#
+#   python -m app.benchmarks.bench_fact_memory --conversations 20 --turns 300 --facts 8
+#
+# Facts are stated early and asked about at the end. A fact counts as
+# recalled when its value appears in the prompt sent for the question. The
+# summarizer is simulated as a word-budgeted summary that keeps the most
+# recent sentences, which is how facts drift out of real summaries over long
+# sessions; embeddings are the offline hashing model from bench_hybrid_search.
+
+import argparse
+import random
+import re
+import statistics
+from langchain.agents import create_agent
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.benchmarks.bench_hybrid_search import HashingEmbeddings
+from app.fact_memory import FactMemoryMiddleware, FactMemoryStore
+from app.rolling_summary import RollingSummarizationMiddleware
+
+FACTS = [
+    ("my favorite programming language is {}", ["Rust", "Go", "Haskell", "Elixir", "Kotlin"],
+     "What is my favorite programming language?"),
+    ("I live in {}", ["Lisbon", "Osaka", "Denver", "Nairobi", "Tallinn"], "Which city do I live in?"),
+    ("my manager is {}", ["Priya Raman", "Tom Becker", "Ana Silva", "Wei Zhang"], "Who is my manager?"),
+    ("my order number is {}", ["A-48213", "B-99120", "C-10457", "D-77342"], "What is my order number?"),
+    ("my dog is named {}", ["Biscuit", "Nova", "Pepper", "Ziggy"], "What is my dog named?"),
+    ("my preferred contact time is {}", ["mornings", "after 6pm", "weekends"], "What is my preferred contact time?"),
+    ("I am allergic to {}", ["peanuts", "shellfish", "penicillin"], "What am I allergic to?"),
+    ("my account tier is {}", ["Gold", "Platinum", "Starter"], "What is my account tier?"),
+]
+FILLER = ["The invoice from last week still shows the old address.",
+          "Can you check whether the refund went through?",
+          "The app crashed again when I opened settings.",
+          "Thanks, that worked, but the export is still slow.",
+          "I also noticed the dashboard totals look off by a few cents."]
+REPLY = "Thanks for the details, I've updated the ticket and will follow up shortly."
+
+
+class StemmedHashingEmbeddings(HashingEmbeddings):
+    # Crude plural/verb stemming so "live" and "lives" share a bucket
+    def _embed(self, text):
+        return super()._embed(re.sub(r"(\w{3,}?)s\b", r"\1", text.lower()))
+
+    def embed(self, texts):
+        return self.embed_documents(texts)
+
+
+class PromptRecorder(BaseChatModel):
+    last_prompt: str = ""
+    prompt_tokens: list = []
+
+    @property
+    def _llm_type(self):
+        return "prompt-recorder"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.last_prompt = "\n".join(str(m.content) for m in messages)
+        self.prompt_tokens.append(count_tokens_approximately(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=REPLY))])
+
+
+class LossySummarizer(BaseChatModel):
+    max_words: int = 120
+
+    @property
+    def _llm_type(self):
+        return "lossy-summarizer"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = str(messages[-1].content)
+        body = prompt.split("Current summary:", 1)[-1].split("Rewrite the summary", 1)[0]
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+|\n+", body)
+                     if s.strip() and not s.startswith("New messages") and s.strip() != "(empty)"]
+        kept, words = [], 0
+        for sentence in reversed(sentences):
+            words += len(sentence.split())
+            if words > self.max_words:
+                break
+            kept.append(sentence.removeprefix("human: ").removeprefix("ai: "))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=" ".join(reversed(kept))))])
+
+
+def make_conversation(turns, fact_count, rng):
+    # Facts are stated in the first third of the conversation, questions come at the end
+    planted = []
+    for template, values, question in rng.sample(FACTS, fact_count):
+        value = rng.choice(values)
+        planted.append((template.format(value), value, question))
+    positions = dict(zip(rng.sample(range(max(turns // 3, fact_count)), fact_count), planted))
+    user_turns = []
+    for turn in range(turns):
+        if turn in positions:
+            statement = positions[turn][0]
+            user_turns.append(statement[0].upper() + statement[1:] + ".")
+        else:
+            user_turns.append(rng.choice(FILLER))
+    return user_turns, [(value, question) for _, value, question in planted]
+
+
+def run(mode, conversations, turns, fact_count, threshold, seed=0):
+    rng = random.Random(seed)
+    recalled = asked = 0
+    prompt_tokens = []
+    for index in range(conversations):
+        user_turns, questions = make_conversation(turns, fact_count, rng)
+        model = PromptRecorder(prompt_tokens=[])
+        middleware = []
+        if mode != "full history":
+            middleware.append(RollingSummarizationMiddleware(model=LossySummarizer(),
+                                                             max_tokens_before_summary=threshold, messages_to_keep=6))
+        if mode == "summary + memory":
+            store = FactMemoryStore(embedder=StemmedHashingEmbeddings())
+            middleware.append(FactMemoryMiddleware(store, k=3, min_score=0.1, conversation_id=f"c{index}"))
+        agent = create_agent(model=model, tools=[], middleware=middleware)
+
+        conversation = []
+        for text in user_turns:
+            conversation.append({"role": "user", "content": text})
+            conversation[:] = agent.invoke({"messages": conversation})["messages"]
+        for value, question in questions:
+            agent.invoke({"messages": conversation + [{"role": "user", "content": question}]})
+            asked += 1
+            recalled += value.lower() in model.last_prompt.lower()
+        prompt_tokens.extend(model.prompt_tokens)
+    return recalled / asked, prompt_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fact memory recall and prompt-size benchmark")
+    parser.add_argument("--conversations", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--facts", type=int, default=6)
+    parser.add_argument("--threshold", type=int, default=1500, help="max_tokens_before_summary")
+    args = parser.parse_args()
+
+    print(f"{args.conversations} conversations x {args.turns} turns, {args.facts} facts each")
+    print(f"{'mode':<18} {'recall':>7} {'mean prompt':>12} {'max prompt':>11} {'last-turn prompt':>17}")
+    for mode in ("full history", "summary only", "summary + memory"):
+        recall, tokens = run(mode, args.conversations, args.turns, args.facts, args.threshold)
+        print(f"{mode:<18} {recall:>7.1%} {statistics.mean(tokens):>12.0f} {max(tokens):>11} {tokens[-1]:>17}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# Query latency of filtered / hybrid candidate search over synthetic resume
+# analyses.
+#
+#   python -m app.benchmarks.bench_hybrid_search --analyses 100000 --queries 200
+#
+# Embeddings are a local feature-hashing model so the run is offline and the
+# numbers measure retrieval rather than an embedding API. With chromadb
+# installed the vectors go into a temporary Chroma collection (as in
+# VectorStoreUtils); otherwise a brute-force numpy store stands in.
+
+import argparse
+import hashlib
+import random
+import statistics
+import tempfile
+import time
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from app.analysis_writer import chunk_id
+from app.hybrid_search import HybridRetriever, build_keyword_index, tokenize
+
+SKILLS = ["Kubernetes", "Docker", "Terraform", "AWS", "GCP", "Azure", "Python", "Go", "Java", "Rust",
+          "React", "TypeScript", "PostgreSQL", "Kafka", "Spark", "Airflow", "TensorFlow", "PyTorch",
+          "Helm", "Prometheus", "Grafana", "Linux", "CI/CD", "GraphQL", "Redis", "Snowflake"]
+LEVELS = ["strong", "solid", "some", "limited", "extensive", "hands-on", "no evidence of"]
+QUERIES = ["strong Kubernetes experience", "hands-on Terraform and AWS", "Python data pipelines with Airflow",
+           "React TypeScript frontend", "PyTorch deep learning research", "Kafka streaming at scale",
+           "Go microservices on GCP", "PostgreSQL performance tuning"]
+
+
+class HashingEmbeddings(Embeddings):
+    def __init__(self, dim=256):
+        self.dim = dim
+
+    def _embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in tokenize(text):
+            digest = int(hashlib.md5(token.encode()).hexdigest()[:8], 16)
+            vector[digest % self.dim] += 1.0 if digest & 1 << 31 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class NumpyVectorStore:
+    # Just the parts of the Chroma vector store interface HybridRetriever uses
+    def __init__(self, embedding):
+        self.embedding = embedding
+        self.ids, self.texts, self.metadatas, self._vectors = [], [], [], []
+        self._position = {}
+
+    def add_texts(self, texts, metadatas, ids):
+        for doc_id, text, metadata, vector in zip(ids, texts, metadatas, self.embedding.embed_documents(texts)):
+            self._position[doc_id] = len(self.ids)
+            self.ids.append(doc_id)
+            self.texts.append(text)
+            self.metadatas.append(metadata)
+            self._vectors.append(vector)
+        self.matrix = np.array(self._vectors, dtype=np.float32)
+        self.columns = {key: np.array([m[key] for m in self.metadatas]) for key in ("job_id", "candidate")}
+
+    def similarity_search(self, query, k=4, filter=None):
+        scores = self.matrix @ np.array(self.embedding.embed_query(query), dtype=np.float32)
+        clauses = (filter or {}).get("$and", [filter] if filter else [])
+        for clause in clauses:
+            (key, value), = clause.items()
+            scores = np.where(self.columns[key] == value, scores, -np.inf)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [Document(id=self.ids[i], page_content=self.texts[i], metadata=self.metadatas[i])
+                for i in top if np.isfinite(scores[i])]
+
+    def get(self, ids=None, include=None, limit=None, offset=0):
+        positions = [self._position[i] for i in ids] if ids is not None else \
+            range(offset, min(offset + (limit or len(self.ids)), len(self.ids)))
+        return {"ids": [self.ids[p] for p in positions], "documents": [self.texts[p] for p in positions],
+                "metadatas": [self.metadatas[p] for p in positions]}
+
+
+def make_analyses(count, jobs, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        skills = rng.sample(SKILLS, 5)
+        levels = [rng.choice(LEVELS) for _ in skills]
+        text = (f"The candidate shows {levels[0]} {skills[0]} and {levels[1]} {skills[1]} experience. "
+                f"Projects mention {skills[2]} and {skills[3]}; {levels[4]} {skills[4]} exposure. "
+                f"Suitability Score: {rng.randint(20, 95)}%")
+        metadata = {"candidate": f"candidate_{i:06d}", "job_id": f"job_{rng.randrange(jobs):03d}",
+                    "source": "resume_analysis"}
+        yield chunk_id(metadata["candidate"], metadata["job_id"], text), text, metadata
+
+
+def make_store(backend, embedding, directory):
+    if backend in ("auto", "chroma"):
+        try:
+            from langchain_community.vectorstores import Chroma
+            return Chroma(collection_name="bench", persist_directory=directory, embedding_function=embedding), "chroma"
+        except ImportError:
+            if backend == "chroma":
+                raise
+    return NumpyVectorStore(embedding), "numpy"
+
+
+def percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100)
+    return statistics.median(samples), cuts[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hybrid candidate search latency benchmark")
+    parser.add_argument("--analyses", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--backend", choices=["auto", "chroma", "numpy"], default="auto")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store, backend = make_store(args.backend, HashingEmbeddings(), directory)
+        start = time.perf_counter()
+        batch = []
+        for entry in make_analyses(args.analyses, args.jobs):
+            batch.append(entry)
+            if len(batch) == 5000:
+                ids, texts, metadatas = zip(*batch)
+                store.add_texts(list(texts), metadatas=list(metadatas), ids=list(ids))
+                batch = []
+        if batch:
+            ids, texts, metadatas = zip(*batch)
+            store.add_texts(list(texts), metadatas=list(metadatas), ids=list(ids))
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        keyword_index = build_keyword_index(store)
+        index_seconds = time.perf_counter() - start
+        retriever = HybridRetriever(store, keyword_index)
+        print(f"{args.analyses} analyses on {backend}: load {load_seconds:.1f}s, BM25 index {index_seconds:.1f}s")
+
+        rng = random.Random(1)
+        cases = [
+            ("keyword", {}, "keyword"),
+            ("vector", {}, "vector"),
+            ("hybrid", {}, "hybrid"),
+            ("hybrid + job_id filter", "job", "hybrid"),
+        ]
+        print(f"{'mode':<24} {'p50 ms':>8} {'p99 ms':>8}")
+        for label, filters, mode in cases:
+            latencies = []
+            for _ in range(args.queries):
+                query = rng.choice(QUERIES)
+                where = {"job_id": f"job_{rng.randrange(args.jobs):03d}"} if filters == "job" else {}
+                begin = time.perf_counter()
+                retriever.search_candidates(query, k=args.k, filters=where, mode=mode)
+                latencies.append((time.perf_counter() - begin) * 1000)
+            p50, p99 = percentiles(latencies)
+            print(f"{label:<24} {p50:>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# Import time of the app modules, measured with `python -X importtime` in a
+# fresh interpreter per run (best of --repeat), plus the heaviest imports.
+#
+#   python -m app.benchmarks.bench_import_time
+#   python -m app.benchmarks.bench_import_time --output import_times.json
+#   python -m app.benchmarks.bench_import_time --baseline import_times.json --max-regression 0.25
+#
+# --output records the numbers as a tracked metric; --baseline compares against
+# a previous run and exits non-zero when a module got slower by more than
+# --max-regression. --root runs against another checkout (e.g. a git worktree
+# of the previous commit) for a before/after comparison.
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+MODULES = [
+    "app.utils",
+    "app.resume_analyzer",
+    "app.resume_batch",
+    "app.binding_tools",
+    "app.structured_output",
+    "app.error_handling",
+    "app.summarize_middleware",
+    "app.streaming",
+    "app.prewarm",
+]
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module, root, python=sys.executable):
+    """Return ``(cumulative_ms, [(self_ms, name), ...])`` or raise RuntimeError with the import error."""
+    env = {**os.environ, "PYTHONPATH": root, "PYTHONWARNINGS": "ignore"}
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=root, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        error = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(error[-1] if error else f"exit code {proc.returncode}")
+    cumulative, modules = None, []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append((int(self_us) / 1000, name))
+        if name == module and len(indent) <= 1:
+            cumulative = int(cumulative_us) / 1000
+    return cumulative, modules
+
+
+def run(modules, root, repeat, top):
+    results = {}
+    for module in modules:
+        try:
+            runs = [measure(module, root) for _ in range(repeat)]
+        except RuntimeError as e:
+            results[module] = {"error": str(e)}
+            continue
+        cumulative, heaviest = min(runs, key=lambda r: r[0])
+        results[module] = {
+            "ms": round(cumulative, 2),
+            "modules": len(heaviest),
+            "heaviest": [[name, round(ms, 2)] for ms, name in sorted(heaviest, reverse=True)[:top]],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of app modules")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the fastest is kept")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest imports (self time) to show per module")
+    parser.add_argument("--root", default=os.getcwd(), help="Checkout to import from")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="JSON from a previous --output run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed slowdown vs --baseline before exiting with status 1")
+    args = parser.parse_args()
+
+    results = run(args.modules, os.path.abspath(args.root), args.repeat, args.top)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'module':<28} {'import ms':>10} {'modules':>8} {'baseline':>9}  heaviest")
+    for module, result in results.items():
+        if "error" in result:
+            print(f"{module:<28} {'-':>10} {'-':>8} {'':>9}  not importable here: {result['error']}")
+            continue
+        before = baseline.get(module, {}).get("ms")
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in result["heaviest"])
+        print(f"{module:<28} {result['ms']:>10.1f} {result['modules']:>8} "
+              f"{before if before is not None else '-':>9}  {heaviest}")
+        if before and result["ms"] > before * (1 + args.max_regression):
+            regressions.append(f"{module}: {before:.1f} -> {result['ms']:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print("Import time regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
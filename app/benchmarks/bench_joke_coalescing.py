@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# Load test of the joke server with and without request coalescing, against
+# the local fake model, in-process over ASGI (no sockets, no API key).
+#
+#   python -m app.benchmarks.bench_joke_coalescing --requests 2000 --concurrency 200 --topics 300
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("JOKE_MODEL", "fake")
+
+import httpx
+from app.joke_generator_api.fake_model import FakeJokeModel
+from app.joke_generator_api.server import create_app
+
+
+async def load(app, requests, concurrency, topics, seed=0):
+    rng = random.Random(seed)
+    payloads = [{"input": {"topic": f"topic {rng.randrange(topics)}"}} for _ in range(requests)]
+    latencies, statuses = [], {}
+    queue = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def worker():
+            while not queue.empty():
+                payload = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post("/joke-generator/invoke", json=payload)
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Joke server coalescing load test")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--topics", type=int, default=200, help="Distinct topics; fewer means more duplicates")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Fake model base latency per call")
+    parser.add_argument("--slots", type=int, default=4, help="Concurrent calls the fake model server accepts")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.topics} topics, "
+          f"fake model {args.latency_ms:.0f} ms/call with {args.slots} slots")
+    print(f"{'mode':<12} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'model calls':>12} {'statuses':>16}")
+    for coalesce in (False, True):
+        model = FakeJokeModel(latency_ms=args.latency_ms, slots=args.slots)
+        app = create_app(model=model, coalesce=coalesce)
+        elapsed, latencies, statuses = asyncio.run(load(app, args.requests, args.concurrency, args.topics))
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        label = "coalesced" if coalesce else "direct"
+        print(f"{label:<12} {len(latencies) / elapsed:>8.1f} {statistics.median(latencies):>9.1f} {p99:>9.1f} "
+              f"{model.calls:>12} {str(statuses):>16}")
+        if coalesce:
+            stats = app.state.chain.stats
+            print(f"  mean batch {stats.mean_batch_size:.1f}, {stats.deduplicated} deduplicated, {stats.rejected} rejected")
+
+
+if __name__ == "__main__":
+    main()
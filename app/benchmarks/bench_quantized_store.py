@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# Quantized memmap store vs Chroma (and an exact float32 scan) on synthetic
+# clustered embeddings: build time, footprint, recall@10 and query latency.
+#
+#   python -m app.benchmarks.bench_quantized_store --count 1000000 --dim 384 --queries 200
+#
+# Each backend runs in its own process so RSS numbers are not mixed up.
+# "float32 flat" is an exact brute-force scan over the same vectors; its
+# results are the ground truth for recall. Chroma is skipped when chromadb
+# is not installed. The RSS columns are the resident memory added by reopening
+# the built store and running the queries, split into anonymous memory (heap,
+# what a serving process really pays) and file-backed pages (memory-mapped
+# files in the page cache, which the OS can drop under pressure).
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+from app.benchmarks.bench_hybrid_search import percentiles
+
+
+def batches(count, dim, clusters, batch_size, seed=0):
+    # Gaussian clusters around random centres, like topic structure in real embeddings
+    centres = np.random.default_rng(seed).normal(size=(clusters, dim)).astype(np.float32)
+    for start in range(0, count, batch_size):
+        rng = np.random.default_rng(seed + 1 + start)
+        n = min(batch_size, count - start)
+        vectors = centres[rng.integers(0, clusters, n)] + rng.normal(scale=0.9, size=(n, dim)).astype(np.float32)
+        yield start, vectors
+
+
+def make_queries(queries, dim, clusters, seed=0):
+    centres = np.random.default_rng(seed).normal(size=(clusters, dim)).astype(np.float32)
+    rng = np.random.default_rng(seed + 10**9)
+    return centres[rng.integers(0, clusters, queries)] + rng.normal(scale=0.9, size=(queries, dim)).astype(np.float32)
+
+
+def rss_bytes():
+    # (anonymous, file-backed) resident bytes
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f if line.startswith(("RssAnon", "RssFile")))
+    return np.array([int(fields["RssAnon"].split()[0]) * 1024, int(fields["RssFile"].split()[0]) * 1024])
+
+
+def disk_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+
+def timed_queries(search, queries, k):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query, k))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def run_flat(args, directory, queries):
+    # Exact float32 scan: every vector resident in memory
+    start = time.perf_counter()
+    matrix = np.empty((args.count, args.dim), dtype=np.float32)
+    for offset, vectors in batches(args.count, args.dim, args.clusters, args.batch):
+        matrix[offset:offset + len(vectors)] = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    build = time.perf_counter() - start
+    np.save(os.path.join(directory, "flat.npy"), matrix)
+    normalised = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    def search(query, k):
+        scores = matrix @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])].tolist()
+
+    before = rss_bytes()
+    results, latencies = timed_queries(search, normalised, args.k)
+    return build, results, latencies, matrix.nbytes, disk_bytes(directory), rss_bytes() - before + [matrix.nbytes, 0]
+
+
+def run_quantized(args, directory, queries):
+    from app.quantized_store import QuantizedVectorStore
+
+    store = QuantizedVectorStore(directory, ivf_threshold=args.ivf_threshold)
+    start = time.perf_counter()
+    for offset, vectors in batches(args.count, args.dim, args.clusters, args.batch):
+        ids = [str(i) for i in range(offset, offset + len(vectors))]
+        store.add_vectors(vectors, metadatas=[{"job_id": f"job_{i % 100:03d}"} for i in range(offset, offset + len(vectors))],
+                          ids=ids)
+    store.persist()
+    build = time.perf_counter() - start
+    footprint = store.footprint()
+    del store
+
+    before = rss_bytes()
+    store = QuantizedVectorStore(directory, nprobe=args.nprobe, rerank_factor=args.rerank_factor)
+    results, latencies = timed_queries(lambda q, k: [row for row, _ in store.search_vector(q, k)], queries, args.k)
+    memory = footprint["codes_bytes"] + footprint["list_bytes"]
+    return build, results, latencies, memory, footprint["disk_bytes"], rss_bytes() - before
+
+
+def run_chroma(args, directory, queries):
+    import chromadb
+
+    client = chromadb.PersistentClient(path=directory)
+    collection = client.get_or_create_collection("bench", metadata={"hnsw:space": "cosine"})
+    start = time.perf_counter()
+    for offset, vectors in batches(args.count, args.dim, args.clusters, args.batch):
+        for i in range(0, len(vectors), 5000):
+            chunk = vectors[i:i + 5000]
+            collection.add(ids=[str(offset + i + j) for j in range(len(chunk))], embeddings=chunk.tolist(),
+                           metadatas=[{"job_id": f"job_{(offset + i + j) % 100:03d}"} for j in range(len(chunk))])
+    build = time.perf_counter() - start
+    del collection, client
+
+    before = rss_bytes()
+    collection = chromadb.PersistentClient(path=directory).get_collection("bench")
+
+    def search(query, k):
+        return [int(i) for i in collection.query(query_embeddings=[query.tolist()], n_results=k)["ids"][0]]
+
+    results, latencies = timed_queries(search, queries, args.k)
+    return build, results, latencies, args.count * args.dim * 4, disk_bytes(directory), rss_bytes() - before
+
+
+BACKENDS = {"float32 flat": run_flat, "quantized": run_quantized, "chroma": run_chroma}
+
+
+def worker(args):
+    directory = os.path.join(args.dir, args.worker.replace(" ", "_"))
+    os.makedirs(directory, exist_ok=True)
+    queries = np.load(os.path.join(args.dir, "queries.npy"))
+    build, results, latencies, memory, disk, query_rss = BACKENDS[args.worker](args, directory, queries)
+    print(json.dumps({
+        "build_s": build, "results": results, "latencies": latencies, "memory_bytes": memory,
+        "disk_bytes": disk, "query_rss_bytes": query_rss.tolist(),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantized vector store vs Chroma")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--rerank-factor", type=int, default=10)
+    parser.add_argument("--ivf-threshold", type=int, default=50_000)
+    parser.add_argument("--backends", default="float32 flat,quantized,chroma")
+    parser.add_argument("--dir", default=None, help="Working directory (default: a temporary one, removed afterwards)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    keep = args.dir is not None
+    args.dir = args.dir or tempfile.mkdtemp(prefix="bench_quantized_")
+    np.save(os.path.join(args.dir, "queries.npy"), make_queries(args.queries, args.dim, args.clusters))
+    print(f"{args.count:,} vectors x {args.dim} dims, {args.queries} queries, k={args.k}, "
+          f"nprobe={args.nprobe}, rerank x{args.rerank_factor}")
+
+    rows, truth = [], None
+    try:
+        for backend in [b.strip() for b in args.backends.split(",")]:
+            if backend == "chroma":
+                try:
+                    import chromadb  # noqa: F401
+                except ImportError:
+                    print("chroma: skipped (chromadb not installed)")
+                    continue
+            command = [sys.executable, "-m", "app.benchmarks.bench_quantized_store", "--worker", backend,
+                       "--dir", args.dir] + [f"--{name.replace('_', '-')}={getattr(args, name)}" for name in
+                                             ("count", "dim", "clusters", "queries", "k", "batch", "nprobe",
+                                              "rerank_factor", "ivf_threshold")]
+            proc = subprocess.run(command, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{backend}: failed\n{proc.stderr[-2000:]}")
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            if backend == "float32 flat":
+                truth = result["results"]
+            rows.append((backend, result))
+    finally:
+        if not keep:
+            shutil.rmtree(args.dir, ignore_errors=True)
+
+    mb = 1024 * 1024
+    print(f"{'backend':<14} {'build s':>8} {'search MB':>10} {'anon RSS MB':>12} {'file RSS MB':>12} "
+          f"{'peak RSS MB':>12} {'disk MB':>8} {'recall@10':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for backend, r in rows:
+        recall = statistics.mean(len(set(a) & set(b)) / args.k for a, b in zip(r["results"], truth)) if truth else None
+        p50, p99 = percentiles(r["latencies"])
+        anon, mapped = (value / mb for value in r["query_rss_bytes"])
+        print(f"{backend:<14} {r['build_s']:>8.1f} {r['memory_bytes'] / mb:>10.0f} {anon:>12.0f} {mapped:>12.0f} "
+              f"{r['peak_rss_bytes'] / mb:>12.0f} {r['disk_bytes'] / mb:>8.0f} "
+              f"{recall if recall is not None else float('nan'):>10.3f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
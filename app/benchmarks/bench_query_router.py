@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# Routed (DataFrame + RAG) versus pure-RAG latency on the sales CSV.
+#
+#   python -m app.benchmarks.bench_query_router --llm-latency-ms 300
+#
+# Runs offline: a deterministic fake LLM with a fixed per-call delay stands in
+# for Gemini and MockEmbedding stands in for bge-small.
+
+import argparse
+import statistics
+import time
+from typing import Any
+from llama_index.core import MockEmbedding, Settings, VectorStoreIndex
+from llama_index.core.llms import CompletionResponse, CustomLLM, LLMMetadata
+from llama_index.core.llms.callbacks import llm_completion_callback
+from app.csv_ingest import iter_documents
+from app.sales_query_router import SalesQueryRouter, load_sales_frame
+
+
+QUESTIONS = [
+    "What was the total sales for Laptops?",
+    "How many orders in the North region?",
+    "Average unit price by region",
+    "Which region had the highest sales?",
+    "Total quantity sold per product in 2023",
+    "Show orders for Webcam in 2024",
+    "What kinds of products do we sell in the West?",
+    "Tell me about order ORD0042",
+]
+
+
+class FakeLLM(CustomLLM):
+    """Deterministic offline LLM: echoes the prompt size after a fixed delay."""
+
+    latency_ms: float = 0.0
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(model_name="fake-deterministic")
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        time.sleep(self.latency_ms / 1000)
+        return CompletionResponse(text=f"Answer based on {len(prompt)} prompt characters.")
+
+    @llm_completion_callback()
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        yield self.complete(prompt, formatted=formatted, **kwargs)
+
+
+def timed(fn, question, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(question)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query router latency benchmark")
+    parser.add_argument("--csv", type=str, default="app/sales_data.csv")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    Settings.llm = FakeLLM(latency_ms=args.llm_latency_ms)
+    Settings.embed_model = MockEmbedding(embed_dim=384)
+
+    index = VectorStoreIndex.from_documents(list(iter_documents(args.csv)))
+    query_engine = index.as_query_engine(similarity_top_k=5)
+    router = SalesQueryRouter(load_sales_frame(args.csv), query_engine)
+
+    print(f"{'question':<48}{'route':>12}{'RAG ms':>10}{'routed ms':>12}")
+    rag_total = routed_total = 0.0
+    for question in QUESTIONS:
+        route, _ = router.route(question)
+        rag_ms = timed(query_engine.query, question, args.repeats)
+        routed_ms = timed(router.query, question, args.repeats)
+        rag_total += rag_ms
+        routed_total += routed_ms
+        print(f"{question[:46]:<48}{route:>12}{rag_ms:>10.1f}{routed_ms:>12.1f}")
+    print(f"{'total':<48}{'':>12}{rag_total:>10.1f}{routed_total:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# Per-turn latency and tokens sent over a long conversation: the original
+# send() loop (full history every turn, whole-prefix summaries) against the
+# rolling summarization middleware with a bounded conversation.
+#
+#   python -m app.benchmarks.bench_rolling_summary --turns 500 --ms-per-1k-tokens 2
+#
+# The chat model is fake: it sleeps in proportion to the tokens it receives
+# and counts them, so the numbers isolate what each mode sends.
+
+import argparse
+import statistics
+import time
+from langchain.agents import create_agent
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.rolling_summary import InspectableSummarizationMiddleware, RollingSummarizationMiddleware
+
+USER_TURN = ("My order {turn} arrived damaged; the box was crushed and two items are missing. "
+             "I need a replacement before Friday and want to know about the refund policy.")
+REPLY = "Sorry about that. I've logged the issue and a replacement is on its way; refunds take 3-5 days. " * 2
+
+
+class FakeChatModel(BaseChatModel):
+    ms_per_1k_tokens: float = 2.0
+    tokens_in: int = 0
+    calls: int = 0
+
+    @property
+    def _llm_type(self):
+        return "fake-timed"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        tokens = count_tokens_approximately(messages)
+        self.tokens_in += tokens
+        self.calls += 1
+        time.sleep(tokens * self.ms_per_1k_tokens / 1e6)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=REPLY))])
+
+
+def run(mode, turns, ms_per_1k_tokens, threshold, keep):
+    model = FakeChatModel(ms_per_1k_tokens=ms_per_1k_tokens)
+    summarizer = FakeChatModel(ms_per_1k_tokens=ms_per_1k_tokens)
+    middleware_class = RollingSummarizationMiddleware if mode == "rolling" else InspectableSummarizationMiddleware
+    middleware = middleware_class(model=summarizer, max_tokens_before_summary=threshold, messages_to_keep=keep)
+    agent = create_agent(model=model, tools=[], middleware=[middleware])
+
+    conversation, latencies = [], []
+    for turn in range(turns):
+        conversation.append({"role": "user", "content": USER_TURN.format(turn=turn)})
+        start = time.perf_counter()
+        result = agent.invoke({"messages": conversation})
+        latencies.append((time.perf_counter() - start) * 1000)
+        if mode == "rolling":
+            conversation[:] = result["messages"]
+        else:
+            # The original send(): raw history grows by two messages a turn
+            conversation.append({"role": "assistant", "content": result["messages"][-1].content})
+    return latencies, model, summarizer, len(conversation)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling summarization benchmark")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=2.0)
+    parser.add_argument("--threshold", type=int, default=2000, help="max_tokens_before_summary")
+    parser.add_argument("--keep", type=int, default=6, help="messages_to_keep")
+    args = parser.parse_args()
+
+    window = max(args.turns // 10, 1)
+    print(f"{args.turns} turns, summarize above {args.threshold} tokens, keep {args.keep} messages")
+    print(f"{'mode':<9} {'first p50':>10} {'last p50':>10} {'last p99':>10} {'tokens sent':>12} "
+          f"{'summary tok':>12} {'total tok':>10} {'summaries':>10} {'state msgs':>11}")
+    for mode in ("original", "rolling"):
+        latencies, model, summarizer, state_size = run(mode, args.turns, args.ms_per_1k_tokens, args.threshold, args.keep)
+        last = latencies[-window:]
+        print(f"{mode:<9} {statistics.median(latencies[:window]):>8.1f}ms {statistics.median(last):>8.1f}ms "
+              f"{statistics.quantiles(last, n=100)[98] if len(last) > 1 else last[0]:>8.1f}ms "
+              f"{model.tokens_in:>12} {summarizer.tokens_in:>12} {model.tokens_in + summarizer.tokens_in:>10} "
+              f"{summarizer.calls:>10} {state_size:>11}")
+
+
+if __name__ == "__main__":
+    main()
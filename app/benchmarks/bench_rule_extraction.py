@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# Fast-path hit rate and per-item latency of the rule-based extractor on a
+# synthetic email corpus, against an LLM-only baseline.
+#
+#   python -m app.benchmarks.bench_rule_extraction --items 2000 --llm-latency-ms 400
+#
+# The "LLM" is a fake agent that sleeps and returns the ground truth, so the
+# run is offline: "fast-path accuracy" measures the rules alone, and "overall
+# accuracy" drops whenever a rule value overrides the model's answer. The
+# misleading templates put a team, company, place, forwarding sender or
+# no-reply address next to the contact details, which the rules must hand to
+# the LLM (or skip) rather than accept.
+
+import argparse
+import random
+import statistics
+import time
+from app.rule_extraction import FastPathExtractor, extract_contact
+from app.structured_output import ContactInfo
+
+
+FIRST = ["John", "Mary", "Ravi", "Alice", "Bob", "Priya", "Chen", "Maria", "Omar", "Lena"]
+LAST = ["Doe", "Smith", "Kumar", "Wong", "Lee", "Garcia", "Nguyen", "Brown", "Patel", "Rossi"]
+STANDARD = [
+    "{name}, {email}, {phone}",
+    "Contact {name} at {email} or {phone}.",
+    "Hi team, please loop in {name} ({email}), phone {phone}.",
+    "From: {name} <{email}>\nTel: {phone}\nSubject: Quarterly review",
+]
+MISLEADING = [
+    # (template, email of the contact); the person is {name} in every case
+    ("{name} here. Questions? Write to Acme Corp Support at help@acme.com or {phone}.", "help@acme.com"),
+    ("{name}: Meeting with New York team next week, call {phone} to join.", None),
+    ("Sales Team <sales@acme.com>, on behalf of {name}, {phone}", "sales@acme.com"),
+    ("Forwarded by {name}. Contact Global Services Desk, desk@vendor.io, {phone}", "desk@vendor.io"),
+    ("Fwd from {other_name} <{other_email}>, {other_phone}: meet {name} ({email}), phone {phone}.", None),
+    ("From: Jobs Board <noreply@jobs-board.com>\nNew applicant {name}, {email}, {phone}.", None),
+]
+IRREGULAR = [
+    "ping {first} - {first_lower} at example dot com, cell five five five 0100",
+    "{first_lower} says hi, reach them via the portal",
+]
+
+
+def make_corpus(count, irregular_share, misleading_share, seed=0):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        other_first, other_last = rng.choice([f for f in FIRST if f != first]), rng.choice(LAST)
+        truth = ContactInfo(
+            name=f"{first} {last}",
+            email=f"{first.lower()}.{last.lower()}@example.com",
+            phone=f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+        )
+        roll = rng.random()
+        if roll < misleading_share:
+            template, email = rng.choice(MISLEADING)
+            truth = truth.model_copy(update={"email": email or truth.email})
+        else:
+            template = rng.choice(IRREGULAR if roll < misleading_share + irregular_share else STANDARD)
+        text = template.format(name=truth.name, email=truth.email, phone=truth.phone,
+                               first=first, first_lower=first.lower(),
+                               other_name=f"{other_first} {other_last}",
+                               other_email=f"{other_first.lower()}.{other_last.lower()}@example.com",
+                               other_phone=f"({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}")
+        corpus.append((text, truth))
+    return corpus
+
+
+class FakeAgent:
+    def __init__(self, truths, latency):
+        self.truths = truths
+        self.latency = latency
+
+    def invoke(self, state):
+        time.sleep(self.latency)
+        # Hints from the fast path follow the prompt after a blank line
+        content = state["messages"][0]["content"]
+        return {"structured_response": self.truths[content.split("\n\n")[0]]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based extraction fast-path benchmark")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--irregular-share", type=float, default=0.15)
+    parser.add_argument("--misleading-share", type=float, default=0.15)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.items, args.irregular_share, args.misleading_share)
+    prompt = "{text}"
+    # Irregular texts repeat with different truths; the last one is what the model answers for all of them
+    truths = {prompt.format(text=text): truth for text, truth in corpus}
+    agent = FakeAgent(truths, args.llm_latency_ms / 1000)
+    extractor = FastPathExtractor(lambda text: extract_contact(text, ContactInfo), agent, prompt)
+
+    latencies, correct_fast, correct = [], 0, 0
+    start = time.perf_counter()
+    for text, _ in corpus:
+        truth = truths[prompt.format(text=text)]
+        item_start = time.perf_counter()
+        before = extractor.fast_hits
+        value = extractor.extract(text)
+        latencies.append((time.perf_counter() - item_start) * 1000)
+        if value == truth:
+            correct += 1
+            if extractor.fast_hits > before:
+                correct_fast += 1
+    elapsed = time.perf_counter() - start
+
+    rules_only = [(time.perf_counter(), extract_contact(text, ContactInfo), time.perf_counter()) for text, _ in corpus]
+    rule_us = statistics.mean((end - begin) * 1e6 for begin, _, end in rules_only)
+
+    print(f"items                   {len(corpus)}")
+    print(f"fast-path hit rate      {extractor.hit_rate:.1%}")
+    print(f"fast-path accuracy      {correct_fast / max(extractor.fast_hits, 1):.1%}")
+    print(f"overall accuracy        {correct / len(corpus):.1%}")
+    print(f"rules per item          {rule_us:.1f} us")
+    print(f"mean latency per item   {statistics.mean(latencies):.2f} ms "
+          f"(LLM-only would be ~{args.llm_latency_ms:.0f} ms)")
+    print(f"p50 / p99 per item      {statistics.median(latencies):.3f} / "
+          f"{statistics.quantiles(latencies, n=100)[98]:.1f} ms")
+    print(f"total                   {elapsed:.1f}s vs ~{len(corpus) * args.llm_latency_ms / 1000:.1f}s LLM-only")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# Sequential if/elif dispatch versus ToolDispatcher on mock tools with
+# injected delays.
+#
+#   python -m app.benchmarks.bench_tool_dispatch --tools 4 --delay-ms 200
+
+import argparse
+import asyncio
+import time
+from langchain_core.tools import StructuredTool
+from app.tool_dispatch import ToolDispatcher
+
+
+def make_sync_tool(name, delay):
+    def fn(location: str) -> str:
+        time.sleep(delay)
+        return f"{name}({location})"
+    return StructuredTool.from_function(fn, name=name, description=f"Mock tool {name}")
+
+
+def make_async_tool(name, delay):
+    async def fn(location: str) -> str:
+        await asyncio.sleep(delay)
+        return f"{name}({location})"
+    return StructuredTool.from_function(coroutine=fn, name=name, description=f"Mock tool {name}")
+
+
+def sequential(tools, tool_calls):
+    by_name = {t.name: t for t in tools}
+    return [by_name[call["name"]].invoke(call["args"]) for call in tool_calls]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool dispatch benchmark")
+    parser.add_argument("--tools", type=int, default=4)
+    parser.add_argument("--delay-ms", type=float, default=200.0)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    delays = [args.delay_ms / 1000 * (i + 1) / args.tools for i in range(args.tools)]
+    sync_tools = [make_sync_tool(f"sync_{i}", d) for i, d in enumerate(delays)]
+    async_tools = [make_async_tool(f"async_{i}", d) for i, d in enumerate(delays)]
+    tool_calls = [{"name": t.name, "args": {"location": "New York, NY"}, "id": f"call_{i}"}
+                  for i, t in enumerate(sync_tools)]
+
+    print(f"{len(delays)} tools, delays {', '.join(f'{d * 1000:.0f}ms' for d in delays)}")
+    print(f"sum of delays {sum(delays) * 1000:.0f}ms, slowest {max(delays) * 1000:.0f}ms\n")
+
+    start = time.perf_counter()
+    sequential(sync_tools, tool_calls)
+    print(f"{'sequential (sync tools)':<32}{(time.perf_counter() - start) * 1000:>8.0f}ms")
+
+    with ToolDispatcher(sync_tools, timeout=args.timeout) as dispatcher:
+        start = time.perf_counter()
+        messages = dispatcher.dispatch(tool_calls)
+    print(f"{'dispatcher (sync tools)':<32}{(time.perf_counter() - start) * 1000:>8.0f}ms")
+    assert [m.tool_call_id for m in messages] == [c["id"] for c in tool_calls]
+
+    async_calls = [dict(call, name=t.name) for call, t in zip(tool_calls, async_tools)]
+    with ToolDispatcher(async_tools, timeout=args.timeout) as dispatcher:
+        start = time.perf_counter()
+        dispatcher.dispatch(async_calls)
+    print(f"{'dispatcher (async tools)':<32}{(time.perf_counter() - start) * 1000:>8.0f}ms")
+
+    # The slowest tool is cut off at its per-tool timeout instead of stalling the turn
+    slowest = sync_tools[-1].name
+    with ToolDispatcher(sync_tools, timeout=args.timeout, timeouts={slowest: delays[-1] / 2}) as dispatcher:
+        start = time.perf_counter()
+        messages = dispatcher.dispatch(tool_calls)
+    print(f"{'dispatcher (slowest timed out)':<32}{(time.perf_counter() - start) * 1000:>8.0f}ms"
+          f"  -> {messages[-1].content}")
+
+
+if __name__ == "__main__":
+    main()
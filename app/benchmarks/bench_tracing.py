@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# Per-call overhead of TracingChatModel on a zero-latency fake model, for the
+# ring buffer, the background JSONL writer and sampled tracing.
+#
+#   python -m app.benchmarks.bench_tracing --calls 20000 --messages 20
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.tracing import JsonlSink, RingBufferSink, TracingChatModel
+
+
+def per_call_us(model, messages, calls):
+    runs = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls // 5):
+            model.invoke(messages)
+        runs.append((time.perf_counter() - start) / (calls // 5) * 1e6)
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracing overhead benchmark")
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--messages", type=int, default=20, help="Messages per prompt")
+    args = parser.parse_args()
+
+    messages = [HumanMessage("How do I reset my password? " * 10) if i % 2 == 0 else
+                AIMessage("Open settings and choose 'reset password'. " * 10) for i in range(args.messages)]
+    base = FakeListChatModel(responses=["Sure, here is how."])
+
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl = JsonlSink(os.path.join(directory, "traces.jsonl"))
+        cases = [
+            ("untraced", base),
+            ("ring buffer", TracingChatModel(base, sink=RingBufferSink(1000))),
+            ("jsonl writer", TracingChatModel(base, sink=jsonl)),
+            ("jsonl, 10% sampled", TracingChatModel(base, sink=jsonl, sample_rate=0.1)),
+            ("ring + prompts", TracingChatModel(base, sink=RingBufferSink(1000), capture_prompts=True)),
+        ]
+        baseline = None
+        print(f"{'mode':<20} {'us/call':>9} {'overhead':>9}")
+        for label, model in cases:
+            us = per_call_us(model, messages, args.calls)
+            baseline = baseline or us
+            print(f"{label:<20} {us:>9.1f} {us - baseline:>+8.1f}us")
+        jsonl.close()
+        print(f"jsonl records dropped: {jsonl.dropped}")
+
+
+if __name__ == "__main__":
+    main()
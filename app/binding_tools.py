@@ -1,10 +1,10 @@
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import ToolMessage
-from langchain.tools import tool
+from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import os
-import streamlit as st
+from app import resources
+from app.tool_dispatch import ToolDispatcher
+from app.tool_cache import cached_tool
 
 # -------------------------
 # 1. Tool schemas
@@ -24,6 +24,9 @@ class GetPopulation(BaseModel):
 # 2. Tool implementations
 # -------------------------
 
+# Both tools are pure functions of `location`, so repeat cities are served
+# from the cache (counters on get_weather.cache.stats).
+@cached_tool(ttl=600, maxsize=1024)
 @tool(args_schema=GetWeather)
 def get_weather(location: str) -> str:
     """Returns the current temperature for a city."""
@@ -34,6 +37,7 @@ def get_weather(location: str) -> str:
     return mock_weather.get(location, "Weather data unavailable")
 
 
+@cached_tool(ttl=24 * 3600, maxsize=1024)
 @tool(args_schema=GetPopulation)
 def get_population(location: str) -> str:
     """Returns the population for a city."""
@@ -48,80 +52,86 @@ def get_population(location: str) -> str:
 # 3. Create configurable model
 # -------------------------
 
-# Load environment variables
+def get_model():
+    from langchain.chat_models import init_chat_model
+    from app.llm_cache import install_llm_cache
 
-load_dotenv('C:/Agentic/codellm/.env')
+    # Load environment variables
+    load_dotenv('C:/Agentic/codellm/.env')
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    if not OPENAI_API_KEY:
+        raise RuntimeError("Please set your OPENAI_API_KEY in a .env file")
 
+    # Repeat prompts with the same model parameters are answered from the LLM cache
+    install_llm_cache()
 
-# Configure Google AI API 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    model = init_chat_model(
+        model="gpt-4.1-nano",
+        model_provider="openai",
+        openai_api_key=OPENAI_API_KEY,
+        temperature=0,
+    )
+
+    # Bind tools
+    return model.bind_tools(
+        [get_weather, get_population]
+    )
 
-if not OPENAI_API_KEY:
-    st.error("Please set your OPENAI_API_KEY in a .env file")
-    st.stop()
 
-model = init_chat_model(
-    model="gpt-4.1-nano",
-    model_provider="openai",
-    openai_api_key=OPENAI_API_KEY,
-    temperature=0,
-)
+def get_dispatcher():
+    # One dispatcher (and thread pool) per process, shared by every ask()
+    return resources.get_or_create(
+        "binding_tools_dispatcher", lambda: ToolDispatcher([get_weather, get_population], timeout=10)
+    )
 
-# Bind tools
-model_with_tools = model.bind_tools(
-    [get_weather, get_population]
-)
 
 # -------------------------
 # 4. Invoke with default model (GPT-4o)
 # -------------------------
 
-response = model_with_tools.invoke(
-    "Which city is hotter today and which is bigger: LA or NY?"
-)
+def ask(model_with_tools, question, dispatcher=None):
+    ai_msg = model_with_tools.invoke(question)  # your first response
 
-print("gpt-4.1-nano response:")
-print(response.content)
+    # Tools are looked up by name and all calls from this turn run concurrently;
+    # ToolMessages come back in tool_call order.
+    dispatcher = dispatcher or get_dispatcher()
+    tool_messages = dispatcher.dispatch(ai_msg.tool_calls)
 
-ai_msg = response  # your first response
+    final_response = model_with_tools.invoke(
+        [
+            ai_msg,
+            *tool_messages
+        ]
+    )
+    return ai_msg, final_response
 
-tool_messages = []
 
-for call in ai_msg.tool_calls:
-    tool_name = call["name"]
-    args = call["args"]
+def main():
+    try:
+        model_with_tools = get_model()
+    except RuntimeError as e:
+        print(e)
+        return
 
-    if tool_name == "get_weather":
-        result = get_weather.invoke(args)
-    elif tool_name == "get_population":
-        result = get_population.invoke(args)
-    else:
-        continue
+    response, final_response = ask(model_with_tools, "Which city is hotter today and which is bigger: LA or NY?")
 
-    tool_messages.append(
-        ToolMessage(
-            content=result,
-            tool_call_id=call["id"]
-        )
-    )
+    print("gpt-4.1-nano response:")
+    print(response.content)
 
-final_response = model_with_tools.invoke(
-    [
-        ai_msg,
-        *tool_messages
-    ]
-)
+    print("\n✅ Final answer:")
+    print(final_response.content)
 
-print("\n✅ Final answer:")
-print(final_response.content)
 
 # python -m pip install -r requirements.txt
-# python -m binding_tools
+# python -m app.binding_tools
 
 
 # | Call                      | Who runs it | Purpose       |
 # | ------------------------- | ----------- | ------------- |
 # | `model.invoke()` #1       | LLM         | Tool planning |
-# | `get_weather.invoke()`    | Python      | Fetch data    |
-# | `get_population.invoke()` | Python      | Fetch data    |
+# | `dispatcher.dispatch()`   | Python      | Fetch data (all tool calls concurrently) |
 # | `model.invoke()` #2       | LLM         | Final answer  |
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# Defaults match the splitter previously hard-coded in utils.py and resume_analyzer.py
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
+# "chars", "approx" (no tokenizer needed), "tiktoken:<encoding>" or "hf:<model name>"
+CHUNK_UNIT = os.getenv("CHUNK_UNIT", "chars")
+# Batches smaller than this are split in-process; pool start-up would dominate
+PARALLEL_MIN_DOCUMENTS = 64
+
+_WORD_PIECE = re.compile(r"\w+|[^\w\s]")
+
+
+def approx_token_count(text):
+    # Words and punctuation, with long words counted as several pieces;
+    # close to WordPiece/BPE counts for English prose
+    return sum(1 + len(piece) // 8 for piece in _WORD_PIECE.findall(text))
+
+
+# Metadata fields that, with the chunk text, identify a chunk across re-runs.
+# A tuple lists alternatives, the first one present wins: the resume's content
+# hash when known, else the candidate name.
+ID_FIELDS = (("resume_id", "candidate"), "job_id")
+
+
+def stable_id(key, text):
+    """Deterministic chunk id from a key tuple (e.g. candidate, job_id) and the chunk text."""
+    text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return hashlib.sha1("\0".join([*map(str, key), text_hash]).encode("utf-8")).hexdigest()
+
+
+def id_filter(metadata, id_fields=ID_FIELDS):
+    """``{field: value}`` for the ``id_fields`` that identify ``metadata``'s chunks."""
+    selected = {}
+    for names in id_fields:
+        names = names if isinstance(names, tuple) else (names,)
+        name = next((name for name in names if metadata.get(name)), names[-1])
+        selected[name] = metadata.get(name, "")
+    return selected
+
+
+def id_key(metadata, id_fields=ID_FIELDS):
+    # The key tuple passed to stable_id for every chunk of one document
+    return tuple(id_filter(metadata, id_fields).values())
+
+
+@dataclass(frozen=True)
+class ChunkConfig:
+    chunk_size: int = CHUNK_SIZE
+    chunk_overlap: int = CHUNK_OVERLAP
+    unit: str = CHUNK_UNIT
+    id_fields: tuple = ID_FIELDS
+
+    def make_splitter(self):
+        kwargs = {"chunk_size": self.chunk_size, "chunk_overlap": self.chunk_overlap, "add_start_index": True}
+        if self.unit == "chars":
+            return RecursiveCharacterTextSplitter(**kwargs)
+        if self.unit == "approx":
+            return RecursiveCharacterTextSplitter(length_function=approx_token_count, **kwargs)
+        if self.unit.startswith("tiktoken:"):
+            return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+                encoding_name=self.unit.split(":", 1)[1], **kwargs)
+        if self.unit.startswith("hf:"):
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(self.unit.split(":", 1)[1])
+            return RecursiveCharacterTextSplitter.from_huggingface_tokenizer(tokenizer, **kwargs)
+        raise ValueError(f"Unknown chunk unit: {self.unit}")
+
+
+@dataclass
+class Chunk:
+    id: str
+    text: str
+    start: int
+    end: int
+    index: int
+    metadata: dict = field(default_factory=dict)
+
+    def to_document(self):
+        metadata = {**self.metadata, "start_index": self.start, "end_index": self.end, "chunk_index": self.index}
+        return Document(id=self.id, page_content=self.text, metadata=metadata)
+
+
+_worker_chunker = None
+
+
+def _init_worker(config):
+    global _worker_chunker
+    _worker_chunker = Chunker(config)
+
+
+def _split_in_worker(item):
+    return _worker_chunker.split(*item)
+
+
+class Chunker:
+    """Split texts into ``Chunk``s with stable ids and character offsets.
+
+    Sizes are measured in ``config.unit`` (characters or tokens of the
+    embedding model). ``split_many`` fans large batches out to a process pool.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or ChunkConfig()
+        self._splitter = self.config.make_splitter()
+
+    def split(self, text, metadata=None):
+        metadata = metadata or {}
+        key = id_key(metadata, self.config.id_fields)
+        chunks = []
+        for index, doc in enumerate(self._splitter.create_documents([text])):
+            start = doc.metadata.get("start_index", -1)
+            chunks.append(Chunk(
+                id=stable_id(key, doc.page_content),
+                text=doc.page_content,
+                start=start,
+                end=start + len(doc.page_content) if start >= 0 else -1,
+                index=index,
+                metadata=dict(metadata),
+            ))
+        return chunks
+
+    def split_documents(self, text, metadata=None):
+        return [chunk.to_document() for chunk in self.split(text, metadata)]
+
+    def split_many(self, items, workers=None, chunksize=32):
+        """Split ``(text, metadata)`` pairs; returns one chunk list per item, in order."""
+        items = list(items)
+        workers = workers or os.cpu_count() or 1
+        if workers < 2 or len(items) < PARALLEL_MIN_DOCUMENTS:
+            return [self.split(text, metadata) for text, metadata in items]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.config,)) as pool:
+            return list(pool.map(_split_in_worker, items, chunksize=chunksize))
+
+
+_default_chunker = None
+
+
+def default_chunker():
+    # Shared by VectorStoreUtils and resume_analyzer; configured via CHUNK_* env vars
+    global _default_chunker
+    if _default_chunker is None:
+        _default_chunker = Chunker()
+    return _default_chunker
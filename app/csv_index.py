@@ -0,0 +1,99 @@
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from llama_index.core import Document, Settings, StorageContext, VectorStoreIndex, load_index_from_storage
+from app.csv_ingest import iter_row_texts
+
+
+DEFAULT_PERSIST_DIR = "./storage/sales"
+# Rows embedded per insert_nodes call
+DEFAULT_BATCH_SIZE = 2_000
+
+
+def row_hash(text):
+    # The rendered row text is the row's identity: a changed row gets a new id
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RefreshReport:
+    added: int = 0
+    skipped: int = 0
+    removed: int = 0
+    timings: dict = field(default_factory=dict)
+
+    def __str__(self):
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+        return f"added={self.added} skipped={self.skipped} removed={self.removed} ({phases})"
+
+
+def load_or_create_index(persist_dir=DEFAULT_PERSIST_DIR):
+    if os.path.exists(persist_dir):
+        storage_context = StorageContext.from_defaults(persist_dir=persist_dir)
+        return load_index_from_storage(storage_context)
+    return VectorStoreIndex(nodes=[])
+
+
+def _insert_documents(index, documents):
+    nodes = Settings.node_parser.get_nodes_from_documents(documents)
+    index.insert_nodes(nodes)
+
+
+def refresh_index(csv_path, persist_dir=DEFAULT_PERSIST_DIR, batch_size=DEFAULT_BATCH_SIZE):
+    """Bring the persisted index in line with ``csv_path``.
+
+    Every row is stored as a document whose id is the hash of its text, so
+    only rows whose hash is not yet in the docstore are embedded, and hashes
+    that no longer appear in the CSV are deleted. Returns ``(index, report)``.
+    """
+    report = RefreshReport()
+
+    start = time.perf_counter()
+    index = load_or_create_index(persist_dir)
+    existing_ids = set(index.ref_doc_info.keys())
+    report.timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    embed_seconds = 0.0
+    seen_ids = set()
+    pending = []
+    for _, text in iter_row_texts(csv_path, chunksize=max(batch_size, 10_000)):
+        doc_id = row_hash(text)
+        if doc_id in seen_ids:
+            # Identical rows collapse onto the same document
+            continue
+        seen_ids.add(doc_id)
+        if doc_id in existing_ids:
+            report.skipped += 1
+            continue
+
+        pending.append(Document(text=text, id_=doc_id))
+        if len(pending) >= batch_size:
+            embed_start = time.perf_counter()
+            _insert_documents(index, pending)
+            embed_seconds += time.perf_counter() - embed_start
+            report.added += len(pending)
+            pending = []
+
+    if pending:
+        embed_start = time.perf_counter()
+        _insert_documents(index, pending)
+        embed_seconds += time.perf_counter() - embed_start
+        report.added += len(pending)
+    report.timings["scan"] = time.perf_counter() - start - embed_seconds
+    report.timings["embed"] = embed_seconds
+
+    start = time.perf_counter()
+    stale_ids = existing_ids - seen_ids
+    for doc_id in stale_ids:
+        index.delete_ref_doc(doc_id, delete_from_docstore=True)
+    report.removed = len(stale_ids)
+    report.timings["delete"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if report.added or report.removed or not os.path.exists(persist_dir):
+        index.storage_context.persist(persist_dir=persist_dir)
+    report.timings["persist"] = time.perf_counter() - start
+
+    return index, report
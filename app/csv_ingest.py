@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pandas as pd
+from llama_index.core import Document
+
+
+# Rows read per pandas chunk. Large enough to amortise the per-chunk overhead,
+# small enough that tens of millions of rows never sit in memory at once.
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def iter_csv_chunks(csv_path, chunksize=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+    # Stream the CSV in fixed-size DataFrame chunks instead of one big read_csv
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"The file {csv_path} does not exist.")
+    with pd.read_csv(csv_path, chunksize=chunksize, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def render_rows(df):
+    """Render every row of ``df`` as ``"col: val, col: val, ..."``.
+
+    Column-wise string concatenation replaces the per-row ``iterrows`` loop,
+    producing the same text the original loader built for each row.
+    """
+    columns = list(df.columns)
+    if df.empty or not columns:
+        return np.empty(len(df), dtype=object)
+
+    # Object-array "+" concatenates element-wise without pandas' str.cat
+    # intermediates, which keeps peak memory per chunk low.
+    text = f"{columns[0]}: " + df[columns[0]].astype(str).to_numpy(dtype=object)
+    for col in columns[1:]:
+        text = text + f", {col}: " + df[col].astype(str).to_numpy(dtype=object)
+    return text
+
+
+def iter_row_texts(csv_path, chunksize=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+    # Yield (row_number, text) pairs, row_number being the 0-based data row
+    for chunk in iter_csv_chunks(csv_path, chunksize=chunksize, **read_csv_kwargs):
+        yield from zip(chunk.index.tolist(), render_rows(chunk).tolist())
+
+
+def iter_documents(csv_path, chunksize=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+    """Yield one ``Document`` per CSV row without materialising the file.
+
+    Because this is a generator, indexing can start on the first chunk while
+    the rest of the file is still being read.
+    """
+    for _, text in iter_row_texts(csv_path, chunksize=chunksize, **read_csv_kwargs):
+        yield Document(text=text)
+
+
+def iter_document_batches(csv_path, batch_size=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+    # Same as iter_documents but grouped, handy for batched index inserts
+    batch = []
+    for document in iter_documents(csv_path, chunksize=batch_size, **read_csv_kwargs):
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,391 @@
+import hashlib
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, List
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import PrivateAttr
+
+from app import resources
+
+try:
+    import fcntl
+except ImportError:  # Windows: compactions are only serialised within the process
+    fcntl = None
+
+
+DEFAULT_MODEL_NAME = "BAAI/bge-small-en-v1.5"
+DEFAULT_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "./storage/embedding_cache")
+DEFAULT_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+DEFAULT_NUM_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "1"))
+# Past this many segments the smallest ones are merged, keeping open maps bounded
+DEFAULT_MAX_SEGMENTS = int(os.getenv("EMBEDDING_CACHE_MAX_SEGMENTS", "32"))
+# LlamaIndex rejects an embed_batch_size above this
+MAX_LLAMA_INDEX_BATCH = 2048
+
+
+def text_key(model_name, text):
+    return hashlib.sha1(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _try_file_lock(path):
+    # Yields whether this process got the exclusive lock on ``path`` (without waiting)
+    if fcntl is None:
+        yield True
+        return
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """Persistent (model, text hash) -> float32 vector cache.
+
+    Vectors are appended as immutable ``.npy`` segments that are opened with
+    ``mmap_mode="r"``, so a large cache costs page cache rather than heap.
+    Each segment has a sibling ``.keys`` file; it is written last and acts as
+    the commit marker, so a crash mid-write never exposes a partial segment.
+    Once there are more than ``max_segments`` segments, the smaller half is
+    merged into one, so the number of open maps stays bounded however many
+    batches are written.
+
+    Other processes may share the directory: compaction holds a file lock,
+    and segments that appear or disappear meanwhile are picked up (or
+    dropped) by re-listing the directory on a lookup miss. Within a process,
+    use ``shared_cache`` so there is one instance per directory.
+    """
+
+    def __init__(self, cache_dir, model_name, max_segments=DEFAULT_MAX_SEGMENTS):
+        self.model_name = model_name
+        self.path = os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+        self.max_segments = max(2, max_segments)
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._segments = {}
+        self._keys = {}
+        self._index = {}
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        # Sync with segments written or merged away by other instances; called with _lock held
+        on_disk = {name[:-len(".keys")] for name in os.listdir(self.path) if name.endswith(".keys")}
+        gone = set(self._segments) - on_disk
+        for segment in gone:
+            del self._segments[segment], self._keys[segment]
+        for segment in sorted(on_disk - set(self._segments)):
+            try:
+                self._open_segment(segment)
+            except FileNotFoundError:
+                pass  # merged away between the listing and the open
+        if gone:
+            # Keys that pointed into a merged-away segment move to another copy (the merged one)
+            self._index = {key: location for key, location in self._index.items() if location[0] not in gone}
+            for segment, keys in self._keys.items():
+                for row, key in enumerate(keys):
+                    self._index.setdefault(key, (segment, row))
+
+    def _open_segment(self, segment):
+        with open(os.path.join(self.path, f"{segment}.keys")) as f:
+            keys = f.read().split()
+        vectors = np.load(os.path.join(self.path, f"{segment}.npy"), mmap_mode="r")
+        self._segments[segment] = vectors
+        self._keys[segment] = keys
+        for row, key in enumerate(keys):
+            self._index[key] = (segment, row)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get_many(self, keys):
+        # Returns {key: vector} for the keys that are cached
+        found = {}
+        with self._lock:
+            self._lookup(keys, found)
+            if len(found) < len(keys):
+                self._refresh()
+                self._lookup([key for key in keys if key not in found], found)
+        return found
+
+    def _lookup(self, keys, found):
+        for key in keys:
+            location = self._index.get(key)
+            if location is not None:
+                segment, row = location
+                found[key] = self._segments[segment][row]
+
+    def _write_segment(self, keys, fill, dim):
+        # fill(out) writes the rows into a memmap of the new segment; the
+        # .keys file goes last as the commit marker
+        segment = f"seg_{uuid.uuid4().hex}"
+        keys_path = os.path.join(self.path, f"{segment}.keys")
+        out = np.lib.format.open_memmap(os.path.join(self.path, f"{segment}.npy"), mode="w+",
+                                        dtype=np.float32, shape=(len(keys), dim))
+        fill(out)
+        out.flush()
+        del out
+        with open(f"{keys_path}.tmp", "w") as f:
+            f.write("\n".join(keys))
+        os.replace(f"{keys_path}.tmp", keys_path)
+        return segment
+
+    def put_many(self, keys, vectors):
+        if not keys:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        def fill(out):
+            out[:] = vectors
+
+        segment = self._write_segment(list(keys), fill, vectors.shape[1])
+        with self._lock:
+            # Refreshing also opens the new segment, or whatever another process merged it into
+            self._refresh()
+            too_many = len(self._segments) > self.max_segments
+        if too_many:
+            self._compact_smallest()
+
+    def _compact_smallest(self):
+        # Size-tiered: merge the smaller half, so each row is rewritten O(log n) times
+        with self._lock:
+            by_size = sorted(self._segments, key=lambda s: len(self._segments[s]))
+        self.compact(by_size[:len(by_size) // 2 + 1])
+
+    def compact(self, segments=None):
+        """Merge ``segments`` (default: all) into one, dropping overwritten keys.
+
+        Lookups keep working throughout: rows are copied from the old
+        segments, and the index is switched to the new one under the lock.
+        Returns without doing anything if another thread or process is
+        already compacting this directory.
+        """
+        if not self._compact_lock.acquire(blocking=False):
+            return
+        try:
+            with _try_file_lock(os.path.join(self.path, ".compact.lock")) as locked:
+                if locked:
+                    self._compact(segments)
+        finally:
+            self._compact_lock.release()
+
+    def _compact(self, segments):
+        with self._lock:
+            self._refresh()
+            old = [s for s in (segments or list(self._segments)) if s in self._segments]
+            if len(old) <= 1:
+                return
+            live = [(key, segment, row) for segment in old for row, key in enumerate(self._keys[segment])
+                    if self._index.get(key) == (segment, row)]
+            sources = {segment: self._segments[segment] for segment in old}
+        dim = next(iter(sources.values())).shape[1]
+
+        def fill(out):
+            for start in range(0, len(live), 65536):
+                chunk = live[start:start + 65536]
+                out[start:start + len(chunk)] = [sources[segment][row] for _, segment, row in chunk]
+
+        merged = self._write_segment([key for key, _, _ in live], fill, dim)
+        vectors = np.load(os.path.join(self.path, f"{merged}.npy"), mmap_mode="r")
+        with self._lock:
+            self._segments[merged] = vectors
+            self._keys[merged] = [key for key, _, _ in live]
+            for row, (key, segment, old_row) in enumerate(live):
+                # Keys rewritten into a newer segment meanwhile keep pointing there
+                if self._index.get(key) == (segment, old_row):
+                    self._index[key] = (merged, row)
+            for segment in old:
+                self._segments.pop(segment, None)
+                self._keys.pop(segment, None)
+        del sources
+        for segment in old:
+            # .keys first, so other instances stop listing the segment before its vectors go
+            for ext in ("keys", "npy"):
+                try:
+                    os.remove(os.path.join(self.path, f"{segment}.{ext}"))
+                except FileNotFoundError:
+                    pass
+
+
+def shared_cache(cache_dir, model_name):
+    """The process-wide ``EmbeddingCache`` for ``cache_dir`` and ``model_name``."""
+    path = os.path.abspath(cache_dir)
+    return resources.get_or_create(("embedding_cache", path, model_name), lambda: EmbeddingCache(path, model_name))
+
+
+def embed_with_cache(cache, model_name, texts, compute):
+    """Embed ``texts`` through ``compute`` only for those not already cached.
+
+    Duplicate texts inside one call are computed once as well.
+    """
+    keys = [text_key(model_name, text) for text in texts]
+    found = cache.get_many(keys) if cache is not None else {}
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        computed = np.asarray(compute(list(missing.values())), dtype=np.float32)
+        if cache is not None:
+            cache.put_many(list(missing), computed)
+        found.update(zip(missing, computed))
+
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+
+# -------------------------
+# Process pool workers
+# -------------------------
+
+_worker_model = None
+
+
+def _init_worker(model_name, batch_size, threads):
+    global _worker_model
+    # One model per process; cap intra-op threads so workers don't oversubscribe the CPU
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+    _worker_model = HuggingFaceEmbedding(model_name=model_name, embed_batch_size=batch_size)
+
+
+def _embed_shard(texts):
+    return np.asarray(_worker_model.get_text_embedding_batch(texts), dtype=np.float32)
+
+
+class LocalEmbeddingPipeline:
+    """Batched local sentence-embedding with an optional process pool and disk cache."""
+
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, batch_size=DEFAULT_BATCH_SIZE,
+                 num_workers=DEFAULT_NUM_WORKERS, cache_dir=DEFAULT_CACHE_DIR):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_workers = max(1, num_workers)
+        self.cache = shared_cache(cache_dir, model_name) if cache_dir else None
+        self._model = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        # Loaded on first use; queries and single-worker batches run in-process
+        with self._lock:
+            if self._model is None:
+                from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+                self._model = HuggingFaceEmbedding(model_name=self.model_name, embed_batch_size=self.batch_size)
+            return self._model
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.num_workers,
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.batch_size, threads),
+                )
+            return self._pool
+
+    def _compute(self, texts):
+        if self.num_workers == 1 or len(texts) <= self.batch_size:
+            return np.asarray(self.model.get_text_embedding_batch(texts), dtype=np.float32)
+        # Shards of a few batches each keep every worker busy until the end
+        shard_size = self.batch_size * 4
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+        return np.concatenate(list(self._get_pool().map(_embed_shard, shards)))
+
+    def embed(self, texts):
+        return embed_with_cache(self.cache, self.model_name, list(texts), self._compute)
+
+    def embed_query(self, text):
+        return self.model.get_query_embedding(text)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# -------------------------
+# Framework adapters
+# -------------------------
+
+class CachedHuggingFaceEmbedding(BaseEmbedding):
+    """LlamaIndex embed model backed by LocalEmbeddingPipeline.
+
+    Usage: ``Settings.embed_model = CachedHuggingFaceEmbedding()``
+    """
+
+    _pipeline: Any = PrivateAttr()
+
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, batch_size=DEFAULT_BATCH_SIZE,
+                 num_workers=DEFAULT_NUM_WORKERS, cache_dir=DEFAULT_CACHE_DIR, **kwargs):
+        # LlamaIndex slices inputs by embed_batch_size before calling us; hand
+        # over enough texts per call for every worker to get several batches.
+        kwargs.setdefault("embed_batch_size", min(MAX_LLAMA_INDEX_BATCH, batch_size * max(1, num_workers) * 8))
+        super().__init__(model_name=model_name, **kwargs)
+        self._pipeline = LocalEmbeddingPipeline(model_name, batch_size, num_workers, cache_dir)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedHuggingFaceEmbedding"
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._pipeline.embed_query(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._pipeline.embed([text])[0].tolist()
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._pipeline.embed(texts).tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain ``Embeddings`` wrapper adding batching and the disk cache.
+
+    Wraps any LangChain embeddings, e.g. ``GoogleGenerativeAIEmbeddings``,
+    so re-embedding an already-seen chunk never calls the API again.
+    """
+
+    def __init__(self, embeddings, model_name, batch_size=DEFAULT_BATCH_SIZE, cache_dir=DEFAULT_CACHE_DIR):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache = shared_cache(cache_dir, model_name) if cache_dir else None
+
+    def _compute(self, texts):
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            vectors.extend(self.embeddings.embed_documents(texts[i:i + self.batch_size]))
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return embed_with_cache(self.cache, self.model_name, list(texts), self._compute).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
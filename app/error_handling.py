@@ -1,15 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Union
-from langchain.agents import create_agent
-from langchain.agents.structured_output import ToolStrategy
 from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv('C:/Agentic/codellm/.env')
-# Configure Google AI API 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
 
 
 class ContactInfo(BaseModel):
@@ -24,15 +15,29 @@ class ExtractionResult(BaseModel):
     items: List[Union[ContactInfo, EventDetails]]
 
 
-agent = create_agent(
-    model="gpt-4.1-nano",     
-    tools=[],
-    response_format=ToolStrategy(ExtractionResult)
-)
+def get_agent():
+    from langchain.agents import create_agent
+    from app.llm_cache import install_llm_cache
+    from langchain.agents.structured_output import ToolStrategy
+
+    # Load environment variables (OPENAI_API_KEY)
+    load_dotenv('C:/Agentic/codellm/.env')
+    install_llm_cache()
+    return create_agent(
+        model="gpt-4.1-nano",     
+        tools=[],
+        response_format=ToolStrategy(ExtractionResult)
+    )
+
+
+def main():
+    agent = get_agent()
+    respone = agent.invoke({
+        "messages": [{"role": "user", "content": "Extract info: John Doe (john@email.com) is organizing Tech Conference on March 15th"}]
+    })
 
+    print(respone["structured_response"])
 
-respone = agent.invoke({
-    "messages": [{"role": "user", "content": "Extract info: John Doe (john@email.com) is organizing Tech Conference on March 15th"}]
-})
 
-print(respone["structured_response"])
+if __name__ == "__main__":
+    main()
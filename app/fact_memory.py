@@ -0,0 +1,195 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import numpy as np
+from langchain.agents.middleware import AgentMiddleware
+
+# Sentence-level patterns for durable user facts. Each yields (key, fact);
+# a later fact with the same key replaces the earlier one ("my favorite
+# language is Go" overrides "... is Rust"), keyless facts accumulate.
+REMEMBER = re.compile(r"^(?:please\s+)?remember(?:\s+(?:this|that))?(?:\s+forever)?\s*[:,-]?\s*(?:that\s+)?(.+)$", re.I)
+MY_ATTRIBUTE = re.compile(r"\bmy\s+((?:[a-z-]+\s+){0,4}?[a-z-]+)\s+(?:is|are|was)\s+(.+)$", re.I)
+CALL_ME = re.compile(r"\b(?:call me|my name is)\s+([A-Z][\w-]*(?:\s+[A-Z][\w-]*)?)", re.I)
+I_STATEMENT = re.compile(
+    r"\bI(?:\s+am|'m)?\s+(live|work|prefer|like|love|hate|use|need|am allergic to|am based in)\s+(.+)$", re.I
+)
+# Verbs that hold one value at a time, so a new statement replaces the old one
+SINGLE_VALUED = {"live", "work", "am based in"}
+SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def _clean(text):
+    return text.strip().rstrip(".!?").strip()
+
+
+def extract_facts(text):
+    """Return ``(key, fact)`` pairs stated by the user in ``text``."""
+    facts = []
+    for sentence in SENTENCE.split(text):
+        if sentence.strip().endswith("?"):
+            continue
+        sentence = _clean(sentence)
+        if not sentence or len(sentence) > 300:
+            continue
+        remembered = REMEMBER.match(sentence)
+        if remembered:
+            sentence = _clean(remembered.group(1))
+
+        name = CALL_ME.search(sentence)
+        attribute = MY_ATTRIBUTE.search(sentence)
+        statement = I_STATEMENT.search(sentence)
+        if name:
+            facts.append(("name", f"The user's name is {name.group(1)}"))
+        elif attribute:
+            key = attribute.group(1).lower()
+            facts.append((key, f"The user's {key} is {_clean(attribute.group(2))}"))
+        elif statement:
+            verb = statement.group(1).lower()
+            key = verb if verb in SINGLE_VALUED else None
+            # Third person so the fact reads the same wherever it is injected
+            verb = "is " + verb[3:] if verb.startswith("am ") else verb + "s"
+            facts.append((key, f"The user {verb} {_clean(statement.group(2))}"))
+        elif remembered:
+            facts.append((None, f"The user asked to remember: {sentence}"))
+    return facts
+
+
+@dataclass
+class Fact:
+    key: str
+    text: str
+    vector: np.ndarray
+    turn: int
+    created: float = field(default_factory=time.time)
+
+
+class FactMemoryStore:
+    """Durable facts per conversation, indexed with local embeddings.
+
+    ``embedder`` needs ``embed(texts)`` and ``embed_query(text)``; by default
+    it is the local ``LocalEmbeddingPipeline`` (bge-small, disk-cached).
+    Each conversation keeps at most ``max_facts``; the oldest are dropped.
+    """
+
+    def __init__(self, embedder=None, max_facts=200, max_conversations=10_000):
+        self._embedder = embedder
+        self.max_facts = max_facts
+        self.max_conversations = max_conversations
+        self._facts = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            from app.embedding_pipeline import LocalEmbeddingPipeline
+            self._embedder = LocalEmbeddingPipeline()
+        return self._embedder
+
+    def _conversation(self, conversation_id):
+        # Called under the lock; least recently used conversations are evicted
+        facts = self._facts.get(conversation_id)
+        if facts is None:
+            facts = self._facts[conversation_id] = []
+            while len(self._facts) > self.max_conversations:
+                self._facts.popitem(last=False)
+        self._facts.move_to_end(conversation_id)
+        return facts
+
+    def add(self, conversation_id, facts, turn=0):
+        # facts: (key, text) pairs from extract_facts
+        if not facts:
+            return 0
+        vectors = np.asarray(self.embedder.embed([text for _, text in facts]), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        with self._lock:
+            stored = self._conversation(conversation_id)
+            for (key, text), vector in zip(facts, vectors):
+                stored[:] = [f for f in stored if not ((key is not None and f.key == key) or f.text == text)]
+                stored.append(Fact(key=key, text=text, vector=vector, turn=turn))
+            del stored[:-self.max_facts]
+        return len(facts)
+
+    def search(self, conversation_id, query, k=3, min_score=0.2):
+        with self._lock:
+            stored = list(self._facts.get(conversation_id, []))
+        if not stored:
+            return []
+        query_vector = np.asarray(self.embedder.embed_query(query), dtype=np.float32)
+        query_vector /= max(float(np.linalg.norm(query_vector)), 1e-12)
+        scores = np.stack([f.vector for f in stored]) @ query_vector
+        order = np.argsort(-scores)[:k]
+        return [(stored[i], float(scores[i])) for i in order if scores[i] >= min_score]
+
+    def facts(self, conversation_id):
+        with self._lock:
+            return [f.text for f in self._facts.get(conversation_id, [])]
+
+
+def _conversation_id(default):
+    # The LangGraph thread id when the agent runs with a checkpointer/config
+    try:
+        from langgraph.config import get_config
+        return get_config().get("configurable", {}).get("thread_id") or default
+    except RuntimeError:
+        return default
+
+
+class FactMemoryMiddleware(AgentMiddleware):
+    """Remember user facts outside the summary and inject only relevant ones.
+
+    Before each model call, new human messages are scanned for durable facts
+    (``extract`` defaults to the rule-based ``extract_facts``) and the top
+    ``k`` facts for the latest user message are added to the system prompt
+    for that call only, so they never pile up in the message history.
+
+    Facts are stored per conversation: the LangGraph ``thread_id`` from the
+    run's config, else the ``conversation_id`` given here (for an agent that
+    serves a single conversation). With neither, memory is skipped for the
+    call rather than shared between users.
+    """
+
+    def __init__(self, store=None, k=3, min_score=0.2, extract=extract_facts, conversation_id=None):
+        super().__init__()
+        self.store = store or FactMemoryStore()
+        self.k = k
+        self.min_score = min_score
+        self.extract = extract
+        self.default_conversation_id = conversation_id
+        self._seen = OrderedDict()
+
+    def _ingest(self, conversation_id, messages):
+        humans = [m for m in messages if m.type == "human" and isinstance(m.content, str)]
+        facts = []
+        for message in humans:
+            key = (conversation_id, message.id or hash(message.content))
+            if key in self._seen:
+                continue
+            self._seen[key] = True
+            if not message.content.startswith("Here is a summary of the conversation"):
+                facts.extend(self.extract(message.content))
+        while len(self._seen) > 100_000:
+            self._seen.popitem(last=False)
+        self.store.add(conversation_id, facts, turn=len(humans))
+        return humans[-1].content if humans else None
+
+    def _with_memory(self, request):
+        conversation_id = _conversation_id(self.default_conversation_id)
+        if conversation_id is None:
+            return request
+        query = self._ingest(conversation_id, request.messages)
+        if not query:
+            return request
+        hits = self.store.search(conversation_id, query, k=self.k, min_score=self.min_score)
+        if not hits:
+            return request
+        memory = "Known facts about the user:\n" + "\n".join(f"- {fact.text}" for fact, _ in hits)
+        system_prompt = f"{request.system_prompt}\n\n{memory}" if request.system_prompt else memory
+        return request.override(system_prompt=system_prompt)
+
+    def wrap_model_call(self, request, handler):
+        return handler(self._with_memory(request))
+
+    async def awrap_model_call(self, request, handler):
+        return await handler(self._with_memory(request))
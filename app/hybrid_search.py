@@ -0,0 +1,340 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+import numpy as np
+
+from app.chunking import stable_id
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "of", "on", "or", "the", "to", "with", "this", "that", "their", "they", "was", "were", "will",
+}
+FILTER_FIELDS = ("job_id", "candidate", "source")
+# Tombstoned rows are dropped once they are this share of the index (and at least this many)
+COMPACT_SHARE = 0.25
+COMPACT_MIN_ROWS = 1000
+
+
+def tokenize(text):
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chroma_filter(filters):
+    # {"job_id": "job_001", "candidate": "jane"} -> Chroma ``where`` clause
+    filters = {key: value for key, value in (filters or {}).items() if value is not None}
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters
+    return {"$and": [{key: value} for key, value in filters.items()]}
+
+
+class BM25Index:
+    """In-memory Okapi BM25 over stored chunks, with metadata pre-filtering.
+
+    Postings are kept as Python lists while documents are added; only the
+    terms touched since the last search are turned back into numpy arrays,
+    so scoring a query is a handful of vectorised adds over the matching
+    postings. Removed or replaced chunks are tombstoned rather than rewritten;
+    once tombstones pass ``compact_share`` of the rows, the postings are
+    rebuilt without them.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, filter_fields=FILTER_FIELDS, compact_share=COMPACT_SHARE,
+                 compact_min_rows=COMPACT_MIN_ROWS):
+        self.k1 = k1
+        self.b = b
+        self.filter_fields = filter_fields
+        self.compact_share = compact_share
+        self.compact_min_rows = compact_min_rows
+        self.compactions = 0
+        self.ids = []
+        self._position = {}
+        self._lengths = []
+        self._alive = []
+        self._dead = 0
+        self._postings = defaultdict(list)
+        self._field_values = {name: defaultdict(list) for name in filter_fields}
+        # Content key -> store id, for search hits that come back without an id
+        self._by_content = {}
+        self._term_arrays = {}
+        self._dirty_terms = set()
+        self._arrays = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._position)
+
+    def content_key(self, text, metadata):
+        return stable_id(tuple(metadata.get(name) for name in self.filter_fields), text)
+
+    def lookup_id(self, text, metadata):
+        # The store id of a chunk with this text and metadata, if it is indexed
+        return self._by_content.get(self.content_key(text, metadata))
+
+    def add(self, ids, texts, metadatas):
+        with self._lock:
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                if doc_id in self._position:
+                    self._alive[self._position[doc_id]] = False
+                    self._dead += 1
+                index = len(self.ids)
+                self.ids.append(doc_id)
+                self._position[doc_id] = index
+                self._by_content[self.content_key(text, metadata)] = doc_id
+                tokens = tokenize(text)
+                self._lengths.append(len(tokens))
+                self._alive.append(True)
+                for term, tf in Counter(tokens).items():
+                    self._postings[term].append((index, tf))
+                    self._dirty_terms.add(term)
+                for name in self.filter_fields:
+                    if metadata.get(name) is not None:
+                        self._field_values[name][metadata[name]].append(index)
+            self._arrays = None
+            self._maybe_compact()
+
+    def remove(self, ids):
+        with self._lock:
+            for doc_id in ids:
+                index = self._position.pop(doc_id, None)
+                if index is not None:
+                    self._alive[index] = False
+                    self._dead += 1
+            self._arrays = None
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._dead >= max(self.compact_min_rows, self.compact_share * len(self.ids)):
+            self._compact()
+
+    def _compact(self):
+        # Called under the lock; drops tombstoned rows and renumbers the live ones
+        alive = np.array(self._alive, dtype=bool)
+        new_index = (np.cumsum(alive) - 1).tolist()
+        keep = np.flatnonzero(alive).tolist()
+        self.ids = [self.ids[i] for i in keep]
+        self._position = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._lengths = [self._lengths[i] for i in keep]
+        self._alive = [True] * len(keep)
+        self._dead = 0
+
+        postings = defaultdict(list)
+        for term, plist in self._postings.items():
+            live = [(new_index[i], tf) for i, tf in plist if alive[i]]
+            if live:
+                postings[term] = live
+        self._postings = postings
+        for name, values in self._field_values.items():
+            remapped = {value: [new_index[i] for i in rows if alive[i]] for value, rows in values.items()}
+            self._field_values[name] = defaultdict(list, {value: rows for value, rows in remapped.items() if rows})
+        self._by_content = {key: doc_id for key, doc_id in self._by_content.items() if doc_id in self._position}
+        self._term_arrays = {}
+        self._dirty_terms = set(self._postings)
+        self._arrays = None
+        self.compactions += 1
+
+    def _finalize(self):
+        # Called under the lock; postings become (doc index, term frequency) arrays
+        if self._arrays is None:
+            for term in self._dirty_terms:
+                plist = self._postings[term]
+                self._term_arrays[term] = (np.array([i for i, _ in plist], dtype=np.int64),
+                                           np.array([tf for _, tf in plist], dtype=np.float32))
+            self._dirty_terms.clear()
+            alive = np.array(self._alive, dtype=bool)
+            lengths = np.array(self._lengths, dtype=np.float32)
+            average = float(lengths[alive].mean()) if alive.any() else 1.0
+            norm = self.k1 * (1 - self.b + self.b * lengths / max(average, 1e-9))
+            self._arrays = (alive, norm, self._term_arrays)
+        return self._arrays
+
+    def prepare(self):
+        # Do the array conversion now rather than on the first query
+        with self._lock:
+            self._finalize()
+
+    def _filter_mask(self, filters, size):
+        mask = None
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name not in self._field_values:
+                raise ValueError(f"Cannot filter on {name!r}; indexed fields are {self.filter_fields}")
+            field_mask = np.zeros(size, dtype=bool)
+            field_mask[self._field_values[name].get(value, [])] = True
+            mask = field_mask if mask is None else mask & field_mask
+        return mask
+
+    def search(self, query, k=10, filters=None):
+        """Return up to ``k`` ``(id, score)`` pairs, best first."""
+        with self._lock:
+            alive, norm, postings = self._finalize()
+            ids = self.ids
+            allowed = alive
+            mask = self._filter_mask(filters or {}, len(alive))
+            if mask is not None:
+                allowed = alive & mask
+            live_count = int(alive.sum())
+
+            scores = np.zeros(len(alive), dtype=np.float32)
+            for term in set(tokenize(query)):
+                if term not in postings:
+                    continue
+                doc_index, tf = postings[term]
+                df = int(alive[doc_index].sum())
+                if df == 0:
+                    continue
+                idf = math.log(1 + (live_count - df + 0.5) / (df + 0.5))
+                scores[doc_index] += idf * tf * (self.k1 + 1) / (tf + norm[doc_index])
+
+        scores[~allowed] = 0
+        hits = np.flatnonzero(scores)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits])]
+        return [(ids[i], float(scores[i])) for i in hits]
+
+
+def reciprocal_rank_fusion(rankings, k=60, weights=None):
+    # rankings: lists of ids, best first -> [(id, fused score)], best first
+    fused = defaultdict(float)
+    for ranking, weight in zip(rankings, weights or [1.0] * len(rankings)):
+        for rank, doc_id in enumerate(ranking):
+            fused[doc_id] += weight / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def _doc_id(doc, keyword_index):
+    # Both rankings must use the store id; hits returned without one (older
+    # Chroma wrappers) are matched to it through the keyword index
+    return (getattr(doc, "id", None) or keyword_index.lookup_id(doc.page_content, doc.metadata)
+            or keyword_index.content_key(doc.page_content, doc.metadata))
+
+
+class HybridRetriever:
+    """Fuse Chroma similarity search with a local BM25 index.
+
+    Both sides are pre-filtered on metadata (``job_id``, ``candidate``,
+    ``source``), ranked independently, and combined with reciprocal rank
+    fusion; chunk hits are then rolled up to one row per candidate.
+    """
+
+    def __init__(self, vectorstore, keyword_index, rrf_k=60):
+        self.vectorstore = vectorstore
+        self.keyword_index = keyword_index
+        self.rrf_k = rrf_k
+
+    def search_chunks(self, query, k=10, filters=None, mode="hybrid", fetch_k=50, weights=None):
+        rankings, documents = [], {}
+        if mode in ("hybrid", "vector"):
+            hits = self.vectorstore.similarity_search(query, k=fetch_k, filter=chroma_filter(filters))
+            ranking = []
+            for doc in hits:
+                doc_id = _doc_id(doc, self.keyword_index)
+                documents[doc_id] = doc
+                ranking.append(doc_id)
+            rankings.append(ranking)
+        if mode in ("hybrid", "keyword"):
+            rankings.append([doc_id for doc_id, _ in self.keyword_index.search(query, fetch_k, filters)])
+        fused = reciprocal_rank_fusion(rankings, self.rrf_k, weights)[:k]
+        return [(doc_id, score, documents.get(doc_id)) for doc_id, score in fused]
+
+    def _fetch_missing(self, doc_ids):
+        # Keyword-only hits have no Document yet; fetch them in one call
+        if not doc_ids:
+            return {}
+        found = self.vectorstore.get(ids=doc_ids, include=["documents", "metadatas"])
+        return {doc_id: (text, metadata)
+                for doc_id, text, metadata in zip(found["ids"], found["documents"], found["metadatas"])}
+
+    def search_candidates(self, query, k=10, filters=None, mode="hybrid", fetch_k=100, weights=None):
+        """Top ``k`` candidates for ``query``, each with its best matching snippet."""
+        chunks = self.search_chunks(query, k=fetch_k, filters=filters, mode=mode, fetch_k=fetch_k, weights=weights)
+        missing = self._fetch_missing([doc_id for doc_id, _, doc in chunks if doc is None])
+
+        candidates = {}
+        for doc_id, score, doc in chunks:
+            if doc is not None:
+                text, metadata = doc.page_content, doc.metadata
+            elif doc_id in missing:
+                text, metadata = missing[doc_id]
+            else:
+                continue
+            # One row per resume: two resumes with the same file name are different candidates
+            key = (metadata.get("resume_id") or metadata.get("candidate"), metadata.get("job_id"))
+            if key not in candidates:
+                # Chunks arrive best first, so the first one is the best snippet
+                candidates[key] = {"candidate": metadata.get("candidate"), "job_id": key[1], "score": score,
+                                   "matches": 1, "snippet": text}
+            else:
+                candidates[key]["score"] += score
+                candidates[key]["matches"] += 1
+        ranked = sorted(candidates.values(), key=lambda row: row["score"], reverse=True)
+        return ranked[:k]
+
+
+class KeywordIndexLoader:
+    """Builds the BM25 index for a store without losing concurrent writes.
+
+    ``add``/``remove`` mirror the store's writes: they are dropped while no
+    index exists (a later build reads them from the store), queued while
+    ``build`` is paging through the store, and replayed on the new index
+    before it is handed out.
+    """
+
+    def __init__(self):
+        self.index = None
+        self._building = False
+        self._queue = []
+        self._lock = threading.Lock()
+
+    def build(self, vectorstore, page_size=5000):
+        with self._lock:
+            self._building = True
+        try:
+            index = build_keyword_index(vectorstore, page_size)
+        except BaseException:
+            with self._lock:
+                self._building = False
+                self._queue.clear()
+            raise
+        with self._lock:
+            for method, args in self._queue:
+                getattr(index, method)(*args)
+            self._queue.clear()
+            self._building = False
+            self.index = index
+        index.prepare()
+        return index
+
+    def _apply(self, method, *args):
+        with self._lock:
+            if self.index is None:
+                if self._building:
+                    self._queue.append((method, args))
+                return
+            index = self.index
+        getattr(index, method)(*args)
+
+    def add(self, ids, texts, metadatas):
+        self._apply("add", list(ids), list(texts), list(metadatas))
+
+    def remove(self, ids):
+        self._apply("remove", list(ids))
+
+
+def build_keyword_index(vectorstore, page_size=5000):
+    # Load every stored chunk from Chroma into a fresh BM25 index. The ids are
+    # read first and then fetched in pages by id: offset paging would skip rows
+    # whenever chunks are deleted mid-build (those deletes, and any adds, reach
+    # the index through KeywordIndexLoader's queue).
+    index = BM25Index()
+    ids = vectorstore.get(include=[])["ids"]
+    for start in range(0, len(ids), page_size):
+        page = vectorstore.get(ids=ids[start:start + page_size], include=["documents", "metadatas"])
+        index.add(page["ids"], page["documents"], page["metadatas"])
+    index.prepare()
+    return index
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from llama_index.core.tools import QueryEngineTool
+from app.lazy_index import IndexHandle, LazyQueryEngine, load_concurrently, load_or_build_index
+
+
+MANIFEST_NAME = "manifest.json"
+# Shards live in their own subdirectory, so a source named e.g. "sales.pdf"
+# can't overwrite the other indexes and caches kept under the same storage dir
+SHARDS_DIR = "shards"
+
+
+def shard_name(path):
+    # "Uber 2021.pdf" -> "uber_2021"; also a valid tool name
+    return re.sub(r"\W+", "_", Path(path).stem).strip("_").lower()
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _build_shard(name, source, persist_dir):
+    # Build into a scratch dir and swap it in, so a failed build never leaves a half shard
+    start = time.perf_counter()
+    scratch = f"{persist_dir}.building"
+    shutil.rmtree(scratch, ignore_errors=True)
+    load_or_build_index([source], scratch)
+    shutil.rmtree(persist_dir, ignore_errors=True)
+    os.replace(scratch, persist_dir)
+    return name, time.perf_counter() - start
+
+
+@dataclass
+class SyncReport:
+    built: dict = field(default_factory=dict)
+    unchanged: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    failed: dict = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def __str__(self):
+        text = (f"{len(self.built)} built, {len(self.unchanged)} unchanged, "
+                f"{len(self.removed)} removed, {len(self.failed)} failed in {self.seconds:.2f}s")
+        for name, error in self.failed.items():
+            text += f"\n  {name}: {error}"
+        return text
+
+
+class IndexRegistry:
+    """One persisted index shard per PDF under ``<storage_dir>/shards``, tracked in its ``manifest.json``.
+
+    ``sync`` rebuilds only the shards whose source file changed, so rebuild
+    time follows the number of changed filings rather than the corpus size.
+    """
+
+    def __init__(self, source_dir, storage_dir="./storage", pattern="*.pdf",
+                 max_workers=None, use_processes=True, initializer=None):
+        self.source_dir = Path(source_dir)
+        self.storage_dir = Path(storage_dir)
+        self.shards_dir = self.storage_dir / SHARDS_DIR
+        self.pattern = pattern
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        # Process workers start with fresh LlamaIndex Settings; pass a picklable
+        # function (e.g. setup_environment) that configures the embed model.
+        self.initializer = initializer
+        self.manifest_path = self.shards_dir / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        legacy_path = self.storage_dir / MANIFEST_NAME
+        if legacy_path.exists():
+            # Shards used to sit directly in storage_dir; move them rather than rebuild
+            with open(legacy_path) as f:
+                manifest = json.load(f)
+            self.shards_dir.mkdir(parents=True, exist_ok=True)
+            for name in list(manifest["shards"]):
+                if (self.storage_dir / name).exists():
+                    os.replace(self.storage_dir / name, self.shard_dir(name))
+                else:
+                    del manifest["shards"][name]
+            self.manifest = manifest
+            self._save_manifest()
+            os.remove(legacy_path)
+            return manifest
+        return {"shards": {}}
+
+    def _save_manifest(self):
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def discover(self):
+        # Names must be unique: "Uber 2021.pdf" and "uber-2021.pdf" would share
+        # a shard, so later ones get a suffix from their file name
+        sources = {}
+        for path in sorted(self.source_dir.glob(self.pattern)):
+            name = shard_name(path)
+            if name in sources:
+                unique = f"{name}_{hashlib.sha1(path.name.encode('utf-8')).hexdigest()[:8]}"
+                warnings.warn(f"{path.name} and {sources[name].name} both map to shard {name!r}; "
+                              f"using {unique!r} for {path.name}")
+                name = unique
+            sources[name] = path
+        return sources
+
+    def shard_dir(self, name):
+        return self.shards_dir / name
+
+    def _is_current(self, name, path, stat, entry, digests):
+        # Hashes computed here are kept in ``digests`` for the manifest
+        if entry is None or not self.shard_dir(name).exists():
+            return False
+        if entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return True
+        # Touched but not edited: refresh mtime, keep the shard
+        digests[name] = file_sha256(path)
+        if entry["sha256"] == digests[name]:
+            entry["mtime"] = stat.st_mtime
+            return True
+        return False
+
+    def sync(self):
+        start = time.perf_counter()
+        report = SyncReport()
+        shards = self.manifest["shards"]
+        sources = self.discover()
+
+        stale, digests = {}, {}
+        for name, path in sources.items():
+            stat = path.stat()
+            if self._is_current(name, path, stat, shards.get(name), digests):
+                report.unchanged.append(name)
+            else:
+                # Hashed before the build, like the stat: if the file changes during
+                # the build, the next sync sees a different hash and rebuilds
+                stale[name] = (path, stat, digests.get(name) or file_sha256(path))
+
+        if stale:
+            pool_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            pool_kwargs = {"initializer": self.initializer} if self.initializer else {}
+            with pool_cls(max_workers=self.max_workers, **pool_kwargs) as pool:
+                futures = [pool.submit(_build_shard, name, str(path), str(self.shard_dir(name)))
+                           for name, (path, _, _) in stale.items()]
+                for name, future in zip(stale, futures):
+                    # A failed build keeps the previous shard (if any) and its entry
+                    try:
+                        _, seconds = future.result()
+                    except Exception as e:
+                        report.failed[name] = f"{type(e).__name__}: {e}"
+                        print(f"{name} shard failed: {report.failed[name]}")
+                        continue
+                    path, stat, sha256 = stale[name]
+                    shards[name] = {
+                        "source": str(path),
+                        "sha256": sha256,
+                        "mtime": stat.st_mtime,
+                        "size": stat.st_size,
+                        "build_seconds": round(seconds, 3),
+                    }
+                    report.built[name] = seconds
+                    print(f"{name} shard built in {seconds:.2f}s")
+
+        for name in list(shards):
+            if name not in sources:
+                shutil.rmtree(self.shard_dir(name), ignore_errors=True)
+                del shards[name]
+                report.removed.append(name)
+
+        self._save_manifest()
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def handles(self):
+        return {
+            name: IndexHandle(name, lambda name=name: load_or_build_index([entry["source"]], self.shard_dir(name)))
+            for name, entry in sorted(self.manifest["shards"].items())
+        }
+
+    def tools(self, lazy=True, similarity_top_k=3):
+        # One QueryEngineTool per manifest entry; with lazy=False every shard is loaded up front
+        handles = self.handles()
+        if not lazy:
+            load_concurrently(handles.values(), max_workers=self.max_workers)
+        tools = []
+        for name, handle in handles.items():
+            source = Path(self.manifest["shards"][name]["source"]).name
+            tools.append(QueryEngineTool.from_defaults(
+                query_engine=LazyQueryEngine(handle, similarity_top_k=similarity_top_k),
+                name=name,
+                description=(
+                    f"Provides information from the filing {source}. "
+                    "Use a detailed plain text question as input to the tool."
+                ),
+            ))
+        return tools
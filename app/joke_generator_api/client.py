@@ -2,12 +2,15 @@
 
 from langserve import RemoteRunnable
 import argparse
+from app.streaming import print_stream
 
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Joke Generator Client')
     parser.add_argument('--topic', type=str, default='programming',
                        help='Topic to generate a joke about')
+    parser.add_argument('--stream', action='store_true',
+                       help='Print the joke as it streams from /stream')
     args = parser.parse_args()
     
     # Connect to the remote server
@@ -18,11 +21,20 @@ def main():
     
     # Invoke the remote chain
     try:
-        response = remote_chain.invoke({"topic": args.topic})
-        print("\nJoke Response:")
-        print("-" * 40)
-        print(response)
-        print("-" * 40)
+        if args.stream:
+            # Tokens are printed as they arrive instead of after the whole joke is done
+            print("\nJoke Response:")
+            print("-" * 40)
+            _, first_token = print_stream(remote_chain.stream({"topic": args.topic}))
+            print("-" * 40)
+            if first_token is not None:
+                print(f"First token after {first_token * 1000:.0f} ms")
+        else:
+            response = remote_chain.invoke({"topic": args.topic})
+            print("\nJoke Response:")
+            print("-" * 40)
+            print(response)
+            print("-" * 40)
     except Exception as e:
         print(f"Error connecting to server: {e}")
         print("Make sure server.py is running on http://localhost:8000")
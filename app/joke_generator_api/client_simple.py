@@ -11,8 +11,10 @@ payload = { "input": {"topic": "Python Programmers"}}
 print(f"Sending request to {url}...")
 
 # 3. Send the POST request
+# A Session keeps the connection alive, so repeated calls skip the TCP handshake
+session = requests.Session()
 try:
-    response = requests.post(url, json=payload)
+    response = session.post(url, json=payload)
     response.raise_for_status() # Check for errors (like 404 or 500)
 
     # 4. Parse the JSON response
@@ -27,4 +29,6 @@ try:
 except requests.exceptions.ConnectionError:
     print("Error: Could not connect to the server. Is it running?")
 except Exception as e:
-    print(f"An error occurred: {e}")
\ No newline at end of file
+    print(f"An error occurred: {e}")
+finally:
+    session.close()
\ No newline at end of file
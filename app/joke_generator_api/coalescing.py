@@ -0,0 +1,185 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from langchain_core.runnables import Runnable
+from langchain_core.runnables.config import get_config_list
+
+
+class QueueFullError(Exception):
+    """Raised when the coalescer's waiting queue is full; the server maps it to HTTP 429."""
+
+    def __init__(self, queued, retry_after=1):
+        super().__init__(f"Server busy: {queued} requests already queued")
+        self.retry_after = retry_after
+
+
+@dataclass
+class CoalescingStats:
+    requests: int = 0
+    deduplicated: int = 0
+    rejected: int = 0
+    batches: int = 0
+    batched_inputs: int = 0
+    streams: int = 0
+
+    @property
+    def mean_batch_size(self):
+        return self.batched_inputs / self.batches if self.batches else 0.0
+
+
+class CoalescingRunnable(Runnable):
+    """Gather concurrent ``ainvoke`` calls into ``abatch`` calls on ``runnable``.
+
+    Requests arriving within ``window_ms`` of each other (up to
+    ``max_batch_size``) go out as one batch; identical inputs already queued
+    or running share a single result. At most ``max_in_flight`` batches run at
+    once, further requests wait in a queue of ``max_queue`` inputs, and
+    beyond that ``QueueFullError`` is raised instead of queueing forever.
+
+    ``abatch`` inputs join the same queue (a batch that cannot fit is
+    rejected whole), and ``astream`` waits for one of the same in-flight
+    slots, so no async entry point gets around the limits. Each request's
+    ``config`` (callbacks, tags, metadata) is forwarded with its input; a
+    request answered by an identical one already in flight shares that
+    result, and its own callbacks do not see a model run. Sync calls pass
+    straight through.
+    """
+
+    def __init__(self, runnable, window_ms=10, max_batch_size=16, max_in_flight=4, max_queue=256):
+        self.runnable = runnable
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.stats = CoalescingStats()
+        self._pending = []
+        self._in_flight = {}
+        self._queued = 0
+        self._timer = None
+        self._slots = None
+        self._tasks = set()
+
+    # LangServe builds its request/response models from these
+    @property
+    def InputType(self):
+        return self.runnable.InputType
+
+    @property
+    def OutputType(self):
+        return self.runnable.OutputType
+
+    def get_input_schema(self, config=None):
+        return self.runnable.get_input_schema(config)
+
+    def get_output_schema(self, config=None):
+        return self.runnable.get_output_schema(config)
+
+    @property
+    def config_specs(self):
+        return self.runnable.config_specs
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.runnable.invoke(input, config, **kwargs)
+
+    def batch(self, inputs, config=None, **kwargs):
+        return self.runnable.batch(inputs, config, **kwargs)
+
+    async def abatch(self, inputs, config=None, *, return_exceptions=False, **kwargs):
+        self._reserve(len(inputs), hold=False)
+        configs = get_config_list(config, len(inputs))
+        return await asyncio.gather(*(self.ainvoke(input, c) for input, c in zip(inputs, configs)),
+                                    return_exceptions=return_exceptions)
+
+    def stream(self, input, config=None, **kwargs):
+        return self.runnable.stream(input, config, **kwargs)
+
+    async def astream(self, input, config=None, **kwargs):
+        # A stream holds a model call for its whole length, so it takes one of
+        # the in-flight slots and counts against the queue while waiting for it
+        self._reserve(1)
+        self.stats.requests += 1
+        self.stats.streams += 1
+        waiting = True
+        try:
+            async with self._get_slots():
+                self._queued -= 1
+                waiting = False
+                async for chunk in self.runnable.astream(input, config, **kwargs):
+                    yield chunk
+        finally:
+            if waiting:
+                self._queued -= 1
+
+    def has_capacity(self, count=1):
+        return self._queued + count <= self.max_queue
+
+    def _reserve(self, count, hold=True):
+        # Raise QueueFullError unless count more inputs fit; with hold they are counted as queued
+        if not self.has_capacity(count):
+            self.stats.rejected += count
+            raise QueueFullError(self._queued)
+        if hold:
+            self._queued += count
+
+    def _get_slots(self):
+        if self._slots is None:
+            # Created lazily so it binds to the server's event loop
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        return self._slots
+
+    @staticmethod
+    def _key(input):
+        try:
+            return json.dumps(input, sort_keys=True, default=str)
+        except TypeError:
+            return None
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        self.stats.requests += 1
+        key = self._key(input)
+        if key is not None and key in self._in_flight:
+            self.stats.deduplicated += 1
+            return await asyncio.shield(self._in_flight[key])
+
+        self._reserve(1)
+        future = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        self._pending.append((input, config, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+    async def _run_batch(self, batch):
+        async with self._get_slots():
+            self._queued -= len(batch)
+            self.stats.batches += 1
+            self.stats.batched_inputs += len(batch)
+            try:
+                results = await self.runnable.abatch([input for input, _, _ in batch],
+                                                     [config for _, config, _ in batch], return_exceptions=True)
+            except Exception as e:
+                results = [e] * len(batch)
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
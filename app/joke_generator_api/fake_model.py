@@ -0,0 +1,78 @@
+import asyncio
+import time
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+
+class FakeJokeModel(BaseChatModel):
+    """Local stand-in for the joke model, for load tests and offline runs.
+
+    Simulates a model server with ``slots`` concurrent executions where a
+    call costs ``latency_ms`` plus ``per_item_ms`` per input, so one batch of
+    n inputs is much cheaper than n separate calls, as on a batching GPU server.
+    Streams emit one word every ``token_ms`` after the first-token latency.
+    """
+
+    latency_ms: float = 300.0
+    per_item_ms: float = 10.0
+    token_ms: float = 5.0
+    slots: int = 4
+    calls: int = 0
+    cache: bool = False
+
+    _semaphore: asyncio.Semaphore = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self):
+        return "fake-joke"
+
+    def _joke(self, messages):
+        topic = str(messages[-1].content).removeprefix("Tell me a short, clean joke about ").rstrip(".")
+        return f"Why did the {topic} cross the road? To get to the other side of the {topic} backlog."
+
+    def _result(self, messages):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._joke(messages)))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        time.sleep((self.latency_ms + self.per_item_ms) / 1000)
+        return self._result(messages)
+
+    async def _run(self, items):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.slots)
+        async with self._semaphore:
+            self.calls += 1
+            await asyncio.sleep((self.latency_ms + self.per_item_ms * items) / 1000)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await self._run(1)
+        return self._result(messages)
+
+    async def abatch(self, inputs, config=None, *, return_exceptions=False, **kwargs):
+        # One simulated forward pass for the whole batch
+        await self._run(len(inputs))
+        return [AIMessage(content=self._joke(self._convert_input(input).to_messages())) for input in inputs]
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency_ms / 1000)
+        for i, word in enumerate(self._joke(messages).split(" ")):
+            if i:
+                time.sleep(self.token_ms / 1000)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word if i == 0 else " " + word))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await self._run(1)
+        for i, word in enumerate(self._joke(messages).split(" ")):
+            if i:
+                await asyncio.sleep(self.token_ms / 1000)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word if i == 0 else " " + word))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# Async load generator for the joke API over pooled keep-alive connections.
+#
+# Start a server backed by the fake model, then drive it:
+#   JOKE_MODEL=fake python -m app.joke_generator_api.server
+#   python -m app.joke_generator_api.load_client --endpoint all --requests 500 --concurrency 50
+#   python -m app.joke_generator_api.load_client --endpoint stream --rate 100 --requests 1000
+#
+# --concurrency keeps that many requests outstanding (closed loop); --rate
+# sends at a fixed arrival rate regardless of how fast responses come back
+# (open loop), and latency is measured from the scheduled send time so queueing
+# shows up in the percentiles. --in-process serves the app over ASGI instead
+# of a socket (ASGI responses are buffered, so TTFT is only meaningful over HTTP).
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+import httpx
+
+ENDPOINTS = ("invoke", "batch", "stream")
+TOPICS = ["programming", "food", "sports", "space", "cats", "databases", "coffee", "trains", "music", "weather"]
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int
+    latency_ms: float
+    items: int = 1
+    ttft_ms: float = None
+    error: str = None
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def _topic(rng, topics):
+    base = TOPICS[rng.randrange(len(TOPICS))]
+    return base if topics <= len(TOPICS) else f"{base} {rng.randrange(topics)}"
+
+
+async def _invoke(client, topic):
+    response = await client.post("/invoke", json={"input": {"topic": topic}})
+    return response.status_code, None, None if response.is_success else response.text[:200]
+
+
+async def _batch(client, topics):
+    response = await client.post("/batch", json={"inputs": [{"topic": t} for t in topics]})
+    return response.status_code, None, None if response.is_success else response.text[:200]
+
+
+async def _stream(client, topic, start):
+    # LangServe streams server-sent events: metadata, data..., end (or error)
+    ttft = error = None
+    event = None
+    async with client.stream("POST", "/stream", json={"input": {"topic": topic}}) as response:
+        if not response.is_success:
+            return response.status_code, None, (await response.aread()).decode()[:200]
+        async for line in response.aiter_lines():
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:") and event == "data" and ttft is None:
+                ttft = (time.perf_counter() - start) * 1000
+            elif line.startswith("data:") and event == "error":
+                error = json.loads(line[5:]).get("message", line[5:])
+    return response.status_code, ttft, error
+
+
+async def send(client, endpoint, rng, topics=len(TOPICS), batch_size=8, start=None):
+    start = time.perf_counter() if start is None else start
+    items = batch_size if endpoint == "batch" else 1
+    try:
+        if endpoint == "invoke":
+            status, ttft, error = await _invoke(client, _topic(rng, topics))
+        elif endpoint == "batch":
+            status, ttft, error = await _batch(client, [_topic(rng, topics) for _ in range(batch_size)])
+        else:
+            status, ttft, error = await _stream(client, _topic(rng, topics), start)
+    except httpx.HTTPError as e:
+        status, ttft, error = 0, None, f"{type(e).__name__}: {e}"
+    return Sample(endpoint, status, (time.perf_counter() - start) * 1000, items, ttft, error)
+
+
+def make_client(base_url, connections=100, transport=None, timeout=60.0):
+    # One pool of keep-alive connections shared by every request
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    return httpx.AsyncClient(base_url=base_url.rstrip("/"), limits=limits, timeout=timeout, transport=transport)
+
+
+async def run_load(base_url, endpoint, requests, concurrency=10, rate=None, topics=len(TOPICS), batch_size=8,
+                   transport=None, seed=0):
+    """Send ``requests`` calls to one endpoint and return ``(samples, elapsed_seconds)``."""
+    rng = random.Random(seed)
+    samples = []
+    async with make_client(base_url, connections=concurrency, transport=transport) as client:
+        begin = time.perf_counter()
+        if rate:
+            # Open loop: request i is due at begin + i / rate
+            async def scheduled(i):
+                due = begin + i / rate
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                samples.append(await send(client, endpoint, rng, topics, batch_size, start=due))
+
+            await asyncio.gather(*(scheduled(i) for i in range(requests)))
+        else:
+            remaining = iter(range(requests))
+
+            async def worker():
+                for _ in remaining:
+                    samples.append(await send(client, endpoint, rng, topics, batch_size))
+
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+        elapsed = time.perf_counter() - begin
+    return samples, elapsed
+
+
+def summarize(samples, elapsed):
+    ok = [s for s in samples if 200 <= s.status < 300 and s.error is None]
+    latencies = [s.latency_ms for s in ok]
+    ttfts = [s.ttft_ms for s in ok if s.ttft_ms is not None]
+    statuses = {}
+    for s in samples:
+        statuses[s.status] = statuses.get(s.status, 0) + 1
+    return {
+        "requests": len(samples),
+        "ok": len(ok),
+        "statuses": statuses,
+        "req_per_s": len(samples) / elapsed if elapsed else 0.0,
+        "items_per_s": sum(s.items for s in ok) / elapsed if elapsed else 0.0,
+        **{f"p{q}_ms": percentile(latencies, q) for q in (50, 95, 99)},
+        **{f"ttft_p{q}_ms": percentile(ttfts, q) for q in (50, 95, 99)},
+        "errors": [s.error for s in samples if s.error][:3],
+    }
+
+
+def _ms(value):
+    return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+
+def print_report(rows):
+    print(f"{'endpoint':<9} {'req/s':>8} {'items/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'ttft p50':>9} {'ttft p95':>9} {'ttft p99':>9}  statuses")
+    for endpoint, s in rows:
+        print(f"{endpoint:<9} {s['req_per_s']:>8.1f} {s['items_per_s']:>8.1f} {_ms(s['p50_ms'])} {_ms(s['p95_ms'])} "
+              f"{_ms(s['p99_ms'])} {_ms(s['ttft_p50_ms'])} {_ms(s['ttft_p95_ms'])} {_ms(s['ttft_p99_ms'])}  {s['statuses']}")
+        for error in s["errors"]:
+            print(f"  error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Joke API load generator")
+    parser.add_argument("--url", default="http://localhost:8000/joke-generator", help="Base URL of the LangServe route")
+    parser.add_argument("--endpoint", choices=(*ENDPOINTS, "all"), default="invoke")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20, help="Outstanding requests (and pooled connections)")
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop arrival rate in requests/s")
+    parser.add_argument("--topics", type=int, default=len(TOPICS), help="Distinct topics; fewer means more repeats")
+    parser.add_argument("--batch-size", type=int, default=8, help="Inputs per /batch request")
+    parser.add_argument("--in-process", action="store_true", help="Serve the app over ASGI with the fake model")
+    args = parser.parse_args()
+
+    transport = None
+    if args.in_process:
+        os.environ.setdefault("JOKE_MODEL", "fake")
+        from app.joke_generator_api.fake_model import FakeJokeModel
+        from app.joke_generator_api.server import create_app
+        transport = httpx.ASGITransport(app=create_app(model=FakeJokeModel()))
+        args.url = "http://joke-api/joke-generator"
+
+    endpoints = ENDPOINTS if args.endpoint == "all" else (args.endpoint,)
+    mode = f"{args.rate:g} req/s open loop" if args.rate else f"concurrency {args.concurrency}"
+    print(f"{args.url}: {args.requests} requests per endpoint, {mode}")
+
+    async def run_all():
+        # One event loop for every endpoint, so an in-process app keeps its loop-bound state
+        rows = []
+        for endpoint in endpoints:
+            samples, elapsed = await run_load(args.url, endpoint, args.requests, args.concurrency, args.rate,
+                                              args.topics, args.batch_size, transport)
+            rows.append((endpoint, summarize(samples, elapsed)))
+        return rows
+
+    print_report(asyncio.run(run_all()))
+
+
+if __name__ == "__main__":
+    main()
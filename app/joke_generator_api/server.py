@@ -1,12 +1,14 @@
 #!/usr/bin/env python
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langserve import add_routes
 import os
 from dotenv import load_dotenv
+from app.llm_cache import install_llm_cache
+from app.joke_generator_api.coalescing import CoalescingRunnable, QueueFullError
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,45 +20,93 @@ prompt_template = ChatPromptTemplate.from_messages([
     ('user', 'Tell me a short, clean joke about {topic}.')
 ])
 
-# 2. Create model (using Google's Gemini 1.5 Flash)
-model = ChatGoogleGenerativeAI(
-    model="gemini-3-pro-preview",   # Fixed model name and syntax
-    google_api_key=os.environ.get("GOOGLE_API_KEY")  # Explicitly pass the API key
-)
+# Repeat topics are answered from the LLM cache instead of calling Gemini again
+install_llm_cache()
+
+
+# 2. Create model (using Google's Gemini), or the local fake with JOKE_MODEL=fake
+def build_model():
+    if os.getenv("JOKE_MODEL", "gemini") == "fake":
+        from app.joke_generator_api.fake_model import FakeJokeModel
+        return FakeJokeModel(latency_ms=float(os.getenv("FAKE_MODEL_LATENCY_MS", "300")))
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-3-pro-preview",   # Fixed model name and syntax
+        google_api_key=os.environ.get("GOOGLE_API_KEY")  # Explicitly pass the API key
+    )
+
 
 # 3. Create parser to handle the output
 parser = StrOutputParser()
 
-# 4. Create the chain by connecting components
-chain = prompt_template | model | parser
-
-# 5. Create the FastAPI application
-app = FastAPI(
-    title="Joke Generator API",
-    version="1.0",
-    description="A simple demo API using LangChain and LangServe to generate jokes about a given topic",
-)
-
-# 6. Add routes for the chain
-add_routes(
-    app,
-    chain,
-    path="/joke-generator",
-)
-
-# 7. Add a simple homepage
-@app.get("/")
-async def root():
-    return {
-        "message": "Welcome to the Joke Generator API",
-        "endpoints": {
-            "joke_generator": "/joke-generator",
-            "docs": "/docs"
+
+def create_app(model=None, coalesce=None):
+    # 4. Create the chain by connecting components
+    chain = prompt_template | (model or build_model()) | parser
+
+    # Concurrent /invoke and /batch inputs are gathered into abatch calls,
+    # identical topics in flight share one call, /stream waits for the same
+    # in-flight slots, and a full queue answers 429
+    if coalesce is None:
+        coalesce = os.getenv("JOKE_COALESCE", "1") == "1"
+    if coalesce:
+        chain = CoalescingRunnable(
+            chain,
+            window_ms=float(os.getenv("JOKE_BATCH_WINDOW_MS", "10")),
+            max_batch_size=int(os.getenv("JOKE_MAX_BATCH", "16")),
+            max_in_flight=int(os.getenv("JOKE_MAX_IN_FLIGHT", "4")),
+            max_queue=int(os.getenv("JOKE_MAX_QUEUE", "256")),
+        )
+
+    # 5. Create the FastAPI application
+    app = FastAPI(
+        title="Joke Generator API",
+        version="1.0",
+        description="A simple demo API using LangChain and LangServe to generate jokes about a given topic",
+    )
+    app.state.chain = chain
+
+    @app.exception_handler(QueueFullError)
+    async def queue_full(request: Request, exc: QueueFullError):
+        return JSONResponse(status_code=429, content={"detail": str(exc)},
+                            headers={"Retry-After": str(exc.retry_after)})
+
+    if coalesce:
+        @app.middleware("http")
+        async def stream_backpressure(request: Request, call_next):
+            # A stream's 200 is sent before its first chunk, so a full queue
+            # has to be refused before the route starts
+            if request.url.path.startswith("/joke-generator/stream") and not chain.has_capacity():
+                return JSONResponse(status_code=429, content={"detail": "Server busy"},
+                                    headers={"Retry-After": "1"})
+            return await call_next(request)
+
+    # 6. Add routes for the chain
+    add_routes(
+        app,
+        chain,
+        path="/joke-generator",
+    )
+
+    # 7. Add a simple homepage
+    @app.get("/")
+    async def root():
+        return {
+            "message": "Welcome to the Joke Generator API",
+            "endpoints": {
+                "joke_generator": "/joke-generator",
+                "docs": "/docs"
+            }
         }
-    }
+
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
     print("Starting the Joke Generator API server...")
     print("Visit http://localhost:8000/docs to interact with the API")
-    uvicorn.run(app, host="localhost", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="localhost", port=8000)
@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from llama_index.core import SimpleDirectoryReader, StorageContext, VectorStoreIndex, load_index_from_storage
+from llama_index.core.base.base_query_engine import BaseQueryEngine
+
+
+def load_or_build_index(pdf_paths, persist_dir):
+    # Load a persisted index, or parse + embed the source PDFs and persist it
+    persist_dir = Path(persist_dir)
+    if persist_dir.exists():
+        storage_context = StorageContext.from_defaults(persist_dir=str(persist_dir))
+        return load_index_from_storage(storage_context), "loaded"
+
+    docs = SimpleDirectoryReader(input_files=[Path(p) for p in pdf_paths]).load_data()
+    index = VectorStoreIndex.from_documents(docs)
+    index.storage_context.persist(persist_dir=str(persist_dir))
+    return index, "built"
+
+
+class IndexHandle:
+    """A named index that is loaded (or built) at most once, on demand."""
+
+    def __init__(self, name, loader):
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._index = None
+        self.seconds = None
+        self.source = None
+
+    @property
+    def loaded(self):
+        return self._index is not None
+
+    def get(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    start = time.perf_counter()
+                    self._index, self.source = self._loader()
+                    self.seconds = time.perf_counter() - start
+                    print(f"{self.name} index {self.source} in {self.seconds:.2f}s")
+        return self._index
+
+
+class LazyQueryEngine(BaseQueryEngine):
+    """Query engine that materialises its index the first time it is queried.
+
+    Wrapped in a ``QueryEngineTool``, an index the agent never calls is never
+    loaded, so startup cost follows the tools actually used.
+    """
+
+    def __init__(self, handle, **query_engine_kwargs):
+        super().__init__(callback_manager=None)
+        self._handle = handle
+        self._query_engine_kwargs = query_engine_kwargs
+        self._engine = None
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = self._handle.get().as_query_engine(**self._query_engine_kwargs)
+        return self._engine
+
+    def _get_prompt_modules(self):
+        return {}
+
+    def _query(self, query_bundle):
+        return self._get_engine().query(query_bundle)
+
+    async def _aquery(self, query_bundle):
+        return await self._get_engine().aquery(query_bundle)
+
+
+def load_concurrently(handles, max_workers=None):
+    """Load every handle in parallel and return ``{name: index}``.
+
+    PDF parsing and embedding for one document no longer wait on another;
+    wall time is roughly that of the slowest index rather than the sum.
+    """
+    handles = list(handles)
+    if not handles:
+        return {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(handles)) as pool:
+        indexes = list(pool.map(lambda handle: handle.get(), handles))
+    print(f"{len(handles)} indexes ready in {time.perf_counter() - start:.2f}s")
+    return {handle.name: index for handle, index in zip(handles, indexes)}
@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, Generation, GenerationChunk
+
+
+DEFAULT_SQLITE_PATH = "./storage/llm_cache.sqlite"
+# Everything a cached generation deserialises to; anything else in a cache entry is rejected
+CACHED_OBJECTS = [Generation, GenerationChunk, ChatGeneration, ChatGenerationChunk, AIMessage, AIMessageChunk]
+# loads() is marked beta; it would otherwise warn on the first cache hit of every process
+warnings.filterwarnings("ignore", message="The function `loads` is in beta", category=LangChainBetaWarning)
+
+
+def normalize_prompt(prompt):
+    """Canonical text for a prompt, insensitive to whitespace-only differences.
+
+    Chat models hand the cache a JSON serialisation of the messages; that is
+    reduced to ``role: content`` lines so ids and metadata don't split keys.
+    """
+    try:
+        messages = json.loads(prompt)
+    except (TypeError, ValueError):
+        messages = None
+
+    if isinstance(messages, list):
+        lines = []
+        for message in messages:
+            kwargs = message.get("kwargs", {}) if isinstance(message, dict) else {}
+            content = kwargs.get("content", "")
+            if not isinstance(content, str):
+                content = json.dumps(content, sort_keys=True)
+            extra = kwargs.get("tool_calls") or kwargs.get("tool_call_id") or ""
+            lines.append(f"{kwargs.get('type', '')}: {' '.join(content.split())} {json.dumps(extra, sort_keys=True)}")
+        return "\n".join(lines)
+    return " ".join(str(prompt).split())
+
+
+def cache_key(prompt, llm_string):
+    # llm_string carries the model name and its parameters (temperature, stop, ...)
+    return hashlib.sha256(f"{llm_string}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+# -------------------------
+# Storage backends
+# -------------------------
+
+class InMemoryBackend:
+    """Bounded LRU of serialised generations with an optional TTL."""
+
+    def __init__(self, maxsize=10_000, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """Serialised generations in a SQLite file, shared across processes and restarts."""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, ttl=None, max_rows=None):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, value TEXT, created_at REAL, expires_at REAL)"
+        )
+        self._db.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= time.time():
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now + self.ttl if self.ttl else None),
+            )
+            if self.max_rows:
+                # Oldest entries go first once the table is over its bound
+                cursor = self._db.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+                )
+                self.evictions += max(cursor.rowcount, 0)
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM llm_cache")
+            self._db.commit()
+
+
+# -------------------------
+# Semantic tier
+# -------------------------
+
+class SemanticIndex:
+    """Nearest-prompt lookup over normalised prompts, per llm_string.
+
+    ``embed`` maps a list of texts to vectors; by default the local
+    bge-small pipeline from app.embedding_pipeline is used.
+    """
+
+    def __init__(self, threshold=0.95, embed=None, maxsize=10_000):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._embed = embed
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._vectors = {}
+        self._oldest = {}
+
+    def _embed_one(self, text):
+        if self._embed is None:
+            from app.embedding_pipeline import LocalEmbeddingPipeline
+            self._embed = LocalEmbeddingPipeline().embed
+        vector = np.asarray(self._embed([text])[0], dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def search(self, llm_string, text):
+        if not self._keys.get(llm_string):
+            return None
+        query = self._embed_one(text)
+        with self._lock:
+            keys = self._keys[llm_string]
+            scores = self._vectors[llm_string][:len(keys)] @ query
+            best = int(np.argmax(scores))
+            return keys[best] if scores[best] >= self.threshold else None
+
+    def add(self, llm_string, text, key):
+        vector = self._embed_one(text)
+        with self._lock:
+            keys = self._keys.setdefault(llm_string, [])
+            vectors = self._vectors.get(llm_string)
+            if len(keys) < self.maxsize:
+                if vectors is None or len(keys) == len(vectors):
+                    # Grow geometrically up to maxsize, so adds are amortised O(1)
+                    grown = np.empty((min(self.maxsize, max(16, 2 * len(keys))), len(vector)), dtype=np.float32)
+                    if vectors is not None:
+                        grown[:len(keys)] = vectors
+                    vectors = self._vectors[llm_string] = grown
+                vectors[len(keys)] = vector
+                keys.append(key)
+            else:
+                # Full: overwrite the oldest entry in place
+                slot = self._oldest.get(llm_string, 0)
+                vectors[slot] = vector
+                keys[slot] = key
+                self._oldest[llm_string] = (slot + 1) % self.maxsize
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._vectors.clear()
+            self._oldest.clear()
+
+
+@dataclass
+class LLMCacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self):
+        total = self.exact_hits + self.semantic_hits + self.misses
+        return (self.exact_hits + self.semantic_hits) / total if total else 0.0
+
+
+class TieredLLMCache(BaseCache):
+    """LangChain LLM cache: exact-match tier, then an optional semantic tier.
+
+    Works for any LangChain chat model or LLM once installed with
+    ``set_llm_cache`` (see ``install_llm_cache``).
+    """
+
+    def __init__(self, backend=None, semantic=None):
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self.semantic = semantic
+        self.stats = LLMCacheStats()
+
+    def lookup(self, prompt, llm_string):
+        key = cache_key(prompt, llm_string)
+        value = self.backend.get(key)
+        if value is not None:
+            self.stats.exact_hits += 1
+            return loads(value, allowed_objects=CACHED_OBJECTS)
+
+        if self.semantic is not None:
+            similar_key = self.semantic.search(llm_string, normalize_prompt(prompt))
+            value = self.backend.get(similar_key) if similar_key else None
+            if value is not None:
+                self.stats.semantic_hits += 1
+                return loads(value, allowed_objects=CACHED_OBJECTS)
+
+        self.stats.misses += 1
+        return None
+
+    def update(self, prompt, llm_string, return_val):
+        key = cache_key(prompt, llm_string)
+        self.backend.set(key, dumps(return_val))
+        if self.semantic is not None:
+            self.semantic.add(llm_string, normalize_prompt(prompt), key)
+
+    def clear(self, **kwargs):
+        self.backend.clear()
+        if self.semantic is not None:
+            self.semantic.clear()
+
+
+def install_llm_cache(backend=None, semantic_threshold=None, ttl=None, maxsize=10_000):
+    """Install (once) a process-wide TieredLLMCache and return it.
+
+    Defaults come from the environment: ``LLM_CACHE_BACKEND`` (``memory`` or
+    ``sqlite``), ``LLM_CACHE_PATH``, ``LLM_CACHE_TTL`` and
+    ``LLM_CACHE_SEMANTIC_THRESHOLD`` (unset disables the semantic tier).
+    """
+    current = get_llm_cache()
+    if isinstance(current, TieredLLMCache):
+        return current
+
+    ttl = ttl if ttl is not None else (float(os.getenv("LLM_CACHE_TTL")) if os.getenv("LLM_CACHE_TTL") else None)
+    if backend is None:
+        if os.getenv("LLM_CACHE_BACKEND", "memory") == "sqlite":
+            backend = SQLiteBackend(os.getenv("LLM_CACHE_PATH", DEFAULT_SQLITE_PATH), ttl=ttl, max_rows=maxsize)
+        else:
+            backend = InMemoryBackend(maxsize=maxsize, ttl=ttl)
+
+    if semantic_threshold is None and os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD"):
+        semantic_threshold = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD"))
+    semantic = SemanticIndex(threshold=semantic_threshold, maxsize=maxsize) if semantic_threshold else None
+
+    cache = TieredLLMCache(backend=backend, semantic=semantic)
+    set_llm_cache(cache)
+    return cache
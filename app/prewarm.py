@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# Pay the deferred import and client-construction costs before the first
+# request instead of during it.
+#
+#   python -m app.prewarm                      # time the default set
+#   PREWARM_MODULES=app.document_text,pypdf python -m app.prewarm
+#
+# Worker processes: ProcessPoolExecutor(initializer=prewarm, initargs=(WORKER_MODULES,))
+# Long-running apps: start_prewarm(factories=[get_chain]) once at startup.
+
+import importlib
+import os
+import threading
+import time
+
+# What app.utils and the resume analyzer import lazily, roughly in order of first use
+DEFAULT_MODULES = (
+    "google.generativeai",
+    "langchain_google_genai",
+    "langchain_community.vectorstores",
+    "app.llm_cache",
+    "app.embedding_pipeline",
+    "app.chunking",
+    "app.analysis_writer",
+    "app.hybrid_search",
+    "app.quantized_store",
+)
+# Enough for text-extraction workers (document_text, resume_batch)
+WORKER_MODULES = ("app.document_text", "pypdf", "docx2txt")
+
+_started = None
+_started_lock = threading.Lock()
+
+
+def default_modules():
+    names = os.getenv("PREWARM_MODULES")
+    return tuple(n.strip() for n in names.split(",") if n.strip()) if names else DEFAULT_MODULES
+
+
+def prewarm(modules=None, factories=()):
+    """Import ``modules`` and call ``factories``; return ``{name: seconds or error}``.
+
+    A module or factory that fails (e.g. an optional SDK that is not
+    installed, or a missing API key) is recorded and skipped, so prewarming
+    never breaks startup; the real call will raise as usual.
+    """
+    timings = {}
+    for name in default_modules() if modules is None else modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            timings[name] = time.perf_counter() - start
+        except Exception as e:
+            timings[name] = f"{type(e).__name__}: {e}"
+    for factory in factories:
+        name = getattr(factory, "__qualname__", repr(factory))
+        start = time.perf_counter()
+        try:
+            factory()
+            timings[name] = time.perf_counter() - start
+        except Exception as e:
+            timings[name] = f"{type(e).__name__}: {e}"
+    return timings
+
+
+def start_prewarm(modules=None, factories=()):
+    # Once per process; runs on a daemon thread so startup is not blocked
+    global _started
+    with _started_lock:
+        if _started is None:
+            _started = threading.Thread(target=prewarm, args=(modules, factories), name="prewarm", daemon=True)
+            _started.start()
+        return _started
+
+
+def main():
+    timings = prewarm()
+    for name, value in timings.items():
+        print(f"{name:<40} {value * 1000:9.1f} ms" if isinstance(value, float) else f"{name:<40} skipped ({value})")
+
+
+if __name__ == "__main__":
+    main()
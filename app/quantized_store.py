@@ -0,0 +1,568 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from app.hybrid_search import FILTER_FIELDS
+
+# Below this many vectors every query is a flat int8 scan; at this size the
+# store partitions itself into sqrt(n) k-means lists and probes only a few
+IVF_THRESHOLD = int(os.getenv("QUANTIZED_IVF_THRESHOLD", "50000"))
+# The lists are rebuilt (with more of them) each time the store grows this much
+IVF_REBUILD_GROWTH = 4
+# The quantizer ranges are refit on every add until the store holds this many vectors
+QUANTIZER_MIN_VECTORS = 1024
+# Deleted rows are reclaimed once they make up this share of the store (and at least 1024 rows)
+COMPACT_DEAD_SHARE = float(os.getenv("QUANTIZED_COMPACT_DEAD_SHARE", "0.5"))
+COMPACT_MIN_ROWS = 1024
+# (name, extension, dtype, one value per dimension?) for each memory-mapped array
+ARRAYS = (("codes", "i8", np.int8, True), ("vectors", "f32", np.float32, True),
+          ("lists", "i4", np.int32, False), ("alive", "u1", np.uint8, False))
+
+
+class ScalarQuantizer:
+    """Per-dimension int8 codes: ``x ~= low + (code + 128) * step``."""
+
+    def __init__(self, low, step):
+        self.low = np.asarray(low, dtype=np.float32)
+        self.step = np.asarray(step, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, sample):
+        # Percentiles rather than min/max, so a few outliers don't waste the 256 levels
+        if len(sample) >= 100:
+            low, high = np.percentile(sample, [0.1, 99.9], axis=0)
+        else:
+            low, high = sample.min(axis=0), sample.max(axis=0)
+        return cls(low, np.maximum(high - low, 1e-6) / 255)
+
+    def encode(self, vectors):
+        return (np.clip(np.rint((vectors - self.low) / self.step), 0, 255) - 128).astype(np.int8)
+
+    def query_terms(self, query):
+        # Approximate dot product = codes @ weights + offset
+        weights = query * self.step
+        return weights, float(query @ self.low + 128 * weights.sum())
+
+
+def spherical_kmeans(vectors, clusters, iterations=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        counts = np.bincount(assign, minlength=clusters)
+        # Empty clusters are re-seeded from random points
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+def _replace_file(path, write):
+    # Write to a temp file and rename over the target, so readers never see half a file
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _where_sql(where):
+    # Chroma-style where clause -> SQL over the docs table
+    if not where:
+        return "1", []
+    for op, joiner in (("$and", " AND "), ("$or", " OR ")):
+        if op in where:
+            parts = [_where_sql(clause) for clause in where[op]]
+            return "(" + joiner.join(sql for sql, _ in parts) + ")", [p for _, params in parts for p in params]
+    clauses = []
+    params = []
+    for key, value in where.items():
+        column = key if key in FILTER_FIELDS else "json_extract(metadata, ?)"
+        key_params = [] if key in FILTER_FIELDS else [f"$.{key}"]
+        op, operand = next(iter(value.items())) if isinstance(value, dict) else ("$eq", value)
+        if op in ("$in", "$nin"):
+            operand = list(operand)
+            if not operand:
+                clauses.append("0" if op == "$in" else "1")
+                continue
+            clauses.append(f"{column} {'IN' if op == '$in' else 'NOT IN'} ({','.join('?' * len(operand))})")
+            params += key_params + operand
+        else:
+            sql_op = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}.get(op)
+            if sql_op is None:
+                raise ValueError(f"Unsupported where operator {op!r}")
+            clauses.append(f"{column} {sql_op} ?")
+            params += key_params + [operand]
+    return "(" + " AND ".join(clauses) + ")", params
+
+
+class QuantizedVectorStore(VectorStore):
+    """Local vector store with int8 codes for search and exact re-ranking.
+
+    Vectors are normalised and kept twice in memory-mapped files under
+    ``persist_directory``: int8 scalar-quantized codes (1 byte per dimension,
+    what every query scans) and the float32 originals (read only for the
+    ``k * rerank_factor`` best approximate hits, which are re-scored exactly).
+    Past ``ivf_threshold`` vectors the store is partitioned into k-means lists
+    and a query scans only the ``nprobe`` closest lists; the lists are rebuilt
+    each time the store grows ``IVF_REBUILD_GROWTH``-fold. Texts, ids and
+    metadata live in SQLite; ``where`` filters use the Chroma syntax and
+    scores are cosine similarities (higher is better).
+
+    A row only becomes visible when its SQLite transaction commits, and the
+    store's counters are committed in that same transaction, so a failed or
+    interrupted add leaves nothing behind. Deleted rows are reclaimed by
+    ``compact``, which runs by itself once they pass ``compact_dead_share``.
+    """
+
+    def __init__(self, persist_directory, embedding_function=None, nprobe=16, rerank_factor=10,
+                 ivf_threshold=IVF_THRESHOLD, nlist=None, block_size=65536, compact_dead_share=COMPACT_DEAD_SHARE):
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self.nprobe = nprobe
+        self.rerank_factor = rerank_factor
+        self.ivf_threshold = ivf_threshold
+        self.nlist = nlist
+        self.block_size = block_size
+        self.compact_dead_share = compact_dead_share
+        self._lock = threading.RLock()
+        os.makedirs(persist_directory, exist_ok=True)
+
+        self._db = sqlite3.connect(os.path.join(persist_directory, "docs.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        fields = "".join(f", {name} TEXT" for name in FILTER_FIELDS)
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS docs (row INTEGER PRIMARY KEY, id TEXT UNIQUE, "
+                         f"text TEXT, metadata TEXT{fields})")
+        for name in FILTER_FIELDS:
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS docs_{name} ON docs ({name})")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        self._db.commit()
+
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if not meta and os.path.exists(self._path("meta.json")):
+            # Stores written before the counters moved into SQLite
+            with open(self._path("meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        self.dim = meta.get("dim")
+        self.count = meta.get("count", 0)
+        self._indexed_count = meta.get("indexed_count", 0)
+        self._generation = meta.get("generation", 0)
+        self._capacity = 0
+        self._dead = 0
+        self.quantizer = None
+        self.centroids = None
+        self._remove_stale_files()
+        if self.dim:
+            # The files may have grown for an add that never committed
+            self._capacity = os.path.getsize(self._array_path("alive", "u1"))
+            self._open_arrays()
+            self._check_alive()
+            quantizer = np.load(self._path("quantizer.npz"))
+            self.quantizer = ScalarQuantizer(quantizer["low"], quantizer["step"])
+            if os.path.exists(self._path("centroids.npy")):
+                self.centroids = np.load(self._path("centroids.npy"))
+        self._lists = None
+        self._list_arrays = {}
+        self._dirty_lists = set()
+        if self.centroids is not None:
+            self._rebuild_lists()
+
+    @property
+    def embeddings(self):
+        return self.embedding_function
+
+    def _path(self, name):
+        return os.path.join(self.persist_directory, name)
+
+    # ---------------------
+    # Memory-mapped arrays
+    # ---------------------
+
+    def _array_path(self, name, ext, generation=None):
+        # Compaction writes a new generation of files; generation 0 keeps the plain names
+        generation = self._generation if generation is None else generation
+        return self._path(f"{name}.{ext}" if not generation else f"{name}.{generation}.{ext}")
+
+    def _open_arrays(self, generation=None, capacity=None):
+        capacity = self._capacity if capacity is None else capacity
+        arrays = [np.memmap(self._array_path(name, ext, generation), dtype=dtype, mode="r+",
+                            shape=(capacity, self.dim) if per_dim else (capacity,))
+                  for name, ext, dtype, per_dim in ARRAYS]
+        if generation is None:
+            self.codes, self.vectors, self.lists, self.alive = arrays
+        return arrays
+
+    def _resize_files(self, capacity, generation=None):
+        for name, ext, dtype, per_dim in ARRAYS:
+            with open(self._array_path(name, ext, generation), "ab") as f:
+                f.truncate(capacity * np.dtype(dtype).itemsize * (self.dim if per_dim else 1))
+
+    def _ensure_capacity(self, needed):
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2, 1024)
+        self._resize_files(capacity)
+        self._capacity = capacity
+        self._open_arrays()
+
+    def _remove_stale_files(self):
+        # Leftovers of a compaction or an atomic write that was interrupted
+        current = {os.path.basename(self._array_path(name, ext)) for name, ext, _, _ in ARRAYS}
+        for file_name in os.listdir(self.persist_directory):
+            parts = file_name.split(".")
+            stale_array = len(parts) in (2, 3) and (parts[0], parts[-1]) in {(n, e) for n, e, _, _ in ARRAYS}
+            if file_name.endswith(".tmp") or (stale_array and file_name not in current):
+                os.remove(self._path(file_name))
+
+    def _check_alive(self):
+        # Flags are cleared after the delete commits; a crash in between leaves rows flagged
+        # live with no document, so rebuild the flags from SQLite when the counts disagree
+        live = self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        if int(np.count_nonzero(self.alive[:self.count])) != live:
+            self.alive[:self.count] = 0
+            rows = np.fromiter((row for (row,) in self._db.execute("SELECT row FROM docs")), dtype=np.int64)
+            self.alive[rows[rows < self.count]] = 1
+            self.alive.flush()
+        self._dead = self.count - live
+
+    def _rebuild_lists(self):
+        assign = np.asarray(self.lists[:self.count])
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]].astype(np.int64).tolist() for i in range(len(self.centroids))]
+        self._list_arrays = {}
+        self._dirty_lists = set(range(len(self.centroids)))
+
+    def _list_array(self, list_id):
+        # Lists grow as Python lists; arrays are rebuilt only for lists touched since
+        if list_id in self._dirty_lists or list_id not in self._list_arrays:
+            self._list_arrays[list_id] = np.asarray(self._lists[list_id], dtype=np.int64)
+            self._dirty_lists.discard(list_id)
+        return self._list_arrays[list_id]
+
+    def build_index(self, nlist=None, sample_size=None, seed=0):
+        """Partition the stored vectors into k-means lists (run automatically at ``ivf_threshold``)."""
+        with self._lock:
+            nlist = nlist or self.nlist or max(16, min(4096, int(np.sqrt(self.count))))
+            sample_size = sample_size or min(self.count, 50 * nlist)
+            rng = np.random.default_rng(seed)
+            sample = np.asarray(self.vectors[np.sort(rng.choice(self.count, sample_size, replace=False))])
+            self.centroids = spherical_kmeans(sample, nlist, seed=seed)
+            for start in range(0, self.count, self.block_size):
+                stop = min(start + self.block_size, self.count)
+                self.lists[start:stop] = np.argmax(self.vectors[start:stop] @ self.centroids.T, axis=1)
+            _replace_file(self._path("centroids.npy"), lambda f: np.save(f, self.centroids))
+            self._indexed_count = self.count
+            self._rebuild_lists()
+            self.persist()
+
+    # ---------------------
+    # Writes
+    # ---------------------
+
+    def add_vectors(self, vectors, texts=None, metadatas=None, ids=None):
+        """Add precomputed embeddings; returns the ids. Re-adding an id replaces it."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(vectors):
+            return []
+        if vectors.ndim != 2 or (self.dim is not None and vectors.shape[1] != self.dim):
+            raise ValueError(f"Expected vectors of shape (n, {self.dim or 'dim'}), got {vectors.shape}")
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in range(len(vectors))]
+        texts = list(texts) if texts is not None else [""] * len(vectors)
+        metadatas = list(metadatas) if metadatas is not None else [{}] * len(vectors)
+        for name, values in (("ids", ids), ("texts", texts), ("metadatas", metadatas)):
+            if len(values) != len(vectors):
+                raise ValueError(f"Got {len(values)} {name} for {len(vectors)} vectors")
+        # An id repeated within the batch keeps its last occurrence, like re-adding it would
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            vectors = vectors[keep]
+            ids, texts, metadatas = ([values[i] for i in keep] for values in (ids, texts, metadatas))
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            start, stop = self.count, self.count + len(vectors)
+            self._ensure_capacity(stop)
+            try:
+                replaced = self._delete_ids(ids)
+                self._db.executemany(
+                    f"INSERT INTO docs (row, id, text, metadata{''.join(', ' + n for n in FILTER_FIELDS)}) "
+                    f"VALUES (?, ?, ?, ?{', ?' * len(FILTER_FIELDS)})",
+                    [(row, doc_id, text, json.dumps(metadata or {}),
+                      *((metadata or {}).get(n) for n in FILTER_FIELDS))
+                     for row, doc_id, text, metadata in zip(range(start, stop), ids, texts, metadatas)],
+                )
+                # Rows past self.count are invisible to searches until the commit below
+                self.vectors[start:stop] = vectors
+                self.alive[start:stop] = 1
+                if self.quantizer is None or start < QUANTIZER_MIN_VECTORS:
+                    # Small stores refit the ranges and re-encode everything (at most a few thousand rows)
+                    quantizer = ScalarQuantizer.fit(np.asarray(self.vectors[:min(stop, 100_000)]))
+                    _replace_file(self._path("quantizer.npz"),
+                                  lambda f: np.savez(f, low=quantizer.low, step=quantizer.step))
+                    self.quantizer = quantizer
+                    self._encode(0, stop)
+                else:
+                    self._encode(start, stop)
+                assign = None
+                if self.centroids is not None:
+                    assign = np.argmax(vectors @ self.centroids.T, axis=1)
+                    self.lists[start:stop] = assign
+                else:
+                    self.lists[start:stop] = -1
+                self._write_meta(count=stop)
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+            self.count = stop
+            self._mark_deleted(replaced)
+            if assign is not None:
+                for row, list_id in zip(range(start, stop), assign.tolist()):
+                    self._lists[list_id].append(row)
+                    self._dirty_lists.add(list_id)
+            if self.count >= max(self.ivf_threshold, self._indexed_count * IVF_REBUILD_GROWTH):
+                self.build_index()
+            self._maybe_compact()
+        return ids
+
+    def _encode(self, start, stop):
+        for i in range(start, stop, self.block_size):
+            j = min(i + self.block_size, stop)
+            self.codes[i:j] = self.quantizer.encode(np.asarray(self.vectors[i:j]))
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_vectors(self.embedding_function.embed_documents(texts), texts, metadatas, ids)
+
+    def _delete_ids(self, ids):
+        # Removes the documents (uncommitted); the caller clears the alive flags once committed
+        rows = []
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            rows += [row for (row,) in self._db.execute(
+                f"SELECT row FROM docs WHERE id IN ({','.join('?' * len(batch))})", batch)]
+        if rows:
+            self._db.executemany("DELETE FROM docs WHERE row = ?", [(row,) for row in rows])
+        return rows
+
+    def _mark_deleted(self, rows):
+        if rows:
+            self.alive[np.asarray(rows)] = 0
+            self._dead += len(rows)
+
+    def delete(self, ids=None, **kwargs):
+        with self._lock:
+            try:
+                rows = self._delete_ids(list(ids or []))
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+            self._mark_deleted(rows)
+            self._maybe_compact()
+        return len(rows) > 0
+
+    def _maybe_compact(self):
+        if self._dead >= max(COMPACT_MIN_ROWS, self.compact_dead_share * self.count):
+            self.compact()
+
+    def compact(self):
+        """Copy the live rows into a fresh, dense set of files and drop the deleted ones.
+
+        Returns the number of rows reclaimed. The new files only take over when
+        the SQLite transaction renumbering the rows commits.
+        """
+        with self._lock:
+            if not self._dead:
+                return 0
+            live = np.flatnonzero(np.asarray(self.alive[:self.count]))
+            generation = self._generation + 1
+            capacity = max(len(live), 1024)
+            self._resize_files(capacity, generation)
+            codes, vectors, lists, alive = self._open_arrays(generation, capacity)
+            for i in range(0, len(live), self.block_size):
+                rows = live[i:i + self.block_size]
+                j = i + len(rows)
+                codes[i:j] = self.codes[rows]
+                vectors[i:j] = self.vectors[rows]
+                lists[i:j] = self.lists[rows]
+            alive[:len(live)] = 1
+            for array in (codes, vectors, lists, alive):
+                array.flush()
+            del codes, vectors, lists, alive
+            # Ascending order never moves a row onto one that is still occupied
+            moved = np.flatnonzero(live != np.arange(len(live)))
+            try:
+                self._db.executemany("UPDATE docs SET row = ? WHERE row = ?",
+                                     ((int(i), int(live[i])) for i in moved))
+                self._write_meta(count=len(live), generation=generation,
+                                 indexed_count=min(self._indexed_count, len(live)))
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                for name, ext, _, _ in ARRAYS:
+                    os.remove(self._array_path(name, ext, generation))
+                raise
+            old = [self._array_path(name, ext) for name, ext, _, _ in ARRAYS]
+            reclaimed = self.count - len(live)
+            self._generation = generation
+            self._capacity = capacity
+            self.count = len(live)
+            self._indexed_count = min(self._indexed_count, self.count)
+            self._dead = 0
+            self._open_arrays()
+            for path in old:
+                os.remove(path)
+            if self.centroids is not None:
+                self._rebuild_lists()
+            return reclaimed
+
+    def _write_meta(self, **values):
+        # Executed inside the caller's transaction, so the counters commit with the rows
+        meta = {"dim": self.dim, "count": self.count, "indexed_count": self._indexed_count,
+                "generation": self._generation, **values}
+        self._db.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(meta.items()))
+
+    def persist(self):
+        with self._lock:
+            if self.dim:
+                for array in (self.codes, self.vectors, self.lists, self.alive):
+                    array.flush()
+                self._write_meta()
+            self._db.commit()
+
+    # ---------------------
+    # Reads
+    # ---------------------
+
+    def _allowed_rows(self, where):
+        if not where:
+            return None
+        sql, params = _where_sql(where)
+        return np.fromiter((row for (row,) in self._db.execute(f"SELECT row FROM docs WHERE {sql}", params)),
+                           dtype=np.int64)
+
+    @staticmethod
+    def _top(scores, rows, m):
+        if len(scores) > m:
+            keep = np.argpartition(-scores, m - 1)[:m]
+            scores, rows = scores[keep], rows[keep]
+        return scores, rows
+
+    def _candidates(self, query, allowed, m):
+        # Best m rows by approximate (int8) score
+        weights, offset = self.quantizer.query_terms(query)
+        count = self.count
+        if allowed is None and self.centroids is not None:
+            probe = np.argpartition(-(self.centroids @ query), min(self.nprobe, len(self.centroids)) - 1)[:self.nprobe]
+            allowed = np.sort(np.concatenate([self._list_array(i) for i in probe.tolist()]))
+        if allowed is not None:
+            allowed = allowed[allowed < count]
+            allowed = allowed[self.alive[allowed] == 1]
+            scores = self.codes[allowed].astype(np.float32) @ weights + offset
+            return self._top(scores, allowed, m)
+
+        best_scores, best_rows = np.empty(0, np.float32), np.empty(0, np.int64)
+        for start in range(0, count, self.block_size):
+            stop = min(start + self.block_size, count)
+            scores = self.codes[start:stop].astype(np.float32) @ weights + offset
+            scores[self.alive[start:stop] == 0] = -np.inf
+            scores, rows = self._top(scores, np.arange(start, stop), m)
+            best_scores, best_rows = self._top(np.concatenate([best_scores, scores]),
+                                               np.concatenate([best_rows, rows]), m)
+        finite = np.isfinite(best_scores)
+        return best_scores[finite], best_rows[finite]
+
+    def search_vector(self, embedding, k=4, filter=None):
+        """Return ``[(row, cosine similarity)]`` for the best ``k`` rows."""
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        with self._lock:
+            if not self.count:
+                return []
+            _, rows = self._candidates(query, self._allowed_rows(filter), max(k * self.rerank_factor, k))
+            if not len(rows):
+                return []
+            rows = np.sort(rows)  # sequential reads from the float32 file
+            exact = np.asarray(self.vectors[rows]) @ query
+        order = np.argsort(-exact)[:k]
+        return [(int(rows[i]), float(exact[i])) for i in order]
+
+    def _documents(self, rows):
+        found = {}
+        for i in range(0, len(rows), 500):
+            batch = rows[i:i + 500]
+            for row, doc_id, text, metadata in self._db.execute(
+                    f"SELECT row, id, text, metadata FROM docs WHERE row IN ({','.join('?' * len(batch))})", batch):
+                found[row] = Document(id=doc_id, page_content=text, metadata=json.loads(metadata))
+        return found
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, filter=None):
+        hits = self.search_vector(embedding, k, filter)
+        with self._lock:
+            documents = self._documents([row for row, _ in hits])
+        return [(documents[row], score) for row, score in hits if row in documents]
+
+    def similarity_search_by_vector(self, embedding, k=4, filter=None, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, filter)]
+
+    def similarity_search_with_score(self, query, k=4, filter=None, **kwargs):
+        return self.similarity_search_by_vector_with_score(self.embedding_function.embed_query(query), k, filter)
+
+    def similarity_search(self, query, k=4, filter=None, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are already cosine similarities
+        return lambda score: score
+
+    def get(self, ids=None, where=None, limit=None, offset=0, include=("documents", "metadatas")):
+        """Chroma-style ``get``: a dict of ``ids`` plus the ``include``d fields."""
+        sql, params = _where_sql(where)
+        if ids is not None:
+            ids = list(ids)
+            sql += f" AND id IN ({','.join('?' * len(ids))})"
+            params += ids
+        query = f"SELECT id, text, metadata FROM docs WHERE {sql} ORDER BY row"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return {
+            "ids": [doc_id for doc_id, _, _ in rows],
+            "documents": [text for _, text, _ in rows] if "documents" in include else None,
+            "metadatas": [json.loads(metadata) for _, _, metadata in rows] if "metadatas" in include else None,
+        }
+
+    def footprint(self):
+        """Bytes held by the search path (codes + lists) vs the float32 originals, and on disk."""
+        files = [self._array_path(name, ext) for name, ext, _, _ in ARRAYS]
+        files += [self._path(name) for name in ("docs.sqlite", "docs.sqlite-wal", "centroids.npy")]
+        return {
+            "vectors": self.count,
+            "codes_bytes": self.count * (self.dim or 0),
+            "float32_bytes": self.count * (self.dim or 0) * 4,
+            "list_bytes": self.count * 8 + (self.centroids.nbytes if self.centroids is not None else 0),
+            "disk_bytes": sum(os.path.getsize(path) for path in files if os.path.exists(path)),
+        }
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, persist_directory="./storage/quantized", **kwargs):
+        store = cls(persist_directory, embedding_function=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
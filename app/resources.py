@@ -0,0 +1,95 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class ResourceStats:
+    builds: int = 0
+    build_seconds: float = 0.0
+    hits: int = 0
+    hit_seconds: float = 0.0
+
+    @property
+    def warm_ms(self):
+        return self.hit_seconds / self.hits * 1000 if self.hits else 0.0
+
+
+# Process-wide pool. Streamlit re-executes the page script on every rerun, but
+# imported modules (this one included) stay in sys.modules, so anything stored
+# here is shared by all reruns and all sessions of the process.
+_resources = {}
+_stats = {}
+_key_locks = {}
+_pool_lock = threading.Lock()
+
+
+def fingerprint(secret):
+    # Stands in for an API key inside pool keys, so keys never hold the secret itself
+    return "sha256:" + hashlib.sha256(str(secret).encode("utf-8")).hexdigest()[:16]
+
+
+def get_or_create(key, factory):
+    """Return the pooled resource for ``key``, building it with ``factory`` once.
+
+    Concurrent first calls for the same key block on a per-key lock, so a
+    resource is never built twice; other keys are not held up meanwhile.
+    """
+    start = time.perf_counter()
+    value = _resources.get(key)
+    if value is None:
+        with _pool_lock:
+            key_lock = _key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = _resources.get(key)
+            if value is None:
+                value = factory()
+                _resources[key] = value
+                stats = _stats.setdefault(key, ResourceStats())
+                stats.builds += 1
+                stats.build_seconds += time.perf_counter() - start
+                return value
+
+    stats = _stats.setdefault(key, ResourceStats())
+    stats.hits += 1
+    stats.hit_seconds += time.perf_counter() - start
+    return value
+
+
+def is_warm(key):
+    return key in _resources
+
+
+def invalidate(key=None):
+    # Drop one resource (or all) and its stats; the next get_or_create rebuilds it
+    with _pool_lock:
+        if key is None:
+            _resources.clear()
+            _stats.clear()
+        else:
+            _resources.pop(key, None)
+            _stats.pop(key, None)
+
+
+def stats():
+    return {key: ResourceStats(**vars(value)) for key, value in _stats.items()}
+
+
+def _label(key):
+    # Only the kind is shown as-is; the rest of the key is hashed in case a caller put a secret there
+    kind, *rest = key if isinstance(key, tuple) else (key,)
+    return f"{kind}#{hashlib.sha256(repr(rest).encode('utf-8')).hexdigest()[:8]}" if rest else str(kind)
+
+
+def stats_table():
+    return [
+        {
+            "resource": _label(key),
+            "builds": s.builds,
+            "cold ms": round(s.build_seconds / max(s.builds, 1) * 1000, 1),
+            "warm hits": s.hits,
+            "warm ms": round(s.warm_ms, 3),
+        }
+        for key, s in _stats.items()
+    ]
@@ -4,35 +4,50 @@ import streamlit as st
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnableLambda, RunnableMap
-import google.generativeai as genai
 from dotenv import load_dotenv
-import re
+import time
+from app import resources
+from app.prewarm import start_prewarm
+# extract_suitability_score used to live here and is still imported from this module
+from app.streaming import ScoreStreamParser, extract_suitability_score
 # Load environment variables
 load_dotenv('C:/Agentic/codellm/.env')
 # Configure Google AI API 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+# Pool key for the chain; carries a hash of the API key, never the key itself
+CHAIN_KEY = ("resume_chain", resources.fingerprint(GOOGLE_API_KEY))
 
 
 
 # Text splitting
 def split_text(text):
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    return splitter.create_documents([text])
+    from app.chunking import default_chunker
+    return default_chunker().split_documents(text)
 
-def analyze_resume(uploaded_file, job_requirements, job_id):
+def analyze_resume(uploaded_file, job_requirements, job_id, stream=False):
+    # With stream=True the analysis is returned as a chunk iterator from chain.stream
     resume_text = Utils.extract_text_from_resume(uploaded_file)
     with st.expander("View Resume Text"):
         st.text(resume_text)
  
+    # The chain (and the LLM client inside it) is built on the first run only;
+    # every later rerun reuses it, so this is ~0 ms once warm
+    start = time.perf_counter()
+    warm = resources.is_warm(CHAIN_KEY)
     chain = get_chain()
-    analysis = chain.invoke({
+    st.caption(f"Chain setup: {(time.perf_counter() - start) * 1000:.1f} ms ({'warm' if warm else 'cold'})")
+    inputs = {
                 "job_requirements": job_requirements,
                 "resume_text": resume_text
-            })
+            }
+    analysis = chain.stream(inputs) if stream else chain.invoke(inputs)
     return (analysis, resume_text)
 
 def get_chain():
-    
+    # Pooled per process, so Streamlit reruns don't rebuild the prompt, client and chain
+    return resources.get_or_create(CHAIN_KEY, _build_chain)
+
+def _build_chain():
     llm = Utils.get_google_llm(GOOGLE_API_KEY)
 
     prompt_template = PromptTemplate(
@@ -61,17 +76,69 @@ def get_chain():
     )
     return chain
     
-# Extract percentage score from analysis text
-# Extract percentage score from analysis text
-def extract_suitability_score(text):
-    match = re.search(r"Suitability Score: (\d{1,3})%", text)
-    if match:
-        return int(match.group(1))
-    return None
+def render_analysis_stream(chunks, min_interval=0.05):
+    # Markdown is redrawn at most every min_interval seconds; the score metric
+    # appears as soon as its line has streamed in, before the analysis ends
+    score_slot = st.empty()
+    analysis_slot = st.empty()
+    timing_slot = st.empty()
+    analysis_slot.caption("Analyzing...")
+    parser = ScoreStreamParser()
+    start = time.perf_counter()
+    first_token = last_draw = None
+    for chunk in chunks:
+        now = time.perf_counter()
+        if first_token is None:
+            first_token = now - start
+        score = parser.feed(chunk)
+        if score is not None:
+            score_slot.metric(label="Resume Suitability Score", value=f"{score}%")
+        if last_draw is None or now - last_draw >= min_interval:
+            analysis_slot.markdown(parser.text + " ▌")
+            last_draw = now
+    analysis = parser.text
+    analysis_slot.markdown(analysis)
+    if parser.score is None:
+        score_slot.warning("Analysis Done.")
+    if first_token is not None:
+        timing_slot.caption(f"First token after {first_token * 1000:.0f} ms, "
+                            f"full analysis in {time.perf_counter() - start:.1f}s")
+    return analysis
+
+def bulk_screen(uploaded_files, job_requirements, job_id):
+    from app.resume_batch import ResumeScreener, expand_archive, rank
+
+    resumes = [resume for f in uploaded_files for resume in expand_archive(f.name, f.getvalue())]
+    if not resumes:
+        st.warning("No pdf, docx or txt resumes found in the upload.")
+        return
+    progress = st.progress(0.0, text=f"Screening {len(resumes)} resumes...")
+    done = []
+
+    def on_result(result):
+        done.append(result)
+        progress.progress(len(done) / len(resumes), text=f"Screened {len(done)} of {len(resumes)}")
+
+    screener = ResumeScreener(job_requirements, job_id, chain=get_chain(),
+                              store=VectorStoreUtils(app_name="resume_analyzer"), on_result=on_result)
+    start = time.perf_counter()
+    rows = rank(screener.run(resumes))
+    st.header("Ranked Candidates")
+    st.caption(f"{len(rows)} resumes in {time.perf_counter() - start:.1f}s")
+    st.dataframe(rows, use_container_width=True)
+    unstored = sum(1 for row in rows if row["store_error"])
+    if unstored:
+        st.error(f"{unstored} analyses could not be stored in the vector database (see store_error).")
+    else:
+        st.success("Analyses stored in vector database.")
 
 def main():
     st.title("Resume Analyzer")
     st.write("Upload your resume and get insights!")
+    # Heavy SDK imports and the chain are loaded in the background while the form is filled in
+    start_prewarm(factories=[get_chain])
+    # Rendered after the rest of the page, so it includes this run's timings
+    pool_stats = st.sidebar.expander("Resource pool (cold vs warm)")
 
     # Layout with two columns and one for job requirements and one for resume upload
     # set the variables for future use
@@ -83,29 +150,41 @@ def main():
 
     with col2:
         st.header("Resume Upload")
-        uploaded_file = st.file_uploader("Choose a resume file", type=["pdf", "docx", "txt"])
-
-    analysis = None
-    if st.button("Analyze Resume") and uploaded_file is not None and job_requirements.strip() != "":
-        with st.spinner("Analyzing..."):
-            analysis, _ = analyze_resume(uploaded_file, job_requirements, job_id)
-            st.header("AI Analysis")
-            st.markdown(analysis)
-            suitability_score = extract_suitability_score(analysis)
-            if suitability_score is not None:
-                    st.metric(label="Resume Suitability Score", value=f"{suitability_score}%")
-            else:
-                st.warning("Analysis Done.")
-            Chroma_vectorstore_utils = VectorStoreUtils(app_name="resume_analyzer")
-            doc_metadata = {
-                    "candidate": os.path.splitext(uploaded_file.name)[0],
-                    "job_id": job_id,
-                    "source": "resume_analysis"
-                }
-            Chroma_vectorstore_utils.store_resume_analysis(analysis, doc_metadata)
-            st.success("Analysis stored in vector database.")
+        mode = st.radio("Mode", ["Single resume", "Bulk screening"], horizontal=True)
+        if mode == "Bulk screening":
+            uploaded_files = st.file_uploader("Choose resume files or archives", type=["pdf", "docx", "txt", "zip"],
+                                              accept_multiple_files=True)
+        else:
+            uploaded_file = st.file_uploader("Choose a resume file", type=["pdf", "docx", "txt"])
+
+    if mode == "Bulk screening":
+        if st.button("Screen Resumes") and uploaded_files and job_requirements.strip() != "":
+            bulk_screen(uploaded_files, job_requirements, job_id)
+    elif st.button("Analyze Resume") and uploaded_file is not None and job_requirements.strip() != "":
+        with st.spinner("Reading resume..."):
+            chunks, _ = analyze_resume(uploaded_file, job_requirements, job_id, stream=True)
+        st.header("AI Analysis")
+        analysis = render_analysis_stream(chunks)
+        Chroma_vectorstore_utils = VectorStoreUtils(app_name="resume_analyzer")
+        from app.resume_batch import resume_id
+        doc_metadata = {
+                "candidate": os.path.splitext(uploaded_file.name)[0],
+                "resume_id": resume_id(uploaded_file.getvalue()),
+                "job_id": job_id,
+                "source": "resume_analysis"
+            }
+        try:
+            with st.spinner("Saving analysis..."):
+                Chroma_vectorstore_utils.store_resume_analysis(analysis, doc_metadata, wait=True)
+            st.success("Analysis saved to the vector database.")
+        except Exception as e:
+            st.error(f"Analysis could not be saved ({type(e).__name__}: {e}); it stays queued and is retried "
+                     "with the next batch.")
+
+    with pool_stats:
+        st.table(resources.stats_table())
 
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
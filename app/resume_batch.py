@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# Screen many resumes against one job requisition.
+#
+#   python -m app.resume_batch resumes/ --job-id job_001 --requirements job_001.txt --output ranked.csv
+#   python -m app.resume_batch resumes.zip --job-id job_001 --requirements job_001.txt --concurrency 16
+#
+# Text extraction runs in a process pool (PDF parsing is CPU-bound), LLM scoring
+# runs with bounded async concurrency, and analyses are written to Chroma in
+# batched add_documents calls instead of one call per resume.
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from app.prewarm import WORKER_MODULES, prewarm
+
+RESUME_EXTENSIONS = {".pdf", ".docx", ".txt"}
+
+
+def _is_resume(name):
+    return Path(name).suffix.lower() in RESUME_EXTENSIONS and not Path(name).name.startswith(".")
+
+
+def resume_id(data):
+    # Content hash; tells apart resumes that share a file name (cv.pdf in two folders)
+    return hashlib.sha256(bytes(data)).hexdigest()[:16]
+
+
+def expand_archive(name, data):
+    """Return ``(path, bytes)`` pairs for the resumes inside a zip or tar archive.
+
+    Paths keep their folders inside the archive, so a/cv.pdf and b/cv.pdf stay apart.
+    """
+    lower = name.lower()
+    if lower.endswith(".zip"):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            return [(info.filename, archive.read(info))
+                    for info in archive.infolist() if not info.is_dir() and _is_resume(info.filename)]
+    if lower.endswith((".tar", ".tar.gz", ".tgz")):
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            return [(member.name, archive.extractfile(member).read())
+                    for member in archive.getmembers() if member.isfile() and _is_resume(member.name)]
+    return [(name, data)] if _is_resume(name) else []
+
+
+def load_resumes(source):
+    # source: a directory (searched recursively) or a .zip/.tar/.tar.gz archive
+    path = Path(source)
+    if path.is_dir():
+        return [(p.relative_to(path).as_posix(), p.read_bytes())
+                for p in sorted(path.rglob("*")) if p.is_file() and _is_resume(p.name)]
+    if not path.exists():
+        raise FileNotFoundError(f"No resumes found at {source}")
+    return expand_archive(path.name, path.read_bytes())
+
+
+def _extract_text(name, data):
+    # Runs in a worker process; pages are not split further across processes here
+    from app.document_text import extract_text
+    return extract_text(name, data, parallel=False)
+
+
+@dataclass
+class ScreeningResult:
+    file: str
+    candidate: str
+    resume_id: str = None
+    score: int = None
+    analysis: str = None
+    error: str = None
+    # Set when the analysis was scored but could not be written to the store
+    store_error: str = None
+    seconds: float = 0.0
+
+
+def rank(results):
+    # Highest score first; unscored and failed resumes go to the bottom
+    ordered = sorted(results, key=lambda r: (r.score is None, -(r.score or 0), r.candidate))
+    return [
+        {"rank": i + 1, "candidate": r.candidate, "score": r.score, "file": r.file,
+         "seconds": round(r.seconds, 2), "error": r.error or "", "store_error": r.store_error or ""}
+        for i, r in enumerate(ordered)
+    ]
+
+
+class ResumeScreener:
+    """Extract, score and store a batch of resumes for one job.
+
+    ``chain`` is the resume-analysis runnable (``get_chain()`` by default) and
+    ``store`` a ``VectorStoreUtils``; pass ``store=None`` to skip persistence.
+    """
+
+    def __init__(self, job_requirements, job_id, chain=None, store=None, workers=None,
+                 concurrency=8, store_batch_size=64, on_result=None):
+        if chain is None:
+            from app.resume_analyzer import get_chain
+            chain = get_chain()
+        self.job_requirements = job_requirements
+        self.job_id = job_id
+        self.chain = chain
+        self.store = store
+        self.workers = workers or os.cpu_count()
+        self.concurrency = concurrency
+        self.store_batch_size = store_batch_size
+        # Called with each ScreeningResult as it completes, e.g. to drive a progress bar
+        self.on_result = on_result
+
+    async def _store(self, batch):
+        """Write ``(analysis, metadata, result)`` entries; returns the ones that failed.
+
+        A store failure is recorded on each result, like a screening error,
+        instead of aborting the run; failed entries are retried with the next batch.
+        """
+        try:
+            await asyncio.to_thread(self.store.store_resume_analyses,
+                                    [(analysis, metadata) for analysis, metadata, _ in batch])
+        except Exception as e:
+            for _, _, result in batch:
+                result.store_error = f"{type(e).__name__}: {e}"
+            return batch
+        for _, _, result in batch:
+            result.store_error = None
+        return []
+
+    async def _screen_one(self, pool, semaphore, name, data, pending_store, failed_store):
+        from app.streaming import extract_suitability_score
+
+        loop = asyncio.get_running_loop()
+        result = ScreeningResult(file=name, candidate=Path(name).stem, resume_id=resume_id(data))
+        start = time.perf_counter()
+        try:
+            resume_text = await loop.run_in_executor(pool, _extract_text, name, data)
+            async with semaphore:
+                result.analysis = await self.chain.ainvoke({
+                    "job_requirements": self.job_requirements,
+                    "resume_text": resume_text,
+                })
+            result.score = extract_suitability_score(result.analysis)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.seconds = time.perf_counter() - start
+
+        if result.analysis is not None and self.store is not None:
+            pending_store.append((result.analysis, {
+                "candidate": result.candidate,
+                "resume_id": result.resume_id,
+                "job_id": self.job_id,
+                "source": "resume_analysis",
+            }, result))
+            if len(pending_store) >= self.store_batch_size:
+                batch = failed_store + pending_store
+                pending_store.clear()
+                failed_store.clear()
+                failed_store.extend(await self._store(batch))
+        if self.on_result:
+            self.on_result(result)
+        return result
+
+    async def arun(self, resumes):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending_store, failed_store = [], []
+        # Workers import the parsers up front rather than on their first resume
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=prewarm, initargs=(WORKER_MODULES,)) as pool:
+            results = await asyncio.gather(*(
+                self._screen_one(pool, semaphore, name, data, pending_store, failed_store)
+                for name, data in resumes
+            ))
+        if pending_store or failed_store:
+            # Results that still carry a store_error after this were never stored
+            await self._store(failed_store + pending_store)
+        return results
+
+    def run(self, resumes):
+        return asyncio.run(self.arun(resumes))
+
+
+def write_ranking(rows, output_path):
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["rank", "candidate", "score", "file", "seconds", "error", "store_error"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk resume screening against one job")
+    parser.add_argument("source", help="Directory or .zip/.tar archive of resumes (pdf, docx, txt)")
+    parser.add_argument("--job-id", required=True)
+    parser.add_argument("--requirements", required=True, help="Text file with the job requirements")
+    parser.add_argument("--output", default="ranked_candidates.csv")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent LLM calls")
+    parser.add_argument("--store-batch-size", type=int, default=64)
+    parser.add_argument("--no-store", action="store_true", help="Don't write analyses to Chroma")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    resumes = load_resumes(args.source)
+    job_requirements = Path(args.requirements).read_text(encoding="utf-8")
+    store = None
+    if not args.no_store:
+        from app.utils import VectorStoreUtils
+        store = VectorStoreUtils(app_name="resume_analyzer")
+
+    screener = ResumeScreener(job_requirements, args.job_id, store=store, workers=args.workers,
+                              concurrency=args.concurrency, store_batch_size=args.store_batch_size)
+    start = time.perf_counter()
+    rows = rank(screener.run(resumes))
+    elapsed = time.perf_counter() - start
+
+    write_ranking(rows, args.output)
+    failed = sum(1 for row in rows if row["error"])
+    unstored = sum(1 for row in rows if row["store_error"])
+    print(f"Screened {len(rows)} resumes in {elapsed:.1f}s ({len(rows) / max(elapsed, 1e-9):.1f}/s), "
+          f"{failed} failed. Ranking written to {args.output}")
+    if unstored:
+        print(f"{unstored} analyses could not be stored; see the store_error column")
+    for row in rows[:args.top]:
+        score = f"{row['score']}%" if row["score"] is not None else "-"
+        print(f"{row['rank']:>4}  {score:>5}  {row['candidate']}")
+
+
+if __name__ == "__main__":
+    main()
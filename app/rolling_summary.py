@@ -0,0 +1,144 @@
+from collections import OrderedDict
+from langchain.agents.middleware import SummarizationMiddleware
+from langchain_core.messages import HumanMessage, RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+ROLLING_SUMMARY_PROMPT = """You maintain a running summary of a conversation.
+
+Current summary:
+{summary}
+
+New messages that are being removed from the conversation:
+{messages}
+
+Rewrite the summary so it also covers the new messages. Keep every fact, preference,
+decision and open question the assistant may need later; drop small talk and filler.
+Stay under {max_words} words. Respond ONLY with the updated summary."""
+
+SUMMARY_MESSAGE_ID = "rolling-summary"
+SUMMARY_PREFIX = "Here is a summary of the conversation to date:\n\n"
+
+
+def summary_text(messages):
+    """The running summary held in a conversation's messages, or None."""
+    for message in messages:
+        if message.id == SUMMARY_MESSAGE_ID and isinstance(message.content, str):
+            content = message.content
+            return content[len(SUMMARY_PREFIX):] if content.startswith(SUMMARY_PREFIX) else content
+    return None
+
+
+def _thread_id():
+    # The LangGraph thread id when the agent runs with a checkpointer/config
+    try:
+        from langgraph.config import get_config
+        return get_config().get("configurable", {}).get("thread_id")
+    except RuntimeError:
+        return None
+
+
+class InspectableSummarizationMiddleware(SummarizationMiddleware):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latest_summary = None
+
+    def _create_summary(self, messages_to_summarize):
+        summary = super()._create_summary(messages_to_summarize)
+        self.latest_summary = summary
+        return summary
+
+
+class RollingSummarizationMiddleware(SummarizationMiddleware):
+    """Summarize incrementally instead of re-summarizing the whole prefix.
+
+    When the history passes ``max_tokens_before_summary``, only the messages
+    being evicted are folded into the existing summary (one small model call),
+    and the state is rewritten to ``[summary, *last messages_to_keep]``. The
+    previous summary is read from the conversation's own summary message, so
+    one middleware can serve many conversations; use ``summary_text`` on the
+    agent's messages to inspect it. Token counts are cached per thread and
+    message id, so a turn only counts its new messages.
+    """
+
+    def __init__(self, *args, summary_max_words=250, rolling_prompt=ROLLING_SUMMARY_PROMPT,
+                 max_threads=1_000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.summary_max_words = summary_max_words
+        self.rolling_prompt = rolling_prompt
+        self.max_threads = max_threads
+        # thread id -> {message id: tokens}; least recently used threads are dropped
+        self._token_counts = OrderedDict()
+        self.summary_calls = 0
+        self.messages_folded = 0
+
+    def _thread_counts(self, thread_id):
+        counts = self._token_counts.get(thread_id)
+        if counts is None:
+            counts = self._token_counts[thread_id] = {}
+            while len(self._token_counts) > self.max_threads:
+                self._token_counts.popitem(last=False)
+        self._token_counts.move_to_end(thread_id)
+        if len(counts) > 50_000:
+            # Calls without a thread id share one bucket; don't let it grow forever
+            counts.clear()
+        return counts
+
+    def _message_tokens(self, message, counts):
+        if message.id == SUMMARY_MESSAGE_ID:
+            return self.token_counter([message])
+        count = counts.get(message.id)
+        if count is None:
+            count = counts[message.id] = self.token_counter([message])
+        return count
+
+    def _build_new_messages(self, summary):
+        return [HumanMessage(id=SUMMARY_MESSAGE_ID, content=f"{SUMMARY_PREFIX}{summary}")]
+
+    def _create_summary(self, messages_to_summarize, summary=None):
+        # summary: this conversation's previous summary, from its state
+        if not messages_to_summarize:
+            return summary or "No previous conversation history."
+        trimmed = self._trim_messages_for_summary(messages_to_summarize)
+        prompt = self.rolling_prompt.format(
+            summary=summary or "(empty)",
+            messages="\n".join(f"{m.type}: {m.content}" for m in trimmed),
+            max_words=self.summary_max_words,
+        )
+        try:
+            response = self.model.invoke(prompt)
+        except Exception as e:
+            # Keep the previous summary rather than replacing it with an error
+            return summary or f"Error generating summary: {e!s}"
+        self.summary_calls += 1
+        self.messages_folded += len(messages_to_summarize)
+        return str(response.content).strip()
+
+    def before_model(self, state, runtime):
+        messages = state["messages"]
+        self._ensure_message_ids(messages)
+
+        counts = self._thread_counts(_thread_id())
+        total_tokens = sum(self._message_tokens(m, counts) for m in messages)
+        if self.max_tokens_before_summary is not None and total_tokens < self.max_tokens_before_summary:
+            return None
+
+        # The summary message is rebuilt, never folded into itself
+        history = [m for m in messages if m.id != SUMMARY_MESSAGE_ID]
+        cutoff_index = self._find_safe_cutoff(history)
+        if cutoff_index <= 0:
+            return None
+
+        evicted, preserved = self._partition_messages(history, cutoff_index)
+        summary = self._create_summary(evicted, summary=summary_text(messages))
+        # Counts for evicted messages are never needed again
+        for message in evicted:
+            counts.pop(message.id, None)
+
+        return {
+            "messages": [
+                RemoveMessage(id=REMOVE_ALL_MESSAGES),
+                *self._build_new_messages(summary),
+                *preserved,
+            ]
+        }
+
@@ -0,0 +1,236 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+
+EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE = re.compile(
+    r"(?<![\w])(?:\+?1[\s.-]?)?(?:\(\d{3}\)\s?|\d{3}[\s.-])\d{3}[\s.-]\d{4}(?![\w])"
+)
+_MONTHS = (r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|"
+           r"Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)")
+DATE = re.compile(
+    rf"\b(?:\d{{4}}-\d{{2}}-\d{{2}}"
+    rf"|\d{{1,2}}/\d{{1,2}}/\d{{2,4}}"
+    rf"|{_MONTHS}\.? \d{{1,2}}(?:st|nd|rd|th)?(?:,? \d{{4}})?"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)? (?:of )?{_MONTHS}(?:,? \d{{4}})?)\b"
+)
+# Two or three capitalised words, e.g. "John Doe" or "Mary Ann Smith", not
+# starting with a greeting or an imperative like "Contact ..." / "Dear ..."
+_LEAD_WORDS = r"(?:Contact|Call|Email|Reach|Ask|Meet|Dear|Hi|Hello|Hey|From|To|Cc|Attn|Regards|Thanks)"
+NAME = re.compile(rf"\b(?!{_LEAD_WORDS}\b)([A-Z][a-z]+(?:[ -][A-Z][a-z]+){{1,2}})\b")
+EVENT_VERB = re.compile(
+    r"\b(?:organi[sz]ing|hosting|running|attending|presenting at|speaking at|invites you to|join(?:ing)? us (?:at|for))\s+"
+    r"(?:the\s+)?((?:[A-Z0-9][\w&'-]*\s?){1,6})"
+)
+EVENT_NOUN = re.compile(
+    r"\b((?:[A-Z0-9][\w&'-]*\s){0,4}(?:Conference|Summit|Meetup|Workshop|Expo|Festival|Webinar|Hackathon|Forum|Gala))\b"
+)
+NOT_NAMES = {"Tech Conference", "Dear Team", "Best Regards", "Kind Regards", "Thank You"}
+# Words that make a capitalised run a team, company or place rather than a person
+_NOT_PERSON_WORDS = {
+    "team", "support", "sales", "corp", "inc", "ltd", "llc", "group", "department", "office", "desk",
+    "services", "service", "help", "helpdesk", "admin", "info", "hr", "marketing", "company", "bank",
+    "university", "city", "new", "san", "los", "las", "north", "south", "east", "west", "street",
+}
+# Only these come from exact patterns; they win over the model's answer when the
+# text holds exactly one distinct value for them
+EXACT_FIELDS = ("email", "phone")
+# Automated senders (notification mails, bounces) are never the contact
+NO_REPLY = re.compile(r"^(?:no-?reply|do-?not-?reply|mailer-daemon|notifications?|bounces?)\b", re.IGNORECASE)
+
+
+@dataclass
+class FastPathResult:
+    value: Any = None
+    fields: dict = field(default_factory=dict)
+    missing: list = field(default_factory=list)
+    # Low-confidence guesses: passed to the LLM as hints, never forced on its answer
+    guesses: dict = field(default_factory=dict)
+
+    @property
+    def complete(self):
+        return self.value is not None and not self.missing
+
+
+def _name_near(text, position):
+    # The closest capitalised run ending shortly before the email is the best guess
+    window_start = max(0, position - 60)
+    candidates = [m for m in NAME.finditer(text, window_start, position) if m.group(1) not in NOT_NAMES]
+    return candidates[-1].group(1) if candidates else None
+
+
+def _name_matches_email(name, email):
+    """True when ``name`` looks like a person and its words show up in the email's local part.
+
+    "John Doe" <john.doe@x.com> or <jdoe@x.com> is confirmed; "Acme Corp Support"
+    <help@acme.com>, "Sales Team" <sales@acme.com> or a name with no email are not.
+    """
+    words = [w.lower() for w in re.split(r"[ -]", name)]
+    if any(w in _NOT_PERSON_WORDS for w in words):
+        return False
+    local = re.sub(r"[^a-z]", "", email.split("@")[0].lower())
+    first, last = words[0], words[-1]
+    return last in local and (first in local or local.startswith(first[0]) or local.endswith(first[0]))
+
+
+def _distinct(matches, key):
+    # First match of each distinct value, in text order
+    found = {}
+    for match in matches:
+        found.setdefault(key(match.group(0)), match)
+    return list(found.values())
+
+
+def _event_name(text):
+    match = EVENT_VERB.search(text) or EVENT_NOUN.search(text)
+    if not match:
+        return None
+    name = match.group(1).strip()
+    # Stop before a trailing date preposition picked up by the capitalised run
+    name = re.split(r"\s(?:On|In|At)\b", name)[0].strip()
+    return name or None
+
+
+def extract_contact_fields(text):
+    """Fill ``name``, ``email`` and ``phone`` from standard formats.
+
+    Returns ``(fields, guesses)``. An email or phone is only a field when the
+    text has exactly one distinct value for it; several (a forwarded sender,
+    a second person) become a list of candidate guesses. A name is only a
+    field when that single email confirms it; otherwise it is a guess and
+    the LLM decides.
+    """
+    fields, guesses = {}, {}
+    emails = _distinct((m for m in EMAIL.finditer(text) if not NO_REPLY.match(m.group(0))), str.lower)
+    phones = _distinct(PHONE.finditer(text), lambda phone: re.sub(r"\D", "", phone)[-10:])
+    email = emails[0] if len(emails) == 1 else None
+    phone = phones[0] if len(phones) == 1 else None
+    if email:
+        fields["email"] = email.group(0)
+    elif emails:
+        guesses["email"] = [m.group(0) for m in emails]
+    if phone:
+        fields["phone"] = phone.group(0).strip()
+    elif phones:
+        guesses["phone"] = [m.group(0).strip() for m in phones]
+
+    # Only a name right before the email/phone is considered; anything further
+    # away is too likely to be a company or subject line
+    anchor = email.start() if email else (phone.start() if phone else None)
+    name = _name_near(text, anchor) if anchor is not None else None
+    if name and email and _name_matches_email(name, email.group(0)):
+        fields["name"] = name
+    elif name:
+        guesses["name"] = name
+    return fields, guesses
+
+
+def extract_contact(text, schema):
+    # schema: ContactInfo from app.structured_output (name, email, phone)
+    fields, guesses = extract_contact_fields(text)
+    missing = [name for name in schema.model_fields if name not in fields]
+    value = schema(**fields) if not missing else None
+    return FastPathResult(value=value, fields=fields, missing=missing, guesses=guesses)
+
+
+def extract_items(text, result_schema, contact_schema, event_schema):
+    """Build an ``ExtractionResult`` of contacts and events.
+
+    Every email must resolve to a name the email confirms and every date to
+    an event name; otherwise the result is reported as incomplete.
+    """
+    items, missing = [], []
+
+    for email in EMAIL.finditer(text):
+        name = _name_near(text, email.start())
+        if name is None or not _name_matches_email(name, email.group(0)):
+            missing.append("contact.name")
+        else:
+            items.append(contact_schema(name=name, email=email.group(0)))
+
+    dates = list(DATE.finditer(text))
+    if dates:
+        event = _event_name(text)
+        if event is None:
+            missing.append("event.event_name")
+        else:
+            items.append(event_schema(event_name=event, date=dates[0].group(0)))
+
+    if not items and not missing:
+        missing.append("items")
+    value = result_schema(items=items) if items and not missing else None
+    return FastPathResult(value=value, fields={"items": items}, missing=missing)
+
+
+class FastPathExtractor:
+    """Rules first, LLM only for what the rules could not fill.
+
+    ``rules(text)`` returns a ``FastPathResult``; when it is incomplete the
+    agent is called with the fields already found as hints. Only the
+    exact-pattern fields (``EXACT_FIELDS``) with a single match in the text
+    are kept over the model's output; candidates and heuristic fields, like
+    names, are left to the model.
+    """
+
+    def __init__(self, rules, agent, prompt="{text}"):
+        self.rules = rules
+        self.agent = agent
+        self.prompt = prompt
+        self.fast_hits = 0
+        self.llm_calls = 0
+
+    @property
+    def hit_rate(self):
+        total = self.fast_hits + self.llm_calls
+        return self.fast_hits / total if total else 0.0
+
+    def _messages(self, text, partial):
+        content = self.prompt.format(text=text)
+        exact = {k: v for k, v in partial.fields.items() if k in EXACT_FIELDS}
+        candidates = {k: v for k, v in partial.guesses.items() if isinstance(v, list)}
+        likely = {**{k: v for k, v in partial.guesses.items() if not isinstance(v, list)},
+                  **{k: v for k, v in partial.fields.items() if k not in EXACT_FIELDS and not isinstance(v, list)}}
+        if exact:
+            content += f"\n\nAlready extracted (keep as-is): {exact}. Fill in: {', '.join(partial.missing)}."
+        if candidates:
+            content += f"\n\nSeveral found, only one may belong to the contact: {candidates}."
+        if likely:
+            content += f"\n\nPossibly (check against the text): {likely}."
+        return {"messages": [{"role": "user", "content": content}]}
+
+    def _merge(self, value, partial):
+        known = {k: v for k, v in partial.fields.items() if k in EXACT_FIELDS}
+        if known and hasattr(value, "model_copy"):
+            return value.model_copy(update=known)
+        return value
+
+    def extract(self, text):
+        partial = self.rules(text)
+        if partial.complete:
+            self.fast_hits += 1
+            return partial.value
+        self.llm_calls += 1
+        result = self.agent.invoke(self._messages(text, partial))
+        return self._merge(result["structured_response"], partial)
+
+    async def aextract(self, text):
+        partial = self.rules(text)
+        if partial.complete:
+            self.fast_hits += 1
+            return partial.value
+        self.llm_calls += 1
+        result = await self.agent.ainvoke(self._messages(text, partial))
+        return self._merge(result["structured_response"], partial)
+
+
+def contact_fast_path(agent, prompt="Extract contact info from: {text}"):
+    from app.structured_output import ContactInfo
+    return FastPathExtractor(lambda text: extract_contact(text, ContactInfo), agent, prompt)
+
+
+def extraction_fast_path(agent, prompt="Extract info: {text}"):
+    from app.error_handling import ContactInfo, EventDetails, ExtractionResult
+    return FastPathExtractor(
+        lambda text: extract_items(text, ExtractionResult, ContactInfo, EventDetails), agent, prompt
+    )
@@ -0,0 +1,189 @@
+import numbers
+import re
+import pandas as pd
+
+
+# Question words -> pandas aggregation
+AGGREGATIONS = [
+    (re.compile(r"\b(average|avg|mean)\b"), "mean"),
+    (re.compile(r"\b(how many|count|number of)\b"), "count"),
+    (re.compile(r"\b(max|maximum|highest|largest|biggest|most)\b"), "max"),
+    (re.compile(r"\b(min|minimum|lowest|smallest|least)\b"), "min"),
+    (re.compile(r"\b(total|sum|overall)\b"), "sum"),
+]
+FILTER_INTENT = re.compile(r"\b(list|show|which|find|display)\b")
+GROUP_BY = re.compile(r"\b(?:by|per|for each|each)\s+(\w+)")
+WHICH = re.compile(r"\b(?:which|what)\s+(\w+)")
+YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+
+# Everyday words for the numeric columns, matched against column name tokens
+MEASURE_ALIASES = {
+    "revenue": "sale",
+    "sales": "sale",
+    "amount": "sale",
+    "units": "quantity",
+    "sold": "quantity",
+    "prices": "price",
+}
+# Words that pick the aggregation and should not also pick the column
+AGGREGATION_WORDS = {"total", "sum", "overall", "average", "avg", "mean", "count", "number",
+                     "max", "maximum", "highest", "largest", "biggest", "most",
+                     "min", "minimum", "lowest", "smallest", "least"}
+
+MAX_LISTED_ROWS = 20
+
+
+def _tokens(text):
+    # "TotalSale" -> ["total", "sale"], "unit_price" -> ["unit", "price"]
+    text = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", text)
+    return [t for t in re.split(r"[^a-z0-9]+", text.lower()) if t]
+
+
+def _singular(word):
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def load_sales_frame(csv_path):
+    # Repeated strings (region, product, ...) are stored as categoricals to keep the frame small
+    df = pd.read_csv(csv_path)
+    for col in df.select_dtypes(include="object").columns:
+        if df[col].nunique() <= max(1, len(df) // 2):
+            df[col] = df[col].astype("category")
+    return df
+
+
+class SalesAggregationEngine:
+    """Answer aggregate and filter questions directly from the DataFrame.
+
+    ``answer`` returns ``None`` when the question does not look structured,
+    which is the signal to fall back to vector retrieval.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.numeric_columns = list(df.select_dtypes(include="number").columns)
+        self.date_column = next((c for c in df.columns if "date" in c.lower()), None)
+        self.categorical_columns = list(df.select_dtypes(include="category").columns)
+
+        # Normalised value -> (column, value) for every categorical value
+        self.values = {}
+        for col in self.categorical_columns:
+            for value in df[col].cat.categories:
+                self.values[" ".join(_singular(t) for t in _tokens(str(value)))] = (col, value)
+        self.column_names = {" ".join(_tokens(c)): c for c in df.columns}
+        self.column_names.update({_singular(k): v for k, v in list(self.column_names.items())})
+
+    def _aggregation(self, question):
+        for pattern, op in AGGREGATIONS:
+            if pattern.search(question):
+                return op
+        return None
+
+    def _filters(self, words):
+        # Match single words and bigrams against the categorical values
+        filters = {}
+        candidates = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for candidate in candidates:
+            if candidate in self.values:
+                col, value = self.values[candidate]
+                filters.setdefault(col, []).append(value)
+        return filters
+
+    def _measure(self, words):
+        wanted = {w for w in words if w not in AGGREGATION_WORDS}
+        best, best_score = None, 0
+        for col in self.numeric_columns:
+            score = len(set(_tokens(col)) & wanted)
+            if score > best_score:
+                best, best_score = col, score
+        return best
+
+    def _column(self, pattern, question):
+        match = pattern.search(question)
+        if not match:
+            return None
+        return self.column_names.get(_singular(match.group(1)))
+
+    def answer(self, question):
+        lowered = question.lower()
+        words = [_singular(MEASURE_ALIASES.get(w, w)) for w in _tokens(question)]
+        op = self._aggregation(lowered)
+        filters = self._filters(words)
+        group_by = self._column(GROUP_BY, lowered)
+        ranked_by = self._column(WHICH, lowered)
+        year = YEAR.search(lowered) if self.date_column else None
+
+        if op is None and not (FILTER_INTENT.search(lowered) and (filters or year)):
+            return None
+        measure = self._measure(words) if op not in (None, "count") else None
+        if op in ("sum", "mean") and measure is None:
+            # "total" or "average" of nothing we can name is a free-text question
+            return None
+        if op in ("max", "min") and measure is None and ranked_by is None:
+            return None
+
+        mask = pd.Series(True, index=self.df.index)
+        for col, values in filters.items():
+            mask &= self.df[col].isin(values)
+        if year:
+            mask &= self.df[self.date_column].astype(str).str.startswith(year.group(1))
+        subset = self.df[mask]
+
+        conditions = [f"{col} in {values}" if len(values) > 1 else f"{col}={values[0]}"
+                      for col, values in filters.items()]
+        if year:
+            conditions.append(f"{self.date_column} in {year.group(1)}")
+        where = f" where {', '.join(conditions)}" if conditions else ""
+
+        if op is None:
+            rows = subset.head(MAX_LISTED_ROWS).to_string(index=False)
+            return f"{len(subset)} rows{where}:\n{rows}"
+
+        if ranked_by is not None and ranked_by != measure and op in ("max", "min"):
+            # "Which region had the highest sales?" ranks the groups by their totals
+            grouped = subset.groupby(ranked_by, observed=True)
+            totals = grouped.size() if measure is None else grouped[measure].sum()
+            if totals.empty:
+                return f"No rows{where}"
+            key = totals.idxmax() if op == "max" else totals.idxmin()
+            label = "rows" if measure is None else f"sum of {measure}"
+            return f"{ranked_by}={key} has the {op} {label}{where}: {self._format(totals[key])}"
+
+        if group_by is not None and group_by != measure:
+            grouped = subset.groupby(group_by, observed=True)
+            result = grouped.size() if op == "count" else getattr(grouped[measure], op)()
+            lines = "\n".join(f"  {key}: {self._format(value)}" for key, value in result.items())
+            label = "rows" if op == "count" else f"{op} of {measure}"
+            return f"{label} by {group_by}{where}:\n{lines}"
+
+        if measure is None:
+            return f"{len(subset)} rows{where}"
+        if subset.empty:
+            return f"No rows{where}"
+        value = getattr(subset[measure], op)()
+        return f"{op} of {measure}{where}: {self._format(value)} ({len(subset)} rows)"
+
+    @staticmethod
+    def _format(value):
+        if isinstance(value, numbers.Integral):
+            return f"{value:,}"
+        if isinstance(value, numbers.Real):
+            return f"{value:,.2f}"
+        return str(value)
+
+
+class SalesQueryRouter:
+    """Send structured questions to the DataFrame and the rest to the RAG engine."""
+
+    def __init__(self, df, query_engine):
+        self.engine = SalesAggregationEngine(df)
+        self.query_engine = query_engine
+
+    def route(self, question):
+        answer = self.engine.answer(question)
+        if answer is not None:
+            return "structured", answer
+        return "retrieval", self.query_engine.query(question)
+
+    def query(self, question):
+        return self.route(question)[1]
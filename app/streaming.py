@@ -0,0 +1,62 @@
+import re
+import sys
+import time
+
+SCORE_PATTERN = re.compile(r"Suitability Score: (\d{1,3})%")
+# Longest text a score can span ("Suitability Score: 100%"), so a match split
+# across chunks is still found when only the tail of the buffer is searched
+_SCORE_SPAN = len("Suitability Score: 100%")
+
+
+def extract_suitability_score(text):
+    match = SCORE_PATTERN.search(text)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+class ScoreStreamParser:
+    """Pick the suitability score out of an analysis while it streams in.
+
+    ``feed`` each chunk as it arrives; it returns the score the first time it
+    is complete and ``None`` otherwise. Only the new chunk plus a short tail
+    is searched, so the cost per chunk does not grow with the analysis.
+    The result matches ``SCORE_PATTERN.search`` on the full text.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self._tail = ""
+        self.score = None
+
+    @property
+    def text(self):
+        return "".join(self.parts)
+
+    def feed(self, chunk):
+        self.parts.append(chunk)
+        if self.score is not None:
+            return None
+        window = self._tail + chunk
+        match = SCORE_PATTERN.search(window)
+        self._tail = window[-_SCORE_SPAN:]
+        if match:
+            self.score = int(match.group(1))
+            return self.score
+        return None
+
+
+def print_stream(tokens, prefix="", out=sys.stdout):
+    """Print tokens as they arrive; return ``(text, seconds_to_first_token)``."""
+    start = time.perf_counter()
+    first = None
+    parts = []
+    out.write(prefix)
+    for token in tokens:
+        if first is None:
+            first = time.perf_counter() - start
+        parts.append(token)
+        out.write(token)
+        out.flush()
+    out.write("\n")
+    return "".join(parts), first
@@ -1,18 +1,6 @@
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import ToolMessage
-from langchain.tools import tool
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-import os
-from pydantic import BaseModel, Field
-from langchain.agents import create_agent
-
 
-# Load environment variables
-load_dotenv('C:/Agentic/codellm/.env')
-
-# Configure Google AI API 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 class ContactInfo(BaseModel):
     """Contact information for a person."""
@@ -21,13 +9,27 @@ class ContactInfo(BaseModel):
     phone: str = Field(description="The phone number of the person")
 
 
-agent = create_agent(
-    model="gpt-4.1-nano",     
-    response_format=ContactInfo,
-)
+def get_agent():
+    from langchain.agents import create_agent
+    from app.llm_cache import install_llm_cache
+
+    # Load environment variables (OPENAI_API_KEY)
+    load_dotenv('C:/Agentic/codellm/.env')
+    install_llm_cache()
+    return create_agent(
+        model="gpt-4.1-nano",     
+        response_format=ContactInfo,
+    )
+
+
+def main():
+    agent = get_agent()
+    result = agent.invoke({
+        "messages": [{"role": "user", "content": "Extract contact info from: John Doe, john@example.com, (555) 123-4567"}]
+    })
+
+    print(result["structured_response"])
 
-result = agent.invoke({
-    "messages": [{"role": "user", "content": "Extract contact info from: John Doe, john@example.com, (555) 123-4567"}]
-})
 
-print(result["structured_response"])
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,32 @@
-from langchain.agents import create_agent
-from langchain.agents.middleware import SummarizationMiddleware
-from langchain.chat_models import init_chat_model
-from langchain.chat_models.base import BaseChatModel
 from dotenv import load_dotenv
 import os
-from pydantic import PrivateAttr
-
-
-class DebugChatModel(BaseChatModel):
-    _model: BaseChatModel = PrivateAttr()
-
-    def __init__(self, model):
-        super().__init__()
-        self._model = model
-
-    @property
-    def _llm_type(self) -> str:
-        return "debug-wrapper"
-
-    def _generate(self, messages, **kwargs):
-        print("\n====== FINAL PROMPT SENT TO MODEL ======")
-        for i, m in enumerate(messages):
-            print(f"\n[{i}] {m.type.upper()}:\n{m.content[:300]}")
-        print("======================================\n")
-
-        return self._model._generate(messages, **kwargs)
-
-
-# --------------------------------------------------
-# Inspectable Summarization Middleware
-# --------------------------------------------------
-class InspectableSummarizationMiddleware(SummarizationMiddleware):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.latest_summary = None
-
-    def _summarize(self, messages):
-        summary_message = super()._summarize(messages)
-        self.latest_summary = summary_message.content
-        return summary_message
-
+import uuid
 
 
 # ---------------------
 # Initialize model
 # ---------------------
-# Load environment variables
+def get_llm():
+    from langchain.chat_models import init_chat_model
+    from app.llm_cache import install_llm_cache
+    from app.tracing import TracingChatModel
 
-load_dotenv('C:/Agentic/codellm/.env')
+    # Load environment variables
+    load_dotenv('C:/Agentic/codellm/.env')
 
+    # Configure Google AI API
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Configure Google AI API 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    if not OPENAI_API_KEY:
+        print("Please set your OPENAI_API_KEY in a .env file")
 
-if not OPENAI_API_KEY:
-    print("Please set your OPENAI_API_KEY in a .env file")
+    install_llm_cache()
 
+    base_llm = init_chat_model("gpt-4.1-nano")
+    # Records prompt size, tokens and latency per call into a ring buffer
+    # (or LLM_TRACE_PATH as JSONL) instead of printing every prompt
+    return TracingChatModel(base_llm, capture_prompts=True)
 
-base_llm = init_chat_model("gpt-4.1-nano")
-llm = DebugChatModel(base_llm)
-
-conversation = []
 
 def extract_summary(messages):
     for m in messages:
@@ -71,75 +37,97 @@ def extract_summary(messages):
             return m.content
     return None
 
+
 # ---------------------
-# Force summarization
+# Create agent
 # ---------------------
-middleware = InspectableSummarizationMiddleware(
-    model=llm,
-    max_tokens_before_summary=200,   # very low to trigger fast
-    messages_to_keep=2               # keep only last 2 verbatim
-)
-latest_summary = None  # optional global or external store
-
-def send(user_text):
-    global latest_summary
-
+def create_summarizing_agent(llm):
+    from langchain.agents import create_agent
+    from app.fact_memory import FactMemoryMiddleware
+    from app.rolling_summary import RollingSummarizationMiddleware
+
+    # ---------------------
+    # Force summarization
+    # ---------------------
+    # Rolling mode folds only the evicted messages into the running summary;
+    # InspectableSummarizationMiddleware re-summarizes the whole prefix instead
+    middleware = RollingSummarizationMiddleware(
+        model=llm,
+        max_tokens_before_summary=200,   # very low to trigger fast
+        messages_to_keep=2               # keep only last 2 verbatim
+    )
+    agent = create_agent(
+        model=llm,
+        tools=[],
+        # Facts like the favourite language live in a per-conversation store and
+        # are injected only when relevant, so they survive repeated summaries
+        middleware=[middleware, FactMemoryMiddleware()]
+    )
+    return agent, middleware
+
+
+def send(agent, conversation, user_text, thread_id):
     conversation.append({"role": "user", "content": user_text})
 
-    result = agent.invoke({"messages": conversation})
+    # thread_id keys this conversation's facts in FactMemoryMiddleware
+    result = agent.invoke({"messages": conversation}, {"configurable": {"thread_id": thread_id}})
+    # The agent state is already compacted (summary + recent messages), so
+    # keeping it instead of the raw history bounds what is re-sent each turn
+    conversation[:] = result["messages"]
 
     # 🔍 Extract summary if one was generated
     summary = extract_summary(result["messages"])
     if summary:
-        latest_summary = summary
         print("\n=== EXTRACTED SUMMARY ===")
         print(summary)
         print("========================\n")
 
-    # append AI reply back into conversation
     ai_message = result["messages"][-1]
-    conversation.append({
-        "role": "assistant",
-        "content": ai_message.content
-    })
-
     return ai_message.content
 
 
-# ---------------------
-# Create agent
-# ---------------------
-agent = create_agent(
-    model=llm,
-    tools=[],
-    middleware=[middleware]
-)
+def main():
+    from app.rolling_summary import summary_text
+    from app.tracing import summarize_traces
 
+    llm = get_llm()
+    agent, _ = create_summarizing_agent(llm)
+    conversation = []
+    thread_id = str(uuid.uuid4())
 
-# ---------------------
-# 1. Store a long-term fact
-# ---------------------
-send("Remember this forever: my favorite programming language is Rust.")
+    # ---------------------
+    # 1. Store a long-term fact
+    # ---------------------
+    send(agent, conversation, "Remember this forever: my favorite programming language is Rust.", thread_id)
 
-for i in range(6):
-    send("Filler text " * 30)
+    for i in range(6):
+        send(agent, conversation, "Filler text " * 30, thread_id)
 
-print("SUMMARY:", middleware.latest_summary)
+    print("SUMMARY:", summary_text(conversation))
 
-send("What is my favorite programming language?")
+    send(agent, conversation, "What is my favorite programming language?", thread_id)
 
+    # ---------------------
+    # 3. Inspect saved summary
+    # ---------------------
+    print("\n====== STORED SUMMARY (PROGRAMMATIC ACCESS) ======")
+    print(summary_text(conversation))
+    print("=================================================\n")
 
-# ---------------------
-# 3. Inspect saved summary
-# ---------------------
-print("\n====== STORED SUMMARY (PROGRAMMATIC ACCESS) ======")
-print(middleware.latest_summary)
-print("=================================================\n")
+    # ---------------------
+    # 4. Recall test
+    # ---------------------
+    answer = send(agent, conversation, "What is my favorite programming language?", thread_id)
+    print("\nAGENT RESPONSE:")
+    print(answer)
 
+    print("\n====== TRACES ======")
+    if hasattr(llm.sink, "snapshot"):
+        for record in llm.sink.snapshot():
+            print(record["method"], record["messages"], "messages,", record["prompt_tokens"], "prompt tokens,",
+                  f"{record['latency_ms']:.0f} ms", "(with summary)" if record["has_summary"] else "")
+        print(summarize_traces(llm.sink.snapshot()))
 
-# ---------------------
-# 4. Recall test
-# ---------------------
-answer = send("What is my favorite programming language?")
-print("\nAGENT RESPONSE:")
-print(answer)
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
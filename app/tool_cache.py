@@ -0,0 +1,180 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from langchain_core.tools import BaseTool, StructuredTool
+from pydantic import BaseModel
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ToolResultCache:
+    """LRU + TTL memo table for tool results, optionally backed by SQLite.
+
+    The in-memory table is bounded by ``maxsize``; the SQLite file (if any)
+    survives restarts and is consulted on an in-memory miss.
+    """
+
+    def __init__(self, ttl=None, maxsize=1024, persist_path=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if persist_path:
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tool_results (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._db.commit()
+
+    def _expires_at(self):
+        return time.time() + self.ttl if self.ttl else None
+
+    def _remember(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, key):
+        # Returns (found, value)
+        now = time.time()
+        expired = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return True, value
+                del self._entries[key]
+                expired = True
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM tool_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = json.loads(row[0]), row[1]
+                    if expires_at is None or expires_at > now:
+                        self._remember(key, value, expires_at)
+                        self.stats.hits += 1
+                        return True, value
+                    self._db.execute("DELETE FROM tool_results WHERE key = ?", (key,))
+                    self._db.commit()
+                    expired = True
+
+            if expired:
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        expires_at = self._expires_at()
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                try:
+                    payload = json.dumps(value)
+                except TypeError:
+                    # Not JSON-serialisable: keep it in memory only
+                    return
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tool_results (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, expires_at),
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM tool_results")
+                self._db.commit()
+
+
+class CachedTool(StructuredTool):
+    """A ``StructuredTool`` that memoises the wrapped tool's results."""
+
+    cache: Any = None
+    wrapped: Any = None
+
+
+def _cache_key(tool, kwargs):
+    schema = tool.args_schema
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        # Validate through the tool's own schema so defaults and coercions
+        # give equal inputs the same key
+        args = schema.model_validate(kwargs).model_dump_json()
+    else:
+        args = json.dumps(kwargs, sort_keys=True, default=str)
+    return f"{tool.name}:{args}"
+
+
+def cache_tool(tool: BaseTool, ttl=None, maxsize=1024, persist_path=None, cache=None):
+    """Wrap ``tool`` so identical (validated) arguments reuse earlier results.
+
+    Only use this for tools whose output is a pure function of their input.
+    Counters are available on ``wrapped_tool.cache.stats``.
+    """
+    cache = cache or ToolResultCache(ttl=ttl, maxsize=maxsize, persist_path=persist_path)
+
+    def run(**kwargs):
+        key = _cache_key(tool, kwargs)
+        found, value = cache.get(key)
+        if not found:
+            value = tool.invoke(kwargs)
+            cache.set(key, value)
+        return value
+
+    async def arun(**kwargs):
+        key = _cache_key(tool, kwargs)
+        found, value = cache.get(key)
+        if not found:
+            value = await tool.ainvoke(kwargs)
+            cache.set(key, value)
+        return value
+
+    is_async = getattr(tool, "coroutine", None) is not None
+    return CachedTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        return_direct=tool.return_direct,
+        func=run,
+        # Only advertise a coroutine if the wrapped tool has one, so sync tools
+        # keep being scheduled on threads by ToolDispatcher
+        coroutine=arun if is_async else None,
+        cache=cache,
+        wrapped=tool,
+    )
+
+
+def cached_tool(ttl=None, maxsize=1024, persist_path=None):
+    """Decorator form of ``cache_tool``; stack it on top of ``@tool``::
+
+        @cached_tool(ttl=600)
+        @tool(args_schema=GetWeather)
+        def get_weather(location: str) -> str: ...
+    """
+    def decorator(tool):
+        return cache_tool(tool, ttl=ttl, maxsize=maxsize, persist_path=persist_path)
+    return decorator
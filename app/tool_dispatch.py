@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
+
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_WORKERS = 16
+
+
+def is_async_tool(tool):
+    # @tool on an async def sets StructuredTool.coroutine; custom tools override _arun
+    if isinstance(tool, StructuredTool):
+        return tool.coroutine is not None
+    return type(tool)._arun is not BaseTool._arun
+
+
+class ToolDispatcher:
+    """Run every tool call from one model turn concurrently.
+
+    Tools are looked up by name instead of an if/elif chain. Async tools are
+    awaited with ``ainvoke`` and sync tools run on the dispatcher's own
+    thread pool, so a turn takes as long as its slowest tool rather than the
+    sum of all of them. The returned ``ToolMessage`` list is in the same
+    order as ``tool_calls``. Create one per process (or use it as a context
+    manager): each dispatcher owns a thread pool until ``close``.
+    """
+
+    def __init__(self, tools, timeout=DEFAULT_TIMEOUT, timeouts=None, max_workers=DEFAULT_MAX_WORKERS):
+        self.tools = {t.name: t for t in tools}
+        self.timeout = timeout
+        # Per-tool overrides, e.g. {"get_population": 2.0}
+        self.timeouts = dict(timeouts or {})
+        # Long-lived, so a timed-out sync tool never holds up the end of a turn
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def register(self, tool, timeout=None):
+        self.tools[tool.name] = tool
+        if timeout is not None:
+            self.timeouts[tool.name] = timeout
+
+    async def _run_one(self, call):
+        name = call["name"]
+        tool = self.tools.get(name)
+        if tool is None:
+            # The model still needs an answer for every tool_call_id
+            return ToolMessage(content=f"Unknown tool: {name}", tool_call_id=call["id"], name=name, status="error")
+
+        timeout = self.timeouts.get(name, self.timeout)
+        try:
+            if is_async_tool(tool):
+                pending = tool.ainvoke(call["args"])
+            else:
+                # On timeout the worker thread finishes in the background; the turn doesn't wait for it
+                pending = asyncio.get_running_loop().run_in_executor(self._executor, tool.invoke, call["args"])
+            result = await asyncio.wait_for(pending, timeout)
+        except asyncio.TimeoutError:
+            return ToolMessage(content=f"Tool {name} timed out after {timeout}s",
+                               tool_call_id=call["id"], name=name, status="error")
+        except Exception as e:
+            return ToolMessage(content=f"Tool {name} failed: {e}", tool_call_id=call["id"], name=name, status="error")
+
+        return ToolMessage(content=result if isinstance(result, str) else str(result),
+                           tool_call_id=call["id"], name=name)
+
+    async def adispatch(self, tool_calls):
+        return list(await asyncio.gather(*(self._run_one(call) for call in tool_calls)))
+
+    def dispatch(self, tool_calls):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.adispatch(tool_calls))
+        # Called from inside a running loop (e.g. a notebook): use a private loop in a thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.adispatch(tool_calls)).result()
+
+    def close(self):
+        # Timed-out tools still running are not waited for
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,253 @@
+import atexit
+import json
+import os
+import queue
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from langchain_core.language_models.chat_models import BaseChatModel
+from pydantic import PrivateAttr
+
+SUMMARY_MARKER = "Here is a summary of the conversation"
+
+
+class RingBufferSink:
+    """Keep the last ``maxlen`` trace records in memory (deque appends are thread-safe)."""
+
+    def __init__(self, maxlen=1000):
+        self.records = deque(maxlen=maxlen)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def snapshot(self):
+        return list(self.records)
+
+
+class JsonlSink:
+    """Append trace records to a JSONL file from a background thread.
+
+    ``emit`` only enqueues; when the queue is full the record is dropped and
+    counted rather than blocking the model call.
+    """
+
+    def __init__(self, path, max_queue=10_000, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self, f):
+        wrote = False
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            f.write(json.dumps(record, default=str) + "\n")
+            wrote = True
+        if wrote:
+            f.flush()
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while not self._closed.wait(self.flush_interval):
+                self._drain(f)
+            self._drain(f)
+
+    def close(self):
+        if not self._closed.is_set():
+            self._closed.set()
+            self._thread.join(timeout=5)
+
+
+def default_sink():
+    # LLM_TRACE_PATH=traces.jsonl writes to disk; otherwise keep a ring buffer
+    path = os.getenv("LLM_TRACE_PATH")
+    return JsonlSink(path) if path else RingBufferSink(int(os.getenv("LLM_TRACE_BUFFER", "1000")))
+
+
+def _approx_tokens(chars):
+    return (chars + 3) // 4
+
+
+def _content_chars(content):
+    if isinstance(content, str):
+        return len(content)
+    return sum(len(part.get("text", "")) if isinstance(part, dict) else len(str(part)) for part in content)
+
+
+class TracingChatModel(BaseChatModel):
+    """Wrap any chat model and record one trace per sampled call.
+
+    Covers ``_generate``, ``_agenerate``, ``_stream`` and ``_astream``. Each
+    record has the prompt size (messages, chars, tokens), output tokens
+    (provider usage when reported, otherwise approximate), latency, time to
+    first token for streams, errors and whether the prompt carried a
+    conversation summary. Unsampled calls pay for one ``random()``.
+    """
+
+    sample_rate: float = 1.0
+    tag: str = "chat"
+    capture_prompts: bool = False
+    _model: BaseChatModel = PrivateAttr()
+    _sink: object = PrivateAttr()
+
+    def __init__(self, model, sink=None, **kwargs):
+        super().__init__(**kwargs)
+        self._model = model
+        self._sink = sink if sink is not None else default_sink()
+
+    @property
+    def _llm_type(self):
+        return f"traced-{self._model._llm_type}"
+
+    @property
+    def _identifying_params(self):
+        return self._model._identifying_params
+
+    def _get_llm_string(self, stop=None, **kwargs):
+        # The LLM cache keys on this; the wrapped model's name and parameters must be part of it
+        return self._model._get_llm_string(stop=stop, **kwargs)
+
+    @property
+    def sink(self):
+        return self._sink
+
+    def bind_tools(self, tools, **kwargs):
+        # Let the wrapped model format the tools, but keep calls going through the tracer
+        bound = self._model.bind_tools(tools, **kwargs)
+        return self.bind(**bound.kwargs)
+
+    def _should_stream(self, *, async_api, run_manager=None, **kwargs):
+        # Stream only when the wrapped model can; otherwise stream() falls back to invoke()
+        return self._model._should_stream(async_api=async_api, run_manager=run_manager, **kwargs)
+
+    def _sampled(self):
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def _start(self, method, messages):
+        chars = [_content_chars(m.content) for m in messages]
+        record = {
+            "ts": time.time(),
+            "tag": self.tag,
+            "model": self._model._llm_type,
+            "method": method,
+            "messages": len(messages),
+            "prompt_chars": sum(chars),
+            "prompt_tokens": _approx_tokens(sum(chars)),
+            "has_summary": any(m.type == "human" and isinstance(m.content, str) and m.content.startswith(SUMMARY_MARKER)
+                               for m in messages),
+        }
+        if record["has_summary"]:
+            record["summary_tokens"] = next(_approx_tokens(c) for m, c in zip(messages, chars)
+                                            if isinstance(m.content, str) and m.content.startswith(SUMMARY_MARKER))
+        if self.capture_prompts:
+            record["prompt"] = [{"type": m.type, "content": str(m.content)[:500]} for m in messages]
+        return record, time.perf_counter()
+
+    def _finish(self, record, start, message=None, output_chars=0, error=None):
+        record["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        usage = getattr(message, "usage_metadata", None) if message is not None else None
+        if usage:
+            record["prompt_tokens"] = usage.get("input_tokens", record["prompt_tokens"])
+            record["output_tokens"] = usage.get("output_tokens")
+        else:
+            chars = output_chars or (_content_chars(message.content) if message is not None else 0)
+            record["output_tokens"] = _approx_tokens(chars)
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        self._sink.emit(record)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._sampled():
+            return self._model._generate(messages, stop=stop, **kwargs)
+        record, start = self._start("generate", messages)
+        try:
+            result = self._model._generate(messages, stop=stop, **kwargs)
+        except Exception as e:
+            self._finish(record, start, error=e)
+            raise
+        self._finish(record, start, result.generations[0].message if result.generations else None)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._sampled():
+            return await self._model._agenerate(messages, stop=stop, **kwargs)
+        record, start = self._start("agenerate", messages)
+        try:
+            result = await self._model._agenerate(messages, stop=stop, **kwargs)
+        except Exception as e:
+            self._finish(record, start, error=e)
+            raise
+        self._finish(record, start, result.generations[0].message if result.generations else None)
+        return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._sampled():
+            yield from self._model._stream(messages, stop=stop, **kwargs)
+            return
+        record, start = self._start("stream", messages)
+        output_chars, last = 0, None
+        try:
+            for chunk in self._model._stream(messages, stop=stop, **kwargs):
+                if last is None:
+                    record["ttft_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                last = chunk.message
+                output_chars += _content_chars(chunk.message.content)
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        except Exception as e:
+            self._finish(record, start, error=e, output_chars=output_chars)
+            raise
+        self._finish(record, start, last if getattr(last, "usage_metadata", None) else None, output_chars)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._sampled():
+            async for chunk in self._model._astream(messages, stop=stop, **kwargs):
+                yield chunk
+            return
+        record, start = self._start("astream", messages)
+        output_chars, last = 0, None
+        try:
+            async for chunk in self._model._astream(messages, stop=stop, **kwargs):
+                if last is None:
+                    record["ttft_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                last = chunk.message
+                output_chars += _content_chars(chunk.message.content)
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        except Exception as e:
+            self._finish(record, start, error=e, output_chars=output_chars)
+            raise
+        self._finish(record, start, last if getattr(last, "usage_metadata", None) else None, output_chars)
+
+
+def summarize_traces(records):
+    # Aggregate view for a ring buffer snapshot or a loaded JSONL file
+    if not records:
+        return {"calls": 0}
+    latencies = sorted(r["latency_ms"] for r in records)
+    return {
+        "calls": len(records),
+        "errors": sum(1 for r in records if "error" in r),
+        "with_summary": sum(1 for r in records if r.get("has_summary")),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "mean_prompt_tokens": statistics.mean(r["prompt_tokens"] for r in records),
+        "output_tokens": sum(r.get("output_tokens") or 0 for r in records),
+    }
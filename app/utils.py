@@ -1,49 +1,33 @@
 import os
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    Docx2txtLoader,
-    TextLoader,
-)
+from app import document_text, resources
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
-import google.generativeai as genai
-from langchain_google_genai import GoogleGenerativeAIEmbeddings  
-from langchain_community.vectorstores import Chroma
-
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+# The Google GenAI, Chroma, embedding and search stacks are imported inside the
+# methods that need them, so importing app.utils stays cheap (see
+# app/benchmarks/bench_import_time.py and app/prewarm.py)
 
 class Utils:
     
     @staticmethod
-    def extract_text_from_resume(file):
-        # Extract text from uploaded files
-        temp_file_path = f"temp_{file.name}"
-        with open(temp_file_path, "wb") as f:
-            f.write(file.getbuffer())
-
-        file_extension = os.path.splitext(file.name)[1].lower()
-        try:
-            if file_extension == '.pdf':
-                loader = PyPDFLoader(temp_file_path)
-            elif file_extension == '.docx':
-                loader = Docx2txtLoader(temp_file_path)
-            elif file_extension == '.txt':
-                loader = TextLoader(temp_file_path)
-            else:
-                raise ValueError(f"Unsupported file format: {file_extension}")
-
-            documents = loader.load()
-            text = " ".join([doc.page_content for doc in documents])
-            return text
-        finally:
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
+    def extract_text_from_resume(file, parallel=True):
+        # Extract text from uploaded files straight from the in-memory buffer;
+        # results are cached by content hash (see app/document_text.py)
+        return document_text.extract_text(file.name, file.getbuffer(), parallel=parallel)
 
     @staticmethod
     def get_google_llm(GOOGLE_API_KEY):
+        # One client per API key per process, shared by every Streamlit rerun/session
+        return resources.get_or_create(("google_llm", resources.fingerprint(GOOGLE_API_KEY)),
+                                       lambda: Utils._create_google_llm(GOOGLE_API_KEY))
+
+    @staticmethod
+    def _create_google_llm(GOOGLE_API_KEY):
+        import google.generativeai as genai
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from app.llm_cache import install_llm_cache
         # genai API key setup
         genai.configure(api_key=GOOGLE_API_KEY)
+        # Identical resume/job pairs are served from the LLM cache
+        install_llm_cache()
         llm = ChatGoogleGenerativeAI(
             model="gemini-2.0-flash",
             google_api_key=GOOGLE_API_KEY,
@@ -53,12 +37,35 @@ class Utils:
     
     @staticmethod
     def get_vector_store(GOOGLE_API_KEY):
+        return resources.get_or_create(("vector_store", "chroma_store"),
+                                       lambda: Utils._create_vector_store(GOOGLE_API_KEY))
+
+    @staticmethod
+    def _create_vector_store(GOOGLE_API_KEY):
+        import google.generativeai as genai
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        from app.embedding_pipeline import CachedEmbeddings
         # genai API key setup
         genai.configure(api_key=GOOGLE_API_KEY)
         # Setup embedding model
-        embedding_model = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+        embedding_model = CachedEmbeddings(
+            GoogleGenerativeAIEmbeddings(model="models/embedding-001"),
+            model_name="models/embedding-001",
+        )
+        return Utils.open_vector_store("", embedding_model)
+
+    @staticmethod
+    def open_vector_store(name, embedding_model):
+        # VECTOR_STORE_BACKEND=quantized swaps Chroma for int8 codes with exact
+        # re-ranking in memory-mapped files (app/quantized_store.py)
+        # name "" is the shared store, otherwise one directory per app_name
+        if os.getenv("VECTOR_STORE_BACKEND", "chroma") == "quantized":
+            from app.quantized_store import QuantizedVectorStore
+            directory = "C:\\Agentic\\quantized_store" + (f"\\{name}" if name else "")
+            return QuantizedVectorStore(directory, embedding_function=embedding_model)
+        from langchain_community.vectorstores import Chroma
         # Create or load Chroma vector store
-        VECTOR_STORE_DIR = "C:\\Agentic\\chroma_store"
+        VECTOR_STORE_DIR = "C:\\Agentic\\chroma_store" + (f"\\{name}" if name else "")
         if os.path.exists(VECTOR_STORE_DIR):
             vectorstore = Chroma(persist_directory=VECTOR_STORE_DIR, embedding_function=embedding_model)
         else:
@@ -74,32 +81,75 @@ class VectorStoreUtils:
         self.app_name = app_name
     
     def get_vector_store(self):
+        # Embeddings client and vector store are opened once per app_name per process
+        return resources.get_or_create(("vector_store", self.app_name), self._create_vector_store)
+
+    def _create_vector_store(self):
+        import google.generativeai as genai
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        from app.embedding_pipeline import CachedEmbeddings
         # genai API key setup
         genai.configure(api_key=self.GOOGLE_API_KEY)
         # Setup embedding model
-        embedding_model = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-        # Create or load Chroma vector store
-        VECTOR_STORE_DIR = f"C:\\Agentic\\chroma_store\\{self.app_name}"
-        if os.path.exists(VECTOR_STORE_DIR):
-            vectorstore = Chroma(persist_directory=VECTOR_STORE_DIR, embedding_function=embedding_model)
-        else:
-            os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
-            vectorstore = Chroma(persist_directory=VECTOR_STORE_DIR, embedding_function=embedding_model)
-        return vectorstore
+        embedding_model = CachedEmbeddings(
+            GoogleGenerativeAIEmbeddings(model="models/embedding-001"),
+            model_name="models/embedding-001",
+        )
+        return Utils.open_vector_store(self.app_name, embedding_model)
     
-    # Text splitting
-    def __split_text(self,text):
-        splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-        return splitter.create_documents([text])
-
-
-    def store_resume_analysis(self, analysis,  doc_metadata):
-        documents = self.__split_text(analysis)
-        vectorstore = self.get_vector_store()
-        docs_with_metadata = []
-        for doc in documents:
-            doc.metadata = doc_metadata.copy()
-            docs_with_metadata.append(doc)
-
-        vectorstore.add_documents(docs_with_metadata)
-        vectorstore.persist()
\ No newline at end of file
+    def get_writer(self):
+        from app.analysis_writer import AnalysisWriter
+        from app.chunking import default_chunker
+        # One buffered writer per store per process, shared by all sessions
+        return resources.get_or_create(
+            ("analysis_writer", self.app_name),
+            lambda: AnalysisWriter(self.get_vector_store, default_chunker(),
+                                   on_upsert=self._index_upserted, on_delete=self._index_deleted),
+        )
+
+    def _keyword_loader(self):
+        from app.hybrid_search import KeywordIndexLoader
+        return resources.get_or_create(("keyword_loader", self.app_name), KeywordIndexLoader)
+
+    def get_keyword_index(self):
+        # Built from the whole collection on first use, then kept in sync by the writer;
+        # writes that land while it is being built are replayed onto it
+        return resources.get_or_create(("keyword_index", self.app_name),
+                                       lambda: self._keyword_loader().build(self.get_vector_store()))
+
+    def _index_upserted(self, ids, documents):
+        self._keyword_loader().add(ids, [doc.page_content for doc in documents],
+                                   [doc.metadata for doc in documents])
+
+    def _index_deleted(self, ids):
+        self._keyword_loader().remove(ids)
+
+    def similarity_search(self, query, k=4, job_id=None, candidate=None):
+        from app.hybrid_search import chroma_filter
+        # Vector search restricted to one job and/or candidate before ranking
+        where = chroma_filter({"job_id": job_id, "candidate": candidate})
+        return self.get_vector_store().similarity_search(query, k=k, filter=where)
+
+    def search_candidates(self, query, k=10, job_id=None, candidate=None, mode="hybrid"):
+        """Rank stored candidates for ``query``, e.g. "strong Kubernetes experience".
+
+        ``mode`` is "hybrid" (BM25 + vector, fused with RRF), "vector" or "keyword".
+        Returns dicts with candidate, job_id, score, matches and the best snippet.
+        """
+        from app.hybrid_search import HybridRetriever
+        retriever = HybridRetriever(self.get_vector_store(), self.get_keyword_index())
+        return retriever.search_candidates(query, k=k, filters={"job_id": job_id, "candidate": candidate}, mode=mode)
+
+    def store_resume_analysis(self, analysis,  doc_metadata, wait=False):
+        # Queued; embedded, upserted and persisted with the next batch flush.
+        # wait=True writes it now and raises if the store rejects it.
+        writer = self.get_writer()
+        writer.write(analysis, doc_metadata)
+        if wait:
+            writer.flush()
+
+    def store_resume_analyses(self, analyses):
+        # analyses: (analysis, doc_metadata) pairs, written as one batch
+        writer = self.get_writer()
+        writer.write_many(analyses)
+        writer.flush()
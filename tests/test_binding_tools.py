@@ -0,0 +1,37 @@
+from langchain_core.messages import AIMessage
+
+from app import binding_tools, resources
+from app.tool_dispatch import ToolDispatcher
+
+
+class FakeModel:
+    def invoke(self, messages):
+        if isinstance(messages, str):
+            return AIMessage(content="", tool_calls=[
+                {"name": "get_weather", "args": {"location": "New York, NY"}, "id": "1"},
+                {"name": "get_population", "args": {"location": "New York, NY"}, "id": "2"},
+            ])
+        return AIMessage(content=" / ".join(m.content for m in messages[1:]))
+
+
+def test_ask_reuses_one_dispatcher(monkeypatch):
+    created = []
+
+    def counting_dispatcher(*args, **kwargs):
+        created.append(ToolDispatcher(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(binding_tools, "ToolDispatcher", counting_dispatcher)
+    resources.invalidate("binding_tools_dispatcher")
+    for _ in range(20):
+        _, final = binding_tools.ask(FakeModel(), "weather?")
+    assert final.content == "22°C / 8.4 million"
+    assert len(created) == 1 and binding_tools.get_dispatcher() is created[0]
+    resources.invalidate("binding_tools_dispatcher")
+    created[0].close()
+
+
+def test_dispatcher_context_manager_shuts_down_its_pool():
+    with ToolDispatcher([binding_tools.get_weather]) as dispatcher:
+        dispatcher.dispatch([{"name": "get_weather", "args": {"location": "Los Angeles, CA"}, "id": "1"}])
+    assert dispatcher._executor._shutdown
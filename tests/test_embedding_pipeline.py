@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.embedding_pipeline import MAX_LLAMA_INDEX_BATCH, CachedHuggingFaceEmbedding, EmbeddingCache, shared_cache
+
+
+def test_embed_batch_size_is_clamped_for_many_workers():
+    model = CachedHuggingFaceEmbedding(batch_size=64, num_workers=8, cache_dir=None)
+    assert model.embed_batch_size == MAX_LLAMA_INDEX_BATCH
+
+
+def test_embed_batch_size_scales_with_workers():
+    model = CachedHuggingFaceEmbedding(batch_size=16, num_workers=2, cache_dir=None)
+    assert model.embed_batch_size == 16 * 2 * 8
+
+
+def _put(cache, start, count, dim=4):
+    keys = [f"k{i}" for i in range(start, start + count)]
+    cache.put_many(keys, np.arange(start, start + count, dtype=np.float32)[:, None].repeat(dim, axis=1))
+    return keys
+
+
+def test_shared_cache_is_one_instance_per_directory(tmp_path):
+    assert shared_cache(str(tmp_path), "m") is shared_cache(str(tmp_path / "."), "m")
+    assert shared_cache(str(tmp_path), "m") is not shared_cache(str(tmp_path), "other")
+
+
+def test_instances_on_one_directory_survive_each_others_compaction(tmp_path):
+    first = EmbeddingCache(str(tmp_path), "m", max_segments=4)
+    second = EmbeddingCache(str(tmp_path), "m", max_segments=4)
+    for i in range(6):
+        _put(first, i * 10, 10)
+    _put(second, 100, 10)
+    # first merges away segments second never saw, and second's own segment
+    first.compact()
+    assert len(first._segments) == 1
+
+    found = second.get_many([f"k{i}" for i in range(60)] + ["k105"])
+    assert len(found) == 61 and found["k42"][0] == 42 and found["k105"][0] == 105
+    _put(second, 200, 10)
+    second.compact()
+    third = EmbeddingCache(str(tmp_path), "m")
+    assert len(third) == 80 and third.get_many(["k7", "k209"])["k209"][0] == 209
+    assert first.get_many(["k205"])["k205"][0] == 205
+
+
+def test_compaction_is_skipped_while_another_process_holds_the_lock(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    cache = EmbeddingCache(str(tmp_path), "m")
+    _put(cache, 0, 5)
+    _put(cache, 5, 5)
+    with open(os.path.join(cache.path, ".compact.lock"), "a") as f:
+        # flock locks belong to the open file description, so this acts like another process
+        fcntl.flock(f, fcntl.LOCK_EX)
+        cache.compact()
+        assert len(cache._segments) == 2
+    cache.compact()
+    assert len(cache._segments) == 1 and len(cache) == 10
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from app.hybrid_search import BM25Index, KeywordIndexLoader, build_keyword_index
+
+
+class FakeStore:
+    """Chroma-like ``get`` over an ordered dict; ``on_page`` runs after each paged read."""
+
+    def __init__(self, docs):
+        self.docs = dict(docs)
+        self.on_page = None
+
+    def get(self, ids=None, include=("documents", "metadatas"), limit=None, offset=0):
+        rows = [(i, d) for i, d in self.docs.items() if ids is None or i in ids]
+        if ids is None:
+            rows = rows[offset:None if limit is None else offset + limit]
+        page = {"ids": [i for i, _ in rows],
+                "documents": [text for _, (text, _) in rows] if "documents" in include else None,
+                "metadatas": [meta for _, (_, meta) in rows] if "metadatas" in include else None}
+        if include and self.on_page:
+            self.on_page()
+        return page
+
+
+def _docs(count):
+    return {f"d{i}": (f"python engineer number {i} knows sql" if i % 2 else f"designer {i} figma", {"job_id": "j"})
+            for i in range(count)}
+
+
+def test_build_does_not_skip_rows_when_chunks_are_deleted_mid_build():
+    store = FakeStore(_docs(50))
+    loader = KeywordIndexLoader()
+    deleted = []
+
+    def delete_early_rows():
+        if not deleted:
+            deleted.extend(["d0", "d1", "d2"])
+            for doc_id in deleted:
+                del store.docs[doc_id]
+            loader.remove(deleted)
+
+    store.on_page = delete_early_rows
+    index = loader.build(store, page_size=10)
+    assert sorted(index._position) == sorted(store.docs)
+
+
+def _scores(index, query="python sql designer"):
+    return {doc_id: round(score, 5) for doc_id, score in index.search(query, k=100)}
+
+
+def test_tombstones_are_compacted_and_scores_match_a_fresh_index():
+    docs = _docs(200)
+    index = BM25Index(compact_min_rows=10)
+    index.add(list(docs), [t for t, _ in docs.values()], [m for _, m in docs.values()])
+    rng = random.Random(0)
+    removed = rng.sample(sorted(docs), 120)
+    for start in range(0, len(removed), 20):
+        index.remove(removed[start:start + 20])
+    replaced = ["d3", "d5"]
+    index.add(replaced, ["python python rust", "figma"], [{"job_id": "k"}, {"job_id": "j"}])
+
+    live = {doc_id: docs[doc_id] for doc_id in docs if doc_id not in removed}
+    live.update({"d3": ("python python rust", {"job_id": "k"}), "d5": ("figma", {"job_id": "j"})})
+    fresh = BM25Index()
+    fresh.add(list(live), [t for t, _ in live.values()], [m for _, m in live.values()])
+
+    assert index.compactions >= 1
+    assert len(index.ids) < len(docs) + len(replaced)
+    assert _scores(index) == pytest.approx(_scores(fresh))
+    assert index.search("rust", filters={"job_id": "k"})[0][0] == "d3"
+    text, metadata = docs[removed[0]]
+    assert index.lookup_id(text, metadata) is None
+
+
+def test_small_indexes_are_not_compacted():
+    index = BM25Index()
+    index.add(["a", "b"], ["one", "two"], [{}, {}])
+    index.remove(["a"])
+    assert index.compactions == 0 and index.search("two")[0][0] == "b"
+
+
+def test_build_keyword_index_reads_every_row():
+    store = FakeStore(_docs(23))
+    assert len(build_keyword_index(store, page_size=5)) == 23
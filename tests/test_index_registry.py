@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+from app import index_registry
+from app.index_registry import IndexRegistry
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    # Stand-in for the LlamaIndex build: records the content it read
+    built = []
+
+    def fake_build(sources, persist_dir):
+        os.makedirs(persist_dir)
+        with open(sources[0], "rb") as f:
+            content = f.read()
+        built.append((os.path.basename(sources[0]), content))
+        with open(os.path.join(persist_dir, "content"), "wb") as f:
+            f.write(content)
+        for hook in fake_build.during:
+            hook(sources[0])
+
+    fake_build.during = []
+    monkeypatch.setattr(index_registry, "load_or_build_index", fake_build)
+    return fake_build, built
+
+
+def _registry(tmp_path):
+    return IndexRegistry(tmp_path / "pdfs", tmp_path / "storage", use_processes=False, max_workers=1)
+
+
+def test_source_changed_during_build_is_rebuilt(tmp_path, builds):
+    fake_build, built = builds
+    (tmp_path / "pdfs").mkdir()
+    source = tmp_path / "pdfs" / "uber.pdf"
+    source.write_bytes(b"v1")
+
+    def edit(path):
+        with open(path, "wb") as f:
+            f.write(b"v2")
+        os.utime(path, (1, 1))  # same size, different mtime
+
+    fake_build.during.append(edit)
+    assert list(_registry(tmp_path).sync().built) == ["uber"]
+    fake_build.during.clear()
+
+    report = _registry(tmp_path).sync()
+    assert list(report.built) == ["uber"] and built[-1] == ("uber.pdf", b"v2")
+    assert _registry(tmp_path).sync().unchanged == ["uber"]
+
+
+def test_shards_do_not_collide_with_other_storage(tmp_path, builds):
+    (tmp_path / "pdfs").mkdir()
+    (tmp_path / "pdfs" / "sales.pdf").write_bytes(b"filing")
+    other = tmp_path / "storage" / "sales"
+    other.mkdir(parents=True)
+    (other / "docstore.json").write_text("{}")
+
+    registry = _registry(tmp_path)
+    registry.sync()
+    assert registry.shard_dir("sales") == tmp_path / "storage" / "shards" / "sales"
+    assert (tmp_path / "storage" / "shards" / "sales" / "content").read_bytes() == b"filing"
+    assert (other / "docstore.json").read_text() == "{}"
+
+
+def test_legacy_layout_is_moved_not_rebuilt(tmp_path, builds):
+    _, built = builds
+    (tmp_path / "pdfs").mkdir()
+    source = tmp_path / "pdfs" / "uber.pdf"
+    source.write_bytes(b"v1")
+    storage = tmp_path / "storage"
+    (storage / "uber").mkdir(parents=True)
+    stat = source.stat()
+    entry = {"source": str(source), "sha256": index_registry.file_sha256(source),
+             "mtime": stat.st_mtime, "size": stat.st_size, "build_seconds": 0.1}
+    (storage / "manifest.json").write_text(json.dumps({"shards": {"uber": entry}}))
+
+    report = _registry(tmp_path).sync()
+    assert report.unchanged == ["uber"] and not built
+    assert (storage / "shards" / "uber").is_dir() and not (storage / "uber").exists()
+    assert not (storage / "manifest.json").exists()
@@ -0,0 +1,51 @@
+from app.resume_batch import ResumeScreener, rank
+
+
+class FakeChain:
+    async def ainvoke(self, inputs):
+        score = 90 if "senior" in inputs["resume_text"] else 40
+        return f"Looks fine.\nSuitability Score: {score}%"
+
+
+class FlakyStore:
+    """Fails the first ``failures`` writes, then stores everything it is given."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.stored = {}
+
+    def store_resume_analyses(self, analyses):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("store is down")
+        for analysis, metadata in analyses:
+            self.stored[metadata["resume_id"]] = analysis
+
+
+RESUMES = [(f"cv{i}.txt", (f"resume {i} " + ("senior" if i % 2 else "junior")).encode()) for i in range(5)]
+
+
+def _screen(store):
+    screener = ResumeScreener("requirements", "job_001", chain=FakeChain(), store=store,
+                              workers=1, concurrency=2, store_batch_size=2)
+    return screener.run(RESUMES)
+
+
+def test_store_that_never_recovers_keeps_the_ranking():
+    results = _screen(FlakyStore(failures=10**6))
+    assert [r.score for r in results] == [40, 90, 40, 90, 40]
+    assert all(r.error is None and r.store_error == "ConnectionError: store is down" for r in results)
+    rows = rank(results)
+    assert [row["score"] for row in rows] == [90, 90, 40, 40, 40]
+    assert all(row["store_error"] for row in rows)
+
+
+def test_failed_batch_is_retried_with_the_next_one():
+    store = FlakyStore(failures=1)
+    results = _screen(store)
+    assert all(r.store_error is None for r in results)
+    assert set(store.stored) == {r.resume_id for r in results}
+
+
+def test_no_store_skips_persistence():
+    assert all(r.score is not None and r.store_error is None for r in _screen(None))
@@ -0,0 +1,69 @@
+from app.rule_extraction import contact_fast_path, extract_contact
+from app.structured_output import ContactInfo
+
+FORWARDED = ("---------- Forwarded message ---------\nFrom: Bob Lee <bob.lee@example.com>\n\n"
+             "Please meet Jane Doe, jane.doe@example.com, (415) 555-0100.")
+
+
+class RecordingAgent:
+    def __init__(self, answer):
+        self.answer = answer
+        self.messages = []
+
+    def invoke(self, state):
+        self.messages.append(state["messages"][0]["content"])
+        return {"structured_response": self.answer}
+
+
+def test_single_email_and_phone_are_exact():
+    result = extract_contact("John Doe <john.doe@example.com>, (415) 555-0100", ContactInfo)
+    assert result.complete
+    assert result.value == ContactInfo(name="John Doe", email="john.doe@example.com", phone="(415) 555-0100")
+
+
+def test_several_emails_are_candidates_not_fields():
+    result = extract_contact(FORWARDED, ContactInfo)
+    assert not result.complete
+    assert "email" not in result.fields and "name" not in result.fields
+    assert result.guesses["email"] == ["bob.lee@example.com", "jane.doe@example.com"]
+
+
+def test_forwarded_sender_and_other_phone_never_make_a_mixed_record():
+    text = "Fwd from Bob Lee <bob.lee@example.com>: Jane can be reached at (212) 555-0199, jane@example.org"
+    result = extract_contact(text, ContactInfo)
+    assert not result.complete and "email" not in result.fields
+
+
+def test_several_phones_are_candidates():
+    result = extract_contact("Jane Doe, jane.doe@example.com, (415) 555-0100 or 212.555.0199", ContactInfo)
+    assert "phone" not in result.fields
+    assert result.guesses["phone"] == ["(415) 555-0100", "212.555.0199"]
+
+
+def test_repeated_address_counts_once():
+    text = "Jane Doe <jane.doe@example.com>, (415) 555-0100. Reply to JANE.DOE@example.com or 415-555-0100."
+    assert extract_contact(text, ContactInfo).complete
+
+
+def test_no_reply_sender_is_ignored():
+    text = "From: Jobs Board <noreply@jobs.example.com>\nNew applicant Jane Doe, jane.doe@example.com, (415) 555-0100"
+    result = extract_contact(text, ContactInfo)
+    assert result.complete and result.value.email == "jane.doe@example.com"
+
+
+def test_model_value_wins_over_candidates():
+    answer = ContactInfo(name="Jane Doe", email="jane.doe@example.com", phone="(415) 555-0100")
+    agent = RecordingAgent(answer)
+    extractor = contact_fast_path(agent, prompt="{text}")
+    assert extractor.extract(FORWARDED) == answer
+    assert extractor.llm_calls == 1
+    hints = agent.messages[0][len(FORWARDED):]
+    assert "Several found" in hints and "'bob.lee@example.com', 'jane.doe@example.com'" in hints
+    assert "'email'" not in hints.split("Several found")[0]
+
+
+def test_unique_phone_still_overrides_the_model():
+    answer = ContactInfo(name="Jane Doe", email="jane.doe@example.com", phone="415 555 0100")
+    extractor = contact_fast_path(RecordingAgent(answer), prompt="{text}")
+    value = extractor.extract(FORWARDED)
+    assert value.phone == "(415) 555-0100" and value.email == "jane.doe@example.com"
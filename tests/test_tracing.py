@@ -0,0 +1,52 @@
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.llm_cache import TieredLLMCache
+from app.tracing import RingBufferSink, TracingChatModel
+
+
+class EchoModel(BaseChatModel):
+    model_name: str = "echo"
+    temperature: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self):
+        return "echo"
+
+    @property
+    def _identifying_params(self):
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        message = AIMessage(content=f"{self.model_name}@{self.temperature}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _traced(cache, **params):
+    return TracingChatModel(EchoModel(**params), sink=RingBufferSink(), cache=cache)
+
+
+def test_differently_configured_models_do_not_share_cache_entries():
+    cache = TieredLLMCache()
+    small, large, warm = (_traced(cache, model_name="small"), _traced(cache, model_name="large"),
+                          _traced(cache, model_name="small", temperature=0.7))
+    assert small.invoke("hi").content == "small@0.0"
+    assert large.invoke("hi").content == "large@0.0"
+    assert warm.invoke("hi").content == "small@0.7"
+    assert cache.stats.exact_hits == 0 and cache.stats.misses == 3
+
+
+def test_same_configuration_hits_the_cache():
+    cache = TieredLLMCache()
+    first, second = _traced(cache, model_name="small"), _traced(cache, model_name="small")
+    first.invoke("hi")
+    assert second.invoke("hi").content == "small@0.0"
+    assert second._model.calls == 0 and cache.stats.exact_hits == 1
+
+
+def test_identifying_params_come_from_the_wrapped_model():
+    traced = _traced(None, model_name="small", temperature=0.3)
+    assert traced._identifying_params == {"model_name": "small", "temperature": 0.3}